@@ -0,0 +1,83 @@
+"""
+Alembic migration environment for Food Order Booking System
+"""
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from app.core.config import settings
+from app.db.base import Base
+from app.db.menu_search import include_object
+
+# Import all models so they are registered on Base.metadata
+from app.models.user import User  # noqa: F401
+from app.models.menu_item import MenuItem  # noqa: F401
+from app.models.order import Order  # noqa: F401
+from app.models.order_item import OrderItem  # noqa: F401
+from app.models.token_revocation import TokenRevocation  # noqa: F401
+from app.models.sales_rollup import DailySales, DailyCategorySales, DailyMenuItemSales, SalesDelta  # noqa: F401
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """Database URL from application settings unless one was passed in"""
+    return config.attributes.get("url") or settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode, emitting SQL to stdout"""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live connection"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Connection supplied by the caller (e.g. tests or startup checks)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    configuration = config.get_section(config.config_ini_section, {})
+    configuration["sqlalchemy.url"] = get_url()
+    connectable = engine_from_config(
+        configuration,
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,97 @@
+"""Initial schema
+
+Tables as originally created by ``create_tables()``. Databases that were
+created that way can be marked as being at this revision with
+``alembic stamp 0001`` before running ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'menu_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_menu_items_id', 'menu_items', ['id'], unique=False)
+    op.create_index('ix_menu_items_name', 'menu_items', ['name'], unique=False)
+
+    op.create_table(
+        'orders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('delivery_address', sa.Text(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_orders_id', 'orders', ['id'], unique=False)
+
+    op.create_table(
+        'order_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id']),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_items_id', 'order_items', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_items_id', table_name='order_items')
+    op.drop_table('order_items')
+    op.drop_index('ix_orders_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_menu_items_name', table_name='menu_items')
+    op.drop_index('ix_menu_items_id', table_name='menu_items')
+    op.drop_table('menu_items')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,38 @@
+"""Token version and revocation table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+    op.create_table(
+        'token_revocations',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('min_token_version', sa.Integer(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_token_revocations_revoked_at', 'token_revocations', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_token_revocations_revoked_at', table_name='token_revocations')
+    op.drop_table('token_revocations')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
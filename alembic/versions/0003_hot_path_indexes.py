@@ -0,0 +1,47 @@
+"""Indexes for order and menu query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_orders_user_id_created_at', 'orders', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at', 'id']),
+    ('ix_orders_created_at', 'orders', [sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_menu_items_category_is_available', 'menu_items', ['category', 'is_available']),
+]
+
+
+def upgrade() -> None:
+    # On PostgreSQL, build without blocking writes to the (large) orders
+    # tables; CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
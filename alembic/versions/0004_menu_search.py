@@ -0,0 +1,60 @@
+"""Full-text search for menu items
+
+PostgreSQL: weighted tsvector column with a GIN index and a pg_trgm index
+on name. SQLite: FTS5 table mirroring name and description.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.add_column('menu_items', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"UPDATE menu_items SET search_vector = {SEARCH_VECTOR}")
+        op.create_index(
+            'ix_menu_items_search_vector', 'menu_items', ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+        op.create_index(
+            'ix_menu_items_name_trgm', 'menu_items', ['name'],
+            unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts "
+            "USING fts5(name, description, tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO menu_items_fts (rowid, name, description) "
+            "SELECT id, name, coalesce(description, '') FROM menu_items"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_menu_items_name_trgm', table_name='menu_items')
+        op.drop_index('ix_menu_items_search_vector', table_name='menu_items')
+        op.drop_column('menu_items', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS menu_items_fts")
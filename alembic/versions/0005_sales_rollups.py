@@ -0,0 +1,55 @@
+"""Daily sales rollup tables
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def _totals():
+    return [
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('item_quantity', sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sales_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table(
+        'sales_daily_category',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint('day', 'category')
+    )
+    op.create_table(
+        'sales_daily_menu_item',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_name', sa.String(), nullable=False),
+        *_totals(),
+        sa.PrimaryKeyConstraint('day', 'menu_item_id')
+    )
+    # Existing orders are loaded with `make backfill-rollups`
+
+
+def downgrade() -> None:
+    op.drop_table('sales_daily_menu_item')
+    op.drop_table('sales_daily_category')
+    op.drop_table('sales_daily')
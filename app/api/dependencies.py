@@ -1,39 +1,140 @@
 """
 Authentication dependencies for food order booking system
 """
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import principal_cache
+from app.core.revocation import revocation_set
 from app.core.security import security
-from app.db.base import get_db
-from app.models.user import User
-from app.services.user_service import UserService
+from app.db.base import get_async_db, get_db
+from app.schemas.auth import TokenPrincipal
+from app.schemas.user import UserSnapshot
+from app.services.user_service import AsyncUserService, UserService
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+async def _get_cached_user(db: AsyncSession, key, load) -> UserSnapshot:
     """
-    Get current authenticated user from JWT token
+    Load a user by id or by token subject (username), via the principal cache
+
+    The cache holds frozen snapshots rather than ORM instances, so one
+    request can never change (or try to flush) what another is served.
     """
-    username = security.verify_token(token)
-    user = UserService.get_user_by_username(db, username=username)
-    if user is None:
+    user = principal_cache.get(key)
+    if user is not None:
+        return user
+    
+    db_user = await load(db, key)
+    if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user = UserSnapshot.model_validate(db_user)
+    principal_cache.set(key, user)
     return user
 
 
+async def _ensure_not_revoked(db: AsyncSession, user_id: int, token_version: int, current_version: int = 0) -> None:
+    """Raise 401 if the token version is below the user's current or revoked minimum"""
+    if revocation_set.claim_refresh():
+        revocation_set.load(await AsyncUserService.get_token_revocations(db))
+    if token_version < current_version or revocation_set.is_revoked(user_id, token_version):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> UserSnapshot:
+    """
+    Get current authenticated user from JWT token
+
+    The token is checked like any other (including revocation) before the
+    record is loaded by id. Users are served from the principal cache for up
+    to PRINCIPAL_CACHE_TTL_SECONDS as immutable snapshots; update the user
+    through UserService, which invalidates the cache.
+    """
+    principal = await principal_from_token(db, token)
+    return await _get_cached_user(db, principal.id, AsyncUserService.get_user_by_id)
+
+
+async def principal_from_token(db: AsyncSession, token: str) -> TokenPrincipal:
+    """
+    Authenticate an access token, raising 401 if it is invalid or revoked
+
+    No database lookup is needed for tokens that embed claims, apart from a
+    periodic reload of the revocation set. Tokens without claims fall back
+    to the user record, and their ``ver`` must still match its token version.
+    """
+    payload = security.decode_token(token)
+    token_version = payload.get("ver", 0)
+    if "uid" not in payload:
+        user = await _get_cached_user(db, payload["sub"], AsyncUserService.get_user_by_username)
+        await _ensure_not_revoked(db, user.id, token_version, user.token_version or 0)
+        return TokenPrincipal(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            token_version=token_version
+        )
+    
+    principal = TokenPrincipal(
+        id=payload["uid"],
+        username=payload["sub"],
+        is_active=payload.get("active", True),
+        is_superuser=payload.get("su", False),
+        token_version=token_version
+    )
+    await _ensure_not_revoked(db, principal.id, principal.token_version)
+    return principal
+
+
+async def get_current_principal(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> TokenPrincipal:
+    """
+    Get the authenticated caller from access token claims
+    """
+    return await principal_from_token(db, token)
+
+
+async def get_current_stream_user(
+    access_token: Optional[str] = Query(None, description="Access token, for clients that cannot send headers"),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> TokenPrincipal:
+    """
+    Get the active caller for event streams
+
+    Browsers' EventSource cannot set an Authorization header, so the token
+    may also be passed as the ``access_token`` query parameter.
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return get_current_active_user(await principal_from_token(db, token))
+
+
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: TokenPrincipal = Depends(get_current_principal)
+) -> TokenPrincipal:
     """
     Get current active user (not disabled)
     """
@@ -45,9 +146,23 @@ def get_current_active_user(
     return current_user
 
 
+def get_current_active_user_record(
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
+    """
+    Get current active user as a full database record
+    """
+    if not UserService.is_active_user(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return current_user
+
+
 def get_current_superuser(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: TokenPrincipal = Depends(get_current_principal)
+) -> TokenPrincipal:
     """
     Get current superuser (admin privileges)
     """
@@ -56,4 +171,4 @@ def get_current_superuser(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough privileges"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
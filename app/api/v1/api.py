@@ -2,7 +2,7 @@
 Main API router for food order booking system
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, menu, orders
+from app.api.v1.endpoints import auth, users, menu, orders, kitchen, analytics
 
 api_router = APIRouter()
 
@@ -16,4 +16,10 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(menu.router, prefix="/menu", tags=["menu"])
 
 # Include order management endpoints
-api_router.include_router(orders.router, prefix="/orders", tags=["orders"]) 
\ No newline at end of file
+api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
+
+# Include kitchen queue endpoints
+api_router.include_router(kitchen.router, prefix="/kitchen", tags=["kitchen"])
+
+# Include sales analytics endpoints
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,78 @@
+"""
+Sales analytics endpoints for food order booking system
+"""
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_superuser
+from app.core.query_budget import query_budget
+from app.db.base import get_async_db
+from app.schemas.analytics import CategorySalesResponse, DailySalesResponse, MenuItemSalesResponse
+from app.schemas.auth import TokenPrincipal
+from app.services.analytics_service import AnalyticsService, AsyncAnalyticsService
+
+router = APIRouter()
+
+
+def _date_range(start: Optional[date], end: Optional[date]):
+    """Resolve the report range, defaulting to the last 30 days"""
+    start, end = AnalyticsService.default_range(start, end)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    return start, end
+
+
+@router.get("/daily", response_model=List[DailySalesResponse])
+# Pending sales deltas are folded in first: claim, one upsert per rollup table
+@query_budget(5)
+async def get_daily_sales(
+    start: Optional[date] = Query(None, description="First day (inclusive), defaults to 30 days ago"),
+    end: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get revenue, order count and items sold per day (admin only)
+    """
+    start, end = _date_range(start, end)
+    await AsyncAnalyticsService.fold_deltas(db)
+    return await AsyncAnalyticsService.get_daily_sales(db, start, end)
+
+
+@router.get("/categories", response_model=List[CategorySalesResponse])
+# Pending sales deltas are folded in first: claim, one upsert per rollup table
+@query_budget(5)
+async def get_category_sales(
+    start: Optional[date] = Query(None, description="First day (inclusive), defaults to 30 days ago"),
+    end: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get sales per menu category over a date range (admin only)
+    """
+    start, end = _date_range(start, end)
+    await AsyncAnalyticsService.fold_deltas(db)
+    return await AsyncAnalyticsService.get_category_sales(db, start, end)
+
+
+@router.get("/menu-items", response_model=List[MenuItemSalesResponse])
+# Pending sales deltas are folded in first: claim, one upsert per rollup table
+@query_budget(5)
+async def get_menu_item_sales(
+    start: Optional[date] = Query(None, description="First day (inclusive), defaults to 30 days ago"),
+    end: Optional[date] = Query(None, description="Last day (inclusive), defaults to today"),
+    limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the best-selling menu items by revenue over a date range (admin only)
+    """
+    start, end = _date_range(start, end)
+    await AsyncAnalyticsService.fold_deltas(db)
+    return await AsyncAnalyticsService.get_menu_item_sales(db, start, end, limit)
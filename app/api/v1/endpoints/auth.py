@@ -2,15 +2,16 @@
 Authentication endpoints for food order booking system
 """
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.rate_limit import auth_admission
 from app.core.security import security
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.schemas.auth import Token
 from app.schemas.user import UserCreate, UserResponse
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService, UserService
 
 router = APIRouter()
 
@@ -18,23 +19,27 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user for food order booking
     """
-    return UserService.create_user(db=db, user_data=user_data)
+    auth_admission.admit(request, user_data.username)
+    return await AsyncUserService.create_user(db=db, user_data=user_data)
 
 
 @router.post("/token", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login to get access token for food order booking
     """
-    user = UserService.authenticate_user(db, form_data.username, form_data.password)
+    auth_admission.admit(request, form_data.username)
+    user = await AsyncUserService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,7 +56,9 @@ async def login(
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
         subject=user.username, 
-        expires_delta=access_token_expires
+        expires_delta=access_token_expires,
+        # Tokens without claims still carry their version so they can be revoked
+        claims=UserService.token_claims(user) if settings.TOKEN_EMBED_CLAIMS else {"ver": user.token_version or 0}
     )
     
     return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
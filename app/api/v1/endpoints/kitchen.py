@@ -0,0 +1,28 @@
+"""
+Kitchen endpoints for food order booking system
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_superuser
+from app.core.query_budget import query_budget
+from app.db.base import get_async_db
+from app.schemas.auth import TokenPrincipal
+from app.schemas.kitchen import KitchenQueueResponse
+from app.services.order_service import AsyncOrderService
+
+router = APIRouter()
+
+
+@router.get("/queue", response_model=KitchenQueueResponse)
+@query_budget(3)
+async def get_kitchen_queue(
+    limit: int = Query(20, ge=1, le=200, description="Number of orders to return"),
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the next confirmed / preparing orders in the order they should be
+    started (Admin only)
+    """
+    tickets, total = await AsyncOrderService.get_kitchen_queue(db, limit)
+    return {"orders": tickets, "total": total}
@@ -2,86 +2,159 @@
 Menu endpoints for food order booking system
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_current_active_user, get_current_superuser
-from app.db.base import get_db
-from app.models.user import User
-from app.schemas.menu import MenuItemResponse, MenuItemCreate, MenuItemUpdate
-from app.services.menu_service import MenuService
+from app.core.etag import ETAG_HEADER, etag_matches, make_etag, not_modified
+from app.core.query_budget import query_budget
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, invalid_cursor
+from app.core.response_cache import menu_response_cache
+from app.db.base import get_async_db
+from app.schemas.auth import TokenPrincipal
+from app.schemas.menu import MenuItemResponse, MenuItemCreate, MenuItemUpdate, MenuItemList
+from app.services.menu_service import AsyncMenuService, MenuService
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[MenuItemResponse])
+def _set_validators(response: Response, etag: str) -> None:
+    """Attach the ETag and ask clients to revalidate before reusing it"""
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+@router.get("/", response_model=MenuItemList)
+# Catalog reloads read a freshness marker first (see MenuCatalog)
+@query_budget(3)
 async def get_menu_items(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     category: Optional[str] = Query(None, description="Filter by category"),
     available_only: bool = Query(False, description="Show only available items"),
     search: Optional[str] = Query(None, description="Search in name and description"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all menu items with optional filtering and search
+
+    Listings (not searches) carry an ETag of the catalog content and the
+    query; a matching If-None-Match gets a 304. Listing bodies are cached
+    encoded (and gzip-compressed when large) per query and catalog.
     """
     if search:
-        return MenuService.search_menu_items(db, search, skip, limit)
-    else:
-        return MenuService.get_menu_items(
-            db, skip=skip, limit=limit, 
-            category=category, available_only=available_only
+        menu_items = await AsyncMenuService.search_menu_items(db, search, skip, limit)
+        total = await AsyncMenuService.count_search_results(db, search)
+        return MenuItemList(
+            items=[MenuItemResponse.model_validate(item) for item in menu_items],
+            total=total,
+            page=skip // limit + 1,
+            size=limit
         )
+    
+    # Listing is served from the in-memory catalog as pre-encoded bytes;
+    # only search hits the database
+    catalog = await AsyncMenuService.get_catalog(db)
+    etag = make_etag(catalog.digest, "list", skip, limit, category, available_only, cursor)
+    
+    def build() -> MenuItemList:
+        view = catalog.view(category, available_only)
+        if cursor:
+            try:
+                last_id = int(decode_cursor(cursor)["id"])
+            except (KeyError, TypeError, ValueError):
+                raise invalid_cursor()
+            menu_items = view.after(last_id, limit)
+        else:
+            menu_items = view.page(skip, limit)
+        return MenuItemList(
+            items=list(menu_items),
+            total=len(view),
+            page=None if cursor else skip // limit + 1,
+            size=limit,
+            next_cursor=MenuService.next_cursor(menu_items, limit)
+        )
+    
+    return menu_response_cache.respond(
+        ("list", catalog.digest, skip, limit, category, available_only, cursor),
+        etag, build,
+        if_none_match=if_none_match,
+        accept_encoding=accept_encoding,
+        headers=lambda page: {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+    )
 
 
 @router.get("/categories", response_model=List[str])
-async def get_categories(db: Session = Depends(get_db)):
+@query_budget(2)
+async def get_categories(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get all available menu categories
     """
-    return MenuService.get_categories(db)
+    catalog = await AsyncMenuService.get_catalog(db)
+    return menu_response_cache.respond(
+        ("categories", catalog.digest),
+        make_etag(catalog.digest, "categories"),
+        lambda: list(catalog.categories),
+        if_none_match=if_none_match,
+        accept_encoding=accept_encoding
+    )
 
 
 @router.get("/{item_id}", response_model=MenuItemResponse)
+@query_budget(2)
 async def get_menu_item(
     item_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific menu item by ID
     """
-    menu_item = MenuService.get_menu_item(db, item_id)
+    catalog = await AsyncMenuService.get_catalog(db)
+    menu_item = catalog.get(item_id)
     if not menu_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Menu item not found"
         )
+    # Per-item tag, so edits to other items do not invalidate this one
+    etag = make_etag("item", catalog.item_digests[item_id])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    _set_validators(response, etag)
     return menu_item
 
 
 @router.post("/", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu_item(
     menu_data: MenuItemCreate,
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new menu item (Admin only)
     """
-    return MenuService.create_menu_item(db, menu_data)
+    return await AsyncMenuService.create_menu_item(db, menu_data)
 
 
 @router.put("/{item_id}", response_model=MenuItemResponse)
 async def update_menu_item(
     item_id: int,
     menu_data: MenuItemUpdate,
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a menu item (Admin only)
     """
-    updated_item = MenuService.update_menu_item(db, item_id, menu_data)
+    updated_item = await AsyncMenuService.update_menu_item(db, item_id, menu_data)
     if not updated_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,13 +166,13 @@ async def update_menu_item(
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_menu_item(
     item_id: int,
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a menu item (Admin only)
     """
-    success = MenuService.delete_menu_item(db, item_id)
+    success = await AsyncMenuService.delete_menu_item(db, item_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,108 +1,262 @@
 """
 Order endpoints for food order booking system
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.api.dependencies import get_current_active_user, get_current_superuser
-from app.db.base import get_db
-from app.models.user import User
-from app.schemas.order import OrderResponse, OrderCreate, OrderUpdate
-from app.services.order_service import OrderService
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import (
+    APIRouter, Depends, Header, HTTPException, status, Query, Response, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import (
+    get_current_active_user, get_current_stream_user, get_current_superuser, principal_from_token
+)
+from app.core.config import settings
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER, idempotency_store, request_fingerprint, validate_key
+from app.core.events import ALL_ORDERS_TOPIC, Subscription, order_events, order_topic, status_topic
+from app.core.query_budget import query_budget
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.response_cache import dumps
+from app.db.base import get_async_db
+from app.schemas.auth import TokenPrincipal
+from app.models.order import COMPLETED_STATUSES, Order
+from app.schemas.order import (
+    OrderResponse, OrderCreate, OrderUpdate, OrderList,
+    OrderBatchCreate, OrderBatchResponse, OrderBatchResult
+)
+from app.services.idempotency_service import AsyncIdempotencyService
+from app.services.order_service import AsyncOrderService, OrderService
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
 
-@router.get("/", response_model=List[OrderResponse])
+# Orders are per-user: shared caches must not store them
+ORDER_CACHE_CONTROL = "private, no-cache"
+
+
+@router.get("/", response_model=OrderList)
+@query_budget(4)
 async def get_orders(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
     status_filter: Optional[str] = Query(None, description="Filter by order status"),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    exact_total: bool = Query(False, description="Admin only: count all orders exactly instead of estimating"),
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get orders for the current user or all orders (admin)
+    Get orders for the current user or all orders (admin), newest first
     """
     if current_user.is_superuser:
-        # Admin can see all orders
-        return OrderService.get_orders(
-            db, skip=skip, limit=limit, status=status_filter
-        )
+        # Admin can see all orders; the unfiltered total may be an estimate
+        user_id = None
+        estimate = not exact_total
     else:
         # Regular users can only see their own orders
-        return OrderService.get_orders(
-            db, user_id=current_user.id, skip=skip, limit=limit, status=status_filter
-        )
+        user_id = current_user.id
+        estimate = False
+    
+    orders = await AsyncOrderService.get_orders(
+        db, user_id=user_id, skip=skip, limit=limit, status=status_filter, cursor=cursor
+    )
+    total, total_is_estimate = await AsyncOrderService.count_orders(
+        db, user_id=user_id, status=status_filter, estimate=estimate
+    )
+    return _order_page(response, orders, total, total_is_estimate, skip, limit, cursor)
 
 
-@router.get("/history", response_model=List[OrderResponse])
+@router.get("/history", response_model=OrderList)
+@query_budget(4)
 async def get_order_history(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(50, ge=1, le=100, description="Number of orders to return"),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get order history for the current user
     """
-    return OrderService.get_user_order_history(
-        db, current_user.id, skip=skip, limit=limit
+    orders = await AsyncOrderService.get_user_order_history(
+        db, current_user.id, skip=skip, limit=limit, cursor=cursor
+    )
+    total, _ = await AsyncOrderService.count_orders(db, user_id=current_user.id)
+    return _order_page(response, orders, total, False, skip, limit, cursor)
+
+
+def _order_page(
+    response: Response,
+    orders: List[Order],
+    total: int,
+    total_is_estimate: bool,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+) -> OrderList:
+    """Wrap a page of orders in the list envelope"""
+    next_cursor = OrderService.next_cursor(orders, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return OrderList(
+        orders=[OrderResponse.model_validate(order) for order in orders],
+        total=total,
+        total_is_estimate=total_is_estimate,
+        page=None if cursor else skip // limit + 1,
+        size=limit,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
+@query_budget(2)
 async def get_order(
     order_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific order by ID
+    
+    Completed orders carry an ETag; a matching If-None-Match gets a 304
+    without the order being loaded.
     """
-    if current_user.is_superuser:
-        # Admin can see any order
-        order = OrderService.get_order(db, order_id)
-    else:
-        # Regular users can only see their own orders
-        order = OrderService.get_order(db, order_id, current_user.id)
+    # Admin can see any order, regular users only their own
+    user_id = None if current_user.is_superuser else current_user.id
     
+    etag = await AsyncOrderService.completed_order_etag(db, order_id, user_id)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag, ORDER_CACHE_CONTROL)
+    
+    order = await AsyncOrderService.get_order(db, order_id, user_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
+    if etag:
+        response.headers[ETAG_HEADER] = etag
+        response.headers["Cache-Control"] = ORDER_CACHE_CONTROL
     return order
 
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(8)
 async def create_order(
     order_data: OrderCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new order
+    
+    With an ``Idempotency-Key`` header the order is created at most once per
+    key: retries replay the original response (``Idempotent-Replayed: true``)
+    and concurrent duplicates wait for the first request to finish. Reusing
+    a key with a different payload is rejected with 422.
     """
-    return OrderService.create_order(db, order_data, current_user.id)
+    if idempotency_key is None:
+        return await AsyncOrderService.create_order(db, order_data, current_user.id)
+    
+    key = validate_key(idempotency_key)
+    fingerprint = request_fingerprint("POST /orders/", order_data.model_dump_json())
+    stored, replayed = await idempotency_store.execute(
+        (current_user.id, key),
+        fingerprint,
+        lookup=lambda: AsyncIdempotencyService.get_response(db, current_user.id, key),
+        run=lambda: AsyncOrderService.create_order_idempotent(
+            db, order_data, current_user.id, key, fingerprint
+        )
+    )
+    return stored.to_response(replayed)
+
+
+@router.post("/batch", response_model=OrderBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_orders_batch(
+    batch: OrderBatchCreate,
+    response: Response,
+    chunk_size: int = Query(
+        settings.ORDER_BATCH_CHUNK_SIZE, ge=1, le=settings.ORDER_BATCH_MAX_SIZE,
+        description="Orders written per transaction"
+    ),
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many orders at once
+    
+    Each order is validated and priced independently; the response reports
+    success or the failure reason per order, in submission order. Returns
+    207 when some orders failed.
+    """
+    if len(batch.orders) > settings.ORDER_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch may contain at most {settings.ORDER_BATCH_MAX_SIZE} orders"
+        )
+    
+    results: List[Optional[OrderBatchResult]] = [None] * len(batch.orders)
+    valid_indexes = []
+    valid_orders = []
+    for index, payload in enumerate(batch.orders):
+        try:
+            valid_orders.append(OrderCreate.model_validate(payload))
+            valid_indexes.append(index)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            results[index] = OrderBatchResult(
+                index=index, success=False, error=f"{location}: {error['msg']}"
+            )
+    
+    if valid_orders:
+        created = await AsyncOrderService.create_orders_batch(
+            db, valid_orders, current_user.id, chunk_size=chunk_size
+        )
+        for index, (order, error) in zip(valid_indexes, created):
+            results[index] = OrderBatchResult(
+                index=index,
+                success=order is not None,
+                order=order,
+                error=error
+            )
+    
+    created_count = sum(1 for result in results if result.success)
+    if created_count < len(results):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return OrderBatchResponse(
+        created=created_count,
+        failed=len(results) - created_count,
+        results=results
+    )
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
+@query_budget(2)
 async def update_order(
     order_id: int,
     order_data: OrderUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an order
     """
     if current_user.is_superuser:
         # Admin can update any order
-        updated_order = OrderService.update_order(db, order_id, order_data)
+        updated_order = await AsyncOrderService.update_order(db, order_id, order_data)
     else:
         # Regular users can only update their own orders
-        updated_order = OrderService.update_order(db, order_id, order_data, current_user.id)
+        updated_order = await AsyncOrderService.update_order(db, order_id, order_data, current_user.id)
     
     if not updated_order:
         raise HTTPException(
@@ -113,20 +267,21 @@ async def update_order(
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(8)
 async def delete_order(
     order_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an order
     """
     if current_user.is_superuser:
         # Admin can delete any order
-        success = OrderService.delete_order(db, order_id)
+        success = await AsyncOrderService.delete_order(db, order_id)
     else:
         # Regular users can only delete their own orders
-        success = OrderService.delete_order(db, order_id, current_user.id)
+        success = await AsyncOrderService.delete_order(db, order_id, current_user.id)
     
     if not success:
         raise HTTPException(
@@ -137,16 +292,17 @@ async def delete_order(
 
 
 @router.patch("/{order_id}/status", response_model=OrderResponse)
+@query_budget(5)
 async def update_order_status(
     order_id: int,
     status: str = Query(..., description="New order status"),
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update order status (Admin only)
     """
-    updated_order = OrderService.update_order_status(db, order_id, status)
+    updated_order = await AsyncOrderService.update_order_status(db, order_id, status)
     if not updated_order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -155,15 +311,157 @@ async def update_order_status(
     return updated_order
 
 
-@router.get("/status/{status}", response_model=List[OrderResponse])
+@router.get(
+    "/status/{status}",
+    response_model=List[OrderResponse],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+@query_budget(3)
 async def get_orders_by_status(
     status: str,
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
+    stream: bool = Query(False, description="Stream every matching order as NDJSON, ignoring skip/limit"),
+    current_user: TokenPrincipal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get orders with a specific status, oldest first (Admin only)
+    """
+    if stream:
+        return StreamingResponse(
+            _stream_orders_ndjson(db, status), media_type=NDJSON_MEDIA_TYPE
+        )
+    return await AsyncOrderService.get_orders_by_status(db, status, skip=skip, limit=limit)
+
+
+async def _stream_orders_ndjson(db: AsyncSession, status: str) -> AsyncIterator[bytes]:
+    """Encode each streamed batch of orders as one chunk of NDJSON lines"""
+    # The request's session stays open until the response body is finished
+    async for orders in AsyncOrderService.stream_orders_by_status(
+        db, status, batch_size=settings.ORDER_STREAM_BATCH_SIZE
+    ):
+        yield b"".join(
+            OrderResponse.model_validate(order).model_dump_json().encode() + b"\n"
+            for order in orders
+        )
+
+
+@router.get("/{order_id}/events", responses={200: {"content": {SSE_MEDIA_TYPE: {}}}})
+async def order_events_stream(
+    order_id: int,
+    current_user: TokenPrincipal = Depends(get_current_stream_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all orders with a specific status (Admin only)
+    Server-Sent Events for one order
+    
+    Sends the current status first, then every change until the order is
+    completed. The token may be passed as ``?access_token=`` for
+    EventSource clients.
     """
-    return OrderService.get_orders_by_status(db, status) 
\ No newline at end of file
+    # Subscribe before reading the status so no change falls in between
+    subscription = order_events.subscribe(order_topic(order_id))
+    user_id = None if current_user.is_superuser else current_user.id
+    try:
+        current_status = await AsyncOrderService.get_order_status(db, order_id, user_id)
+    finally:
+        # Release the connection; the stream may stay open for a long time
+        await db.close()
+    if current_status is None:
+        order_events.unsubscribe(subscription)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    snapshot = {"event": "order.snapshot", "order_id": order_id, "status": current_status}
+    return StreamingResponse(
+        _sse_order_events(subscription, snapshot),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse_message(event: Dict[str, Any]) -> bytes:
+    return b"event: " + event["event"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+
+async def _sse_order_events(subscription: Subscription, snapshot: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """Encode order events as SSE until the order completes or the client leaves"""
+    with subscription:
+        yield _sse_message(snapshot)
+        if snapshot["status"] in COMPLETED_STATUSES:
+            return
+        while True:
+            try:
+                event = await subscription.get(timeout=settings.ORDER_EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                yield _sse_message({"event": "stream.closed", "reason": subscription.close_reason})
+                return
+            yield _sse_message(event)
+            if event["status"] in COMPLETED_STATUSES:
+                return
+
+
+@router.websocket("/ws/kitchen")
+async def kitchen_events(
+    websocket: WebSocket,
+    statuses: Optional[List[str]] = Query(None, alias="status", description="Only orders entering or leaving these statuses"),
+    access_token: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    WebSocket feed of order events for kitchen screens (Admin only)
+    
+    Authenticate with ``?access_token=``. Every created or changed order
+    is pushed as a JSON message; idle connections get ``{"event": "ping"}``.
+    """
+    try:
+        principal = await principal_from_token(db, access_token or "")
+    except HTTPException:
+        principal = None
+    finally:
+        await db.close()
+    if principal is None or not principal.is_active or not principal.is_superuser:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    topics = [status_topic(value) for value in statuses] if statuses else [ALL_ORDERS_TOPIC]
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        with order_events.subscribe(*topics) as subscription:
+            while True:
+                getter = asyncio.ensure_future(
+                    subscription.get(timeout=settings.ORDER_EVENT_HEARTBEAT_SECONDS)
+                )
+                await asyncio.wait({getter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected.done():
+                    getter.cancel()
+                    return
+                try:
+                    event = getter.result()
+                except asyncio.TimeoutError:
+                    await websocket.send_json({"event": "ping"})
+                    continue
+                if event is None:
+                    # Evicted as a slow consumer; the client should reconnect
+                    await websocket.close(code=1013, reason=subscription.close_reason)
+                    return
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume client messages until the socket closes"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
@@ -2,19 +2,19 @@
 User management endpoints for food order booking system
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.api.dependencies import get_current_active_user
-from app.db.base import get_db
-from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdate
-from app.services.user_service import UserService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_current_active_user, get_current_active_user_record
+from app.db.base import get_async_db
+from app.schemas.auth import TokenPrincipal
+from app.schemas.user import UserResponse, UserSnapshot, UserUpdate
+from app.services.user_service import AsyncUserService
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user_record)
 ):
     """
     Get current user profile for food order booking
@@ -25,13 +25,13 @@ async def get_current_user_profile(
 @router.put("/me", response_model=UserResponse)
 async def update_current_user_profile(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user profile for food order booking
     """
-    updated_user = UserService.update_user(db, current_user.id, user_data)
+    updated_user = await AsyncUserService.update_user(db, current_user.id, user_data)
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,13 +42,13 @@ async def update_current_user_profile(
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: TokenPrincipal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete current user account from food order booking system
     """
-    success = UserService.delete_user(db, current_user.id)
+    success = await AsyncUserService.delete_user(db, current_user.id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,225 @@
+"""
+Versioned in-process menu catalog
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+from app.core.config import settings
+
+# (category or None for all categories, available_only)
+ViewKey = Tuple[Optional[str], bool]
+
+
+class CatalogView:
+    """Items matching one category/availability filter, ordered by ID"""
+    
+    __slots__ = ("items", "_ids")
+    
+    def __init__(self, items: Sequence[Any]) -> None:
+        self.items: Tuple[Any, ...] = tuple(items)
+        self._ids: Tuple[int, ...] = tuple(item.id for item in self.items)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def page(self, skip: int, limit: int) -> Tuple[Any, ...]:
+        """Items at ``skip``..``skip + limit``"""
+        return self.items[skip:skip + limit]
+    
+    def after(self, last_id: int, limit: int) -> Tuple[Any, ...]:
+        """Up to ``limit`` items with an ID greater than ``last_id``"""
+        start = bisect_right(self._ids, last_id)
+        return self.items[start:start + limit]
+
+
+_EMPTY_VIEW = CatalogView(())
+
+
+def _fingerprint(item: Any) -> str:
+    """Stable text form of an item's content"""
+    if hasattr(item, "model_dump_json"):
+        return item.model_dump_json()
+    return repr(item)
+
+
+class CatalogSnapshot:
+    """
+    Immutable menu snapshot with precomputed lookups.
+    
+    Holds every item by ID, the sorted category list, and a view per
+    category/availability filter so list requests are a slice. ``digest``
+    hashes the content itself, so unlike ``version`` it is comparable
+    across worker processes and can back HTTP validators.
+    """
+    
+    __slots__ = ("version", "digest", "item_digests", "by_id", "categories", "_views")
+    
+    def __init__(self, version: int, items: Iterable[Any]) -> None:
+        ordered = sorted(items, key=lambda item: item.id)
+        grouped: Dict[ViewKey, List[Any]] = {(None, False): ordered, (None, True): []}
+        for item in ordered:
+            grouped.setdefault((item.category, False), []).append(item)
+            grouped.setdefault((item.category, True), [])
+            if item.is_available:
+                grouped[(None, True)].append(item)
+                grouped[(item.category, True)].append(item)
+        
+        content = hashlib.sha1()
+        item_digests: Dict[int, str] = {}
+        for item in ordered:
+            item_digest = hashlib.sha1(_fingerprint(item).encode()).hexdigest()
+            item_digests[item.id] = item_digest
+            content.update(item_digest.encode())
+        
+        self.version = version
+        self.digest = content.hexdigest()
+        self.item_digests: Mapping[int, str] = MappingProxyType(item_digests)
+        self.by_id: Mapping[int, Any] = MappingProxyType({item.id: item for item in ordered})
+        self.categories: Tuple[str, ...] = tuple(sorted({item.category for item in ordered}))
+        self._views: Mapping[ViewKey, CatalogView] = MappingProxyType(
+            {key: CatalogView(members) for key, members in grouped.items()}
+        )
+    
+    def get(self, item_id: int) -> Optional[Any]:
+        """Item by ID, or None"""
+        return self.by_id.get(item_id)
+    
+    def view(self, category: Optional[str] = None, available_only: bool = False) -> CatalogView:
+        """Items matching the filters, ordered by ID"""
+        return self._views.get((category or None, available_only), _EMPTY_VIEW)
+
+
+class MenuCatalog:
+    """
+    Holder for the current catalog snapshot.
+    
+    Every menu write calls ``bump`` to advance the version; the next read
+    sees a snapshot older than the version and reloads it once. Writes made
+    by other worker processes are detected through a marker read from the
+    database (e.g. row count and latest update), checked at most every
+    ``check_interval`` seconds; the snapshot is reloaded only when the
+    marker changed. Snapshots also expire after ``ttl`` seconds, bounding
+    staleness for changes the marker cannot see. A ``ttl`` of 0 disables
+    the catalog.
+    """
+    
+    def __init__(self, ttl: float = 60.0, check_interval: float = 1.0) -> None:
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._marker: Optional[Hashable] = None
+        self._expires_at = 0.0
+        self._checked_until = 0.0
+        self._version_lock = threading.Lock()
+        # Created inside the running loop on first use (see _lock)
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._load_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.loads = 0
+        self.checks = 0
+    
+    @property
+    def version(self) -> int:
+        """Current catalog version"""
+        return self._version
+    
+    def bump(self) -> int:
+        """Mark the catalog as changed and return the new version"""
+        with self._version_lock:
+            self._version += 1
+            return self._version
+    
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The snapshot if it is still up to date, otherwise None"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            return None
+        if time.monotonic() >= self._expires_at:
+            return None
+        return snapshot
+    
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._load_lock is None or self._load_loop is not loop:
+            self._load_lock, self._load_loop = asyncio.Lock(), loop
+        return self._load_lock
+    
+    async def _fresh(
+        self,
+        marker: Optional[Callable[[], Awaitable[Hashable]]]
+    ) -> Tuple[Optional[CatalogSnapshot], Optional[Hashable]]:
+        """
+        The current snapshot, unless the database marker shows another worker
+        changed the menu, and the marker if it was read
+        """
+        snapshot = self.current()
+        if snapshot is None or marker is None or time.monotonic() < self._checked_until:
+            return snapshot, None
+        self.checks += 1
+        current_marker = await marker()
+        if current_marker != self._marker:
+            return None, current_marker
+        self._checked_until = time.monotonic() + self.check_interval
+        return snapshot, current_marker
+    
+    async def get(
+        self,
+        load: Callable[[], Awaitable[Iterable[Any]]],
+        marker: Optional[Callable[[], Awaitable[Hashable]]] = None
+    ) -> CatalogSnapshot:
+        """Return the current snapshot, calling ``load`` to rebuild it if stale"""
+        snapshot, current_marker = await self._fresh(marker)
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+        
+        async with self._lock():
+            # Another request may have rebuilt it while we waited
+            snapshot = self.current()
+            if snapshot is not None and (marker is None or self._checked_until > time.monotonic()):
+                self.hits += 1
+                return snapshot
+            
+            version = self._version
+            # Read before loading: a write in between only causes another reload
+            if current_marker is None and marker is not None:
+                current_marker = await marker()
+            snapshot = CatalogSnapshot(version, await load())
+            self.loads += 1
+            if self.ttl > 0:
+                # A bump during the load leaves this snapshot stale already
+                now = time.monotonic()
+                self._snapshot = snapshot
+                self._marker = current_marker
+                self._expires_at = now + self.ttl
+                self._checked_until = now + self.check_interval
+            return snapshot
+    
+    def clear(self) -> None:
+        """Drop the snapshot so the next read reloads it"""
+        self.bump()
+        self._snapshot = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot version, size and hit/load counters"""
+        snapshot = self._snapshot
+        return {
+            "version": self._version,
+            "snapshot_version": snapshot.version if snapshot else None,
+            "items": len(snapshot.by_id) if snapshot else 0,
+            "hits": self.hits,
+            "loads": self.loads,
+            "checks": self.checks,
+        }
+
+
+# Global menu catalog instance
+menu_catalog = MenuCatalog(
+    ttl=settings.MENU_CATALOG_TTL_SECONDS,
+    check_interval=settings.MENU_CATALOG_CHECK_SECONDS
+)
@@ -2,13 +2,9 @@
 Application configuration settings
 """
 import os
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import validator
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-
-# Load environment variables from .env file if it exists
-load_dotenv()
 
 
 class Settings(BaseSettings):
@@ -25,11 +21,69 @@ class Settings(BaseSettings):
     DB_HOST: str = "localhost"
     DB_PORT: str = "5432"
     DB_NAME: str = "food_orders_db"
+    # Full SQLAlchemy URL; overrides the DB_* components when set
+    # (e.g. "sqlite:///./food_orders.db" for local runs)
+    SQLALCHEMY_DATABASE_URI: Optional[str] = None
     
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Embed user id / active / superuser / token version claims in access
+    # tokens so authorization does not need a database lookup
+    TOKEN_EMBED_CLAIMS: bool = True
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Token-bucket limits on /auth/token and /auth/register, checked before
+    # any database or hashing work. Usernames are limited separately so a
+    # distributed attack on one account is still throttled.
+    AUTH_RATE_LIMIT_ENABLED: bool = True
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 30.0
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_USERNAME_PER_MINUTE: float = 10.0
+    AUTH_RATE_LIMIT_USERNAME_BURST: int = 5
+    AUTH_RATE_LIMIT_MAX_KEYS: int = 100000
+    # Use the first X-Forwarded-For address as the client IP (behind a proxy)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    
+    # Authenticated-user cache (TTL bounds staleness after deactivation)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    
+    # In-process menu catalog; menu writes on this worker refresh it
+    # immediately. Writes made on other workers are noticed within
+    # MENU_CATALOG_CHECK_SECONDS (one count / latest-update query, 0 checks on
+    # every read); the TTL bounds staleness for anything that check misses,
+    # such as two updates of the same item within one timestamp tick
+    MENU_CATALOG_TTL_SECONDS: float = 60.0
+    MENU_CATALOG_CHECK_SECONDS: float = 1.0
+    
+    # Encoded response bodies for cacheable reads; bodies of at least
+    # RESPONSE_GZIP_MIN_SIZE bytes are also stored gzip-compressed
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_GZIP_MIN_SIZE: int = 1024
+    
+    # Request latency / SQL metrics served at /metrics; when disabled neither
+    # the middleware nor the engine hooks are installed
+    METRICS_ENABLED: bool = True
+    
+    # Per-request query budget checks ("off", "warn" to log violations and
+    # repeated statements, "raise" to fail the request); for development
+    QUERY_BUDGET_MODE: str = "off"
+    
+    # Order writes append sales deltas; each worker folds them into the
+    # rollup tables this often (reports also fold before reading); 0 disables
+    SALES_DELTA_FOLD_SECONDS: float = 10.0
+    
+    # Startup schema handling: "verify" checks the Alembic revision with one
+    # query and refuses to start on a mismatch, "create" runs create_all
+    # (throwaway / development databases), "off" skips both
+    SCHEMA_CHECK: str = "verify"
     
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:8080"]
@@ -37,11 +91,65 @@ class Settings(BaseSettings):
     # API
     API_V1_STR: str = "/api/v1"
     
+    # Bulk order submission
+    ORDER_BATCH_MAX_SIZE: int = 1000
+    ORDER_BATCH_CHUNK_SIZE: int = 500
+    
+    # Rows fetched per server-side cursor batch for NDJSON order streams
+    ORDER_STREAM_BATCH_SIZE: int = 500
+    
+    # Idempotency-Key handling for order creation: how long stored responses
+    # are replayed, how many are kept in memory (all are also persisted),
+    # and how long a duplicate waits for the in-flight original
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0
+    
+    # Live order events (SSE / WebSocket): events buffered per subscriber
+    # before it is dropped as a slow consumer, and idle keepalive interval
+    ORDER_EVENT_QUEUE_SIZE: int = 100
+    ORDER_EVENT_HEARTBEAT_SECONDS: float = 15.0
+    
+    # Kitchen queue priority: orders are promised KITCHEN_TARGET_MINUTES after
+    # they are placed and must be started their estimated prep time before
+    # that. Prep time is a base plus per-item minutes, overridable per menu
+    # category. The queue is rebuilt from the database every
+    # KITCHEN_QUEUE_RESYNC_SECONDS to pick up changes made on other workers.
+    KITCHEN_TARGET_MINUTES: float = 30.0
+    KITCHEN_BASE_PREP_MINUTES: float = 5.0
+    KITCHEN_PREP_MINUTES_PER_ITEM: float = 2.0
+    KITCHEN_CATEGORY_PREP_MINUTES: Dict[str, float] = {}
+    KITCHEN_QUEUE_RESYNC_SECONDS: float = 60.0
+    
+    @validator("QUERY_BUDGET_MODE")
+    def valid_query_budget_mode(cls, v):
+        if v not in ("off", "warn", "raise"):
+            raise ValueError("QUERY_BUDGET_MODE must be 'off', 'warn' or 'raise'")
+        return v
+    
+    @validator("SCHEMA_CHECK")
+    def valid_schema_check(cls, v):
+        if v not in ("verify", "create", "off"):
+            raise ValueError("SCHEMA_CHECK must be 'verify', 'create' or 'off'")
+        return v
+    
     @property
     def DATABASE_URL(self) -> str:
         """Construct database URL from components"""
+        if self.SQLALCHEMY_DATABASE_URI:
+            return self.SQLALCHEMY_DATABASE_URI
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Database URL using the asyncio driver (asyncpg / aiosqlite)"""
+        url = self.DATABASE_URL
+        if url.startswith("postgresql://"):
+            return "postgresql+asyncpg://" + url[len("postgresql://"):]
+        if url.startswith("sqlite://"):
+            return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+        return url
+    
     @validator("SECRET_KEY")
     def validate_secret_key(cls, v):
         if len(v) < 32:
@@ -0,0 +1,42 @@
+"""
+Entity tags for conditional GET requests
+"""
+import hashlib
+from typing import Any, Optional
+from fastapi import Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) derived from the given version parts"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches ``etag``.
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so a
+    ``W/`` prefix on the client's tag is ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    """Empty 304 response carrying the current validator"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={ETAG_HEADER: etag, "Cache-Control": cache_control}
+    )
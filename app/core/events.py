@@ -0,0 +1,178 @@
+"""
+In-process publish/subscribe for order events
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+from app.core.config import settings
+
+# Topic carrying every order event (kitchen screens)
+ALL_ORDERS_TOPIC = "orders"
+
+_CLOSED = object()
+
+
+def order_topic(order_id: int) -> str:
+    """Topic for events about one order"""
+    return f"order:{order_id}"
+
+
+def status_topic(status: str) -> str:
+    """Topic for orders entering or leaving a status"""
+    return f"status:{status}"
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of events.
+
+    Created and consumed on one event loop; publishers on other threads or
+    loops hand events over with ``call_soon_threadsafe``. When the queue is
+    full the subscriber is evicted instead of blocking the publisher.
+    """
+
+    def __init__(self, broker: "EventBroker", topics: Iterable[str], maxsize: int) -> None:
+        self.topics = frozenset(topics)
+        self.close_reason: Optional[str] = None
+        self._broker = broker
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    @property
+    def closed(self) -> bool:
+        return self.close_reason is not None
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event from any thread"""
+        try:
+            if _running_loop() is self._loop:
+                self._offer(event)
+            else:
+                self._loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            # Subscriber's loop is gone
+            self._broker.unsubscribe(self)
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._broker.evict(self)
+
+    def close(self, reason: str) -> None:
+        """Stop the subscription; pending events are discarded"""
+        if self.closed:
+            return
+        self.close_reason = reason
+
+        def wake() -> None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_CLOSED)
+
+        try:
+            if _running_loop() is self._loop:
+                wake()
+            else:
+                self._loop.call_soon_threadsafe(wake)
+        except RuntimeError:
+            pass
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Next event, or None once the subscription is closed.
+
+        Raises ``asyncio.TimeoutError`` if nothing arrives within ``timeout``.
+        """
+        if self.closed and self._queue.empty():
+            return None
+        event = await asyncio.wait_for(self._queue.get(), timeout)
+        return None if event is _CLOSED else event
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._broker.unsubscribe(self)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class EventBroker:
+    """
+    Topic-based fan-out to subscribers in this process.
+
+    ``publish`` never blocks: each subscriber has a queue of
+    ``max_queue_size`` events and is evicted (closed with reason
+    ``"slow consumer"``) when it falls that far behind.
+    """
+
+    def __init__(self, max_queue_size: int = 100) -> None:
+        self.max_queue_size = max_queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.evicted = 0
+
+    def subscribe(self, *topics: str) -> Subscription:
+        """Subscribe to topics; must be called from the consuming event loop"""
+        subscription = Subscription(self, topics, self.max_queue_size)
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription from all its topics"""
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def evict(self, subscription: Subscription) -> None:
+        """Drop a subscriber that cannot keep up"""
+        self.unsubscribe(subscription)
+        subscription.close("slow consumer")
+        with self._lock:
+            self.evicted += 1
+
+    def publish(self, topics: Iterable[str], event: Dict[str, Any]) -> int:
+        """Send an event to every subscriber of any of the topics; returns the count"""
+        with self._lock:
+            recipients: Set[Subscription] = set()
+            for topic in topics:
+                recipients.update(self._topics.get(topic, ()))
+            self.published += 1
+        for subscription in recipients:
+            subscription.deliver(event)
+        return len(recipients)
+
+    def subscriber_count(self, topic: Optional[str] = None) -> int:
+        """Subscribers on one topic, or distinct subscribers overall"""
+        with self._lock:
+            if topic is not None:
+                return len(self._topics.get(topic, ()))
+            return len(set().union(*self._topics.values())) if self._topics else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscriber count and publish/eviction counters"""
+        return {
+            "subscribers": self.subscriber_count(),
+            "topics": len(self._topics),
+            "published": self.published,
+            "evicted": self.evicted,
+        }
+
+
+# Global order event broker
+order_events = EventBroker(max_queue_size=settings.ORDER_EVENT_QUEUE_SIZE)
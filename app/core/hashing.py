@@ -0,0 +1,162 @@
+"""
+Bounded worker pool for password hashing and verification
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    """Hash a password in a worker, returning the hash and time spent"""
+    from app.core.security import password_context
+
+    started = time.perf_counter()
+    hashed = password_context().hash(password)
+    return hashed, time.perf_counter() - started
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> Tuple[bool, float]:
+    """Verify a password in a worker, returning the result and time spent"""
+    from app.core.security import password_context
+
+    started = time.perf_counter()
+    verified = password_context().verify(plain_password, hashed_password)
+    return verified, time.perf_counter() - started
+
+
+class _TimingStats:
+    """Running count / total / max of a duration in seconds"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a bounded thread or process pool.
+
+    At most ``max_pending`` operations may be queued or running at once;
+    beyond that callers get a 503 immediately instead of piling up behind
+    the pool. Time spent waiting for a worker and time spent hashing are
+    recorded separately.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 32
+    ) -> None:
+        if executor_type not in ("thread", "process"):
+            raise ValueError("executor_type must be 'thread' or 'process'")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        self.wait_time = _TimingStats()
+        self.hash_time = _TimingStats()
+
+    @property
+    def pending(self) -> int:
+        """Number of operations queued or running"""
+        return self._pending
+
+    @property
+    def saturated(self) -> bool:
+        """Whether a new operation would be rejected right now"""
+        return self._pending >= self.max_pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    async def _submit(self, fn: Callable[..., Tuple[Any, float]], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        elapsed = time.perf_counter() - submitted
+        self.hash_time.observe(hash_seconds)
+        self.wait_time.observe(max(elapsed - hash_seconds, 0.0))
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash on the worker pool"""
+        return await self._submit(_timed_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash on the worker pool"""
+        return await self._submit(_timed_verify, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool wait time, hash time and rejections"""
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "wait_time": self.wait_time.as_dict(),
+            "hash_time": self.hash_time.as_dict(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (it is recreated lazily on next use)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
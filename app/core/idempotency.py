@@ -0,0 +1,181 @@
+"""
+Idempotency-Key support: replay stored responses to retried requests
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import HTTPException, Response, status
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# Set on responses replayed from the store rather than freshly executed
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def request_fingerprint(*parts: str) -> str:
+    """SHA-256 over the parts of a request that must match on retry"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def validate_key(key: str) -> str:
+    """Reject empty or oversized keys"""
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"
+        )
+    return key
+
+
+class StoredResponse:
+    """Status and encoded JSON body of a completed request"""
+    
+    __slots__ = ("fingerprint", "status_code", "body")
+    
+    def __init__(self, fingerprint: str, status_code: int, body: bytes) -> None:
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.body = body
+    
+    def to_response(self, replayed: bool) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=JSON_MEDIA_TYPE,
+            headers={REPLAYED_HEADER: "true" if replayed else "false"}
+        )
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class IdempotencyStore:
+    """
+    Runs each idempotency key at most once per process and remembers the result.
+    
+    Completed responses are kept in a bounded LRU in front of the database
+    table. A duplicate that arrives while the first request is still running
+    waits for it (up to ``wait_seconds``) instead of executing again, then
+    replays its response. Waiters may be on other event loops, so they are
+    woken with ``call_soon_threadsafe``.
+    """
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 86400.0, wait_seconds: float = 30.0) -> None:
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.responses: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[Hashable, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.replays = 0
+        self.waits = 0
+    
+    async def execute(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        lookup: Callable[[], Awaitable[Optional[StoredResponse]]],
+        run: Callable[[], Awaitable[Optional[StoredResponse]]]
+    ) -> Tuple[StoredResponse, bool]:
+        """
+        Return ``(response, replayed)`` for a request carrying ``key``
+        
+        ``lookup`` reads a persisted response; ``run`` executes the request
+        and persists its response in the same transaction. ``run`` returns
+        None if another process stored the key first, in which case that
+        stored response is replayed. Failed executions are not stored, so a
+        retry after an error runs again.
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            stored = self.responses.get(key)
+            if stored is not None:
+                return self._replay(stored, fingerprint)
+            
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                waiters = self._inflight.get(key)
+                if waiters is None:
+                    self._inflight[key] = []
+                    break
+                future = loop.create_future()
+                waiters.append((loop, future))
+            
+            self.waits += 1
+            try:
+                await asyncio.wait_for(future, max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still being processed"
+                )
+        
+        try:
+            stored = await lookup()
+            if stored is None:
+                stored = await run()
+                if stored is not None:
+                    self.executions += 1
+                    self.responses.set(key, stored)
+                    return stored, False
+                stored = await lookup()
+                if stored is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A request with this Idempotency-Key is still being processed"
+                    )
+            self.responses.set(key, stored)
+            return self._replay(stored, fingerprint)
+        finally:
+            with self._lock:
+                waiters = self._inflight.pop(key)
+            for loop, future in waiters:
+                try:
+                    loop.call_soon_threadsafe(_wake, future)
+                except RuntimeError:
+                    # Waiter's loop has already closed
+                    pass
+    
+    def _replay(self, stored: StoredResponse, fingerprint: str) -> Tuple[StoredResponse, bool]:
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        self.replays += 1
+        return stored, True
+    
+    def clear(self) -> None:
+        """Forget completed responses (persisted ones are looked up again)"""
+        self.responses.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cached responses, in-flight keys and execution/replay/wait counters"""
+        return {
+            "cached": len(self.responses),
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "replays": self.replays,
+            "waits": self.waits,
+        }
+
+
+# Global idempotency store for order creation
+idempotency_store = IdempotencyStore(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS
+)
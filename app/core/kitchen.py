@@ -0,0 +1,239 @@
+"""
+In-memory kitchen queue of active orders
+"""
+import asyncio
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from app.core.config import settings
+
+# (start_by, created_at, order_id): earliest required start first, then oldest
+SortKey = Tuple[datetime, datetime, int]
+
+
+def _utc(value: Optional[datetime]) -> datetime:
+    """Timezone-aware UTC form of a stored timestamp (naive values are UTC)"""
+    if value is None:
+        return datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class KitchenTicket:
+    """What the kitchen needs to know about one active order"""
+    
+    __slots__ = ("order_id", "status", "created_at", "promised_at", "prep_minutes", "items", "start_by")
+    
+    def __init__(
+        self,
+        order_id: int,
+        status: str,
+        created_at: datetime,
+        promised_at: datetime,
+        prep_minutes: float,
+        items: Tuple[Dict[str, Any], ...]
+    ) -> None:
+        self.order_id = order_id
+        self.status = status
+        self.created_at = created_at
+        self.promised_at = promised_at
+        self.prep_minutes = prep_minutes
+        self.items = items
+        self.start_by = promised_at - timedelta(minutes=prep_minutes)
+    
+    @property
+    def sort_key(self) -> SortKey:
+        return (self.start_by, self.created_at, self.order_id)
+
+
+class KitchenQueue:
+    """
+    Active orders kept in a binary heap ordered by when they must be started.
+    
+    An order's deadline is its promised time (``target_minutes`` after it was
+    placed) minus its estimated prep time, so large orders move ahead of
+    small ones placed at the same time and ties go to the oldest order.
+    Adding, re-prioritising and removing an order cost O(log n); removed
+    entries are skipped lazily and compacted once they make up half the heap.
+    """
+    
+    def __init__(
+        self,
+        target_minutes: float = 30.0,
+        base_prep_minutes: float = 5.0,
+        prep_minutes_per_item: float = 2.0,
+        category_prep_minutes: Optional[Mapping[str, float]] = None,
+        resync_seconds: float = 60.0
+    ) -> None:
+        self.target_minutes = target_minutes
+        self.base_prep_minutes = base_prep_minutes
+        self.prep_minutes_per_item = prep_minutes_per_item
+        self.category_prep_minutes = dict(category_prep_minutes or {})
+        self.resync_seconds = resync_seconds
+        # Heap entries are [sort_key, ticket]; a removed entry's ticket is None
+        self._heap: List[list] = []
+        self._entries: Dict[int, list] = {}
+        self._stale = 0
+        self._lock = threading.Lock()
+        # Created inside the running loop on first use (see _loader_lock)
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._load_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changes = 0
+        self._expires_at: Optional[float] = None
+        self.loads = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._entries
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the queue holds a snapshot that has not passed its resync time"""
+        return self._expires_at is not None and time.monotonic() < self._expires_at
+    
+    def ticket_for(self, order: Any) -> KitchenTicket:
+        """Build a ticket from an order with its items and menu items loaded"""
+        created_at = _utc(order.created_at)
+        prep_minutes = self.base_prep_minutes
+        items = []
+        for order_item in order.order_items:
+            menu_item = order_item.menu_item
+            per_item = self.category_prep_minutes.get(menu_item.category, self.prep_minutes_per_item)
+            prep_minutes += per_item * order_item.quantity
+            items.append({
+                "menu_item_id": order_item.menu_item_id,
+                "name": menu_item.name,
+                "quantity": order_item.quantity,
+            })
+        return KitchenTicket(
+            order.id,
+            order.status,
+            created_at,
+            created_at + timedelta(minutes=self.target_minutes),
+            prep_minutes,
+            tuple(items)
+        )
+    
+    def update(self, order: Any, statuses: Iterable[str]) -> None:
+        """Track, re-prioritise or drop an order after a committed change"""
+        if order.status in statuses:
+            self.push(self.ticket_for(order))
+        else:
+            self.remove(order.id)
+    
+    def push(self, ticket: KitchenTicket) -> None:
+        """Add a ticket, replacing any earlier one for the same order"""
+        with self._lock:
+            self._discard(ticket.order_id)
+            entry = [ticket.sort_key, ticket]
+            self._entries[ticket.order_id] = entry
+            heapq.heappush(self._heap, entry)
+            self._changes += 1
+    
+    def remove(self, order_id: int) -> bool:
+        """Stop tracking an order; returns whether it was queued"""
+        with self._lock:
+            removed = self._discard(order_id)
+            if removed:
+                self._changes += 1
+            return removed
+    
+    def _discard(self, order_id: int) -> bool:
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return False
+        entry[-1] = None
+        self._stale += 1
+        if self._stale > len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[-1] is not None]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return True
+    
+    def peek(self, limit: int) -> List[KitchenTicket]:
+        """
+        The ``limit`` highest-priority tickets, in order, without removing them.
+        
+        Walks the heap best-first from the root with a frontier heap, so the
+        cost is O(limit log limit) rather than a sort of the whole queue.
+        """
+        with self._lock:
+            heap = self._heap
+            tickets: List[KitchenTicket] = []
+            frontier = [(heap[0][0], 0)] if heap else []
+            while frontier and len(tickets) < limit:
+                _, index = heapq.heappop(frontier)
+                ticket = heap[index][-1]
+                if ticket is not None:
+                    tickets.append(ticket)
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], child))
+            return tickets
+    
+    def rebuild(self, orders: Iterable[Any]) -> None:
+        """Replace the queue with tickets for ``orders`` in O(n)"""
+        heap = []
+        entries = {}
+        for order in orders:
+            ticket = self.ticket_for(order)
+            entry = [ticket.sort_key, ticket]
+            heap.append(entry)
+            entries[ticket.order_id] = entry
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap, self._entries, self._stale = heap, entries, 0
+            self._changes += 1
+        self._expires_at = time.monotonic() + self.resync_seconds
+        self.loads += 1
+    
+    def _loader_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._load_lock is None or self._load_loop is not loop:
+            self._load_lock, self._load_loop = asyncio.Lock(), loop
+        return self._load_lock
+    
+    async def ensure_loaded(self, load: Callable[[], Awaitable[Iterable[Any]]]) -> None:
+        """Rebuild from ``load`` (active orders) if never loaded or due for resync"""
+        if self.loaded:
+            return
+        async with self._loader_lock():
+            if self.loaded:
+                return
+            changes = self._changes
+            self.rebuild(await load())
+            if self._changes != changes + 1:
+                # An order changed while loading and the loaded rows may
+                # predate it, so load again on the next read
+                self._expires_at = time.monotonic()
+    
+    def clear(self) -> None:
+        """Empty the queue and mark it unloaded"""
+        with self._lock:
+            self._heap, self._entries, self._stale = [], {}, 0
+            self._changes += 1
+        self._expires_at = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue size, heap size including removed entries, and load count"""
+        return {
+            "orders": len(self._entries),
+            "heap_size": len(self._heap),
+            "loaded": self.loaded,
+            "loads": self.loads,
+        }
+
+
+# Global kitchen queue instance
+kitchen_queue = KitchenQueue(
+    target_minutes=settings.KITCHEN_TARGET_MINUTES,
+    base_prep_minutes=settings.KITCHEN_BASE_PREP_MINUTES,
+    prep_minutes_per_item=settings.KITCHEN_PREP_MINUTES_PER_ITEM,
+    category_prep_minutes=settings.KITCHEN_CATEGORY_PREP_MINUTES,
+    resync_seconds=settings.KITCHEN_QUEUE_RESYNC_SECONDS
+)
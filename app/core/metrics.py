@@ -0,0 +1,396 @@
+"""
+In-process metrics exported in the Prometheus text format
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cached reads (sub-millisecond) through slow bcrypt logins
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Common name / help / label bookkeeping"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+    
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+    
+    def render(self) -> List[str]:
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, help, label_names)
+        self._values: Dict[Labels, float] = {}
+    
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0.0)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """
+    Bucketed observations per label set.
+    
+    Each label set holds one count per bucket (non-cumulative, so an
+    observation touches a single slot) plus a running sum and count;
+    cumulative bucket counts are only computed when rendering.
+    """
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+    
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+    
+    def sum(self, labels: Labels = ()) -> float:
+        series = self._series.get(labels)
+        return series[-1] if series else 0.0
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            series_items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, series in series_items:
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class GaugeCallback(_Metric):
+    """Gauge whose samples are read from a callback at scrape time only"""
+    
+    kind = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Tuple[Labels, float]]],
+        label_names: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, help, label_names)
+        self.collect = collect
+    
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(float(value))}"
+            for labels, value in self.collect()
+        ]
+    
+    def clear(self) -> None:
+        pass
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+    
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric, or return the one already registered under its name"""
+        return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, label_names))
+    
+    def histogram(
+        self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, label_names, buckets))
+    
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Tuple[Labels, float]]],
+        label_names: Sequence[str] = ()
+    ) -> GaugeCallback:
+        return self.register(GaugeCallback(name, help, collect, label_names))
+    
+    def stats_gauge(self, name: str, help: str, stats: Callable[[], Dict[str, Any]]) -> GaugeCallback:
+        """Export the numeric top-level values of a ``stats()`` dict, keyed by label ``stat``"""
+        def collect() -> Iterable[Tuple[Labels, float]]:
+            return [
+                ((key,), value) for key, value in stats().items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            ]
+        return self.gauge(name, help, collect, ("stat",))
+    
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+    
+    def clear(self) -> None:
+        """Reset recorded values (callback gauges are unaffected)"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+class RequestDBStats:
+    """Statements issued and time spent in the database by one request"""
+    
+    __slots__ = ("statements", "seconds")
+    
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by the metrics middleware for the duration of each HTTP request; the
+# SQLAlchemy hooks add to it. ``run_sync`` greenlets share the caller's context.
+current_request_db: ContextVar[Optional[RequestDBStats]] = ContextVar("current_request_db", default=None)
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status")
+)
+http_request_db_statements = registry.histogram(
+    "http_request_db_statements", "SQL statements issued per HTTP request",
+    ("method", "route"), STATEMENT_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per HTTP request",
+    ("method", "route")
+)
+db_statements = registry.counter(
+    "db_statements_total", "SQL statements executed", ("engine",)
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds", "SQL statement execution time", ("engine",)
+)
+db_pool_checkout_duration = registry.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to obtain a pooled connection, including waiting for one to be returned", ("engine",)
+)
+
+_engines: Dict[str, Any] = {}
+
+
+def _pool_samples(attribute: str) -> Iterable[Tuple[Labels, float]]:
+    samples = []
+    for engine_name, engine in _engines.items():
+        # Read engine.pool at scrape time: dispose() replaces the pool object
+        method = getattr(engine.pool, attribute, None)
+        if callable(method):
+            samples.append(((engine_name,), method()))
+    return samples
+
+
+registry.gauge(
+    "db_pool_connections_in_use", "Connections currently checked out of the pool",
+    lambda: _pool_samples("checkedout"), ("engine",)
+)
+registry.gauge(
+    "db_pool_connections_idle", "Connections idle in the pool",
+    lambda: _pool_samples("checkedin"), ("engine",)
+)
+registry.gauge(
+    "db_pool_overflow", "Connections open beyond the configured pool size",
+    lambda: _pool_samples("overflow"), ("engine",)
+)
+
+
+def instrument_engine(engine: Any, name: str) -> None:
+    """
+    Count statements and time them on a (sync) Engine, and time pool
+    checkouts. Safe to call more than once per engine.
+    """
+    from sqlalchemy import event
+    
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    engine._metrics_instrumented = True
+    labels = (name,)
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+    
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        db_statements.inc(1, labels)
+        db_statement_duration.observe(elapsed, labels)
+        stats = current_request_db.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+    
+    def handle_error(exception_context):
+        started = exception_context.connection.info.get("metrics_started") if exception_context.connection else None
+        if started:
+            started.pop()
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+    _instrument_checkout(engine, name)
+    _engines[name] = engine
+
+
+def _instrument_checkout(engine: Any, name: str) -> None:
+    """
+    Time pool checkouts at the engine rather than on the pool object, which
+    ``dispose()`` / ``recreate()`` replace. Pool events cannot be used here:
+    the ``checkout`` event fires only once a connection has been obtained,
+    so the wait for one would go unmeasured.
+    """
+    raw_connection = engine.raw_connection
+    labels = (name,)
+    
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_pool_checkout_duration.observe(time.perf_counter() - started, labels)
+    
+    engine.raw_connection = timed_raw_connection
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and per-request SQL statement counts
+    and time, labelled by route template (not raw path) to bound cardinality.
+    """
+    
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._route_paths: Dict[Any, str] = {}
+        self._route_count = -1
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestDBStats()
+        token = current_request_db.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+        
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_db.reset(token)
+            method = scope["method"]
+            route = self._route_path(scope)
+            http_request_duration.observe(elapsed, (method, route, f"{status_code // 100}xx"))
+            http_request_db_statements.observe(stats.statements, (method, route))
+            http_request_db_duration.observe(stats.seconds, (method, route))
+    
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        app = scope.get("app")
+        routes = getattr(app, "routes", ())
+        if len(routes) != self._route_count:
+            self._route_paths = {
+                route.endpoint: route.path for route in routes if hasattr(route, "endpoint")
+            }
+            self._route_count = len(routes)
+        return self._route_paths.get(endpoint, "<unmatched>")
@@ -0,0 +1,36 @@
+"""
+Opaque cursor helpers for keyset pagination
+"""
+import base64
+import json
+from typing import Any, Dict
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a seek position as an opaque URL-safe cursor"""
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def invalid_cursor() -> HTTPException:
+    """Error raised for malformed or tampered cursors"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor"
+    )
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise invalid_cursor()
+    if not isinstance(position, dict):
+        raise invalid_cursor()
+    return position
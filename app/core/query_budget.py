@@ -0,0 +1,219 @@
+"""
+SQL statement capture, N+1 detection and per-endpoint query budgets
+"""
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|:\w+|\$\d+))*\s*\)")
+_PLACEHOLDER = re.compile(r"%s|:\w+|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+# (normalized SQL, call site)
+Shape = Tuple[str, str]
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals and bound parameters become
+    ``?``, and IN / VALUES lists of any length collapse to ``(...)``
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def call_site() -> str:
+    """``path:line (function)`` of the innermost application frame issuing SQL"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_ROOT) and filename != _THIS_FILE:
+            relative = os.path.relpath(filename, os.path.dirname(_APP_ROOT))
+            return f"{relative}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class QueryCapture:
+    """Statements issued while a capture is active, grouped by shape"""
+    
+    def __init__(self) -> None:
+        self.statements: List[Tuple[str, str]] = []
+        self._shapes: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def record(self, statement: str, site: str) -> None:
+        with self._lock:
+            self.statements.append((statement, site))
+            self._shapes[(normalize_sql(statement), site)] += 1
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def shapes(self) -> Dict[Shape, int]:
+        """Statement count per (normalized SQL, call site)"""
+        return dict(self._shapes)
+    
+    def repeated(self, threshold: int = 2) -> List[Tuple[Shape, int]]:
+        """Shapes issued at least ``threshold`` times: likely N+1 loops"""
+        return [(shape, count) for shape, count in self._shapes.most_common() if count >= threshold]
+    
+    def report(self) -> str:
+        """Human-readable summary for assertion messages and logs"""
+        lines = [f"{self.count} statements"]
+        for (sql, site), count in self._shapes.most_common():
+            lines.append(f"  {count}x {site}: {sql[:200]}")
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request issued more statements, or repeated a shape more often, than allowed"""
+
+
+class QueryBudget:
+    """Maximum statements per request, and maximum repeats of any one shape"""
+    
+    __slots__ = ("statements", "repeats")
+    
+    def __init__(self, statements: int, repeats: int = 1) -> None:
+        self.statements = statements
+        self.repeats = repeats
+    
+    def violations(self, capture: QueryCapture) -> List[str]:
+        problems = []
+        if capture.count > self.statements:
+            problems.append(f"{capture.count} statements exceed the budget of {self.statements}")
+        for (sql, site), count in capture.repeated(self.repeats + 1):
+            problems.append(f"{site} issued the same statement {count} times: {sql[:200]}")
+        return problems
+    
+    def check(self, capture: QueryCapture, label: str = "request") -> None:
+        """Raise QueryBudgetExceeded describing every violation"""
+        problems = self.violations(capture)
+        if problems:
+            raise QueryBudgetExceeded(f"{label}: " + "; ".join(problems) + "\n" + capture.report())
+
+
+def query_budget(statements: int, repeats: int = 1) -> Callable[[Callable], Callable]:
+    """
+    Declare an endpoint's query budget; apply below the route decorator.
+    
+    Budgets describe the steady state (principal cache and menu catalog
+    warm). The function is returned unchanged apart from a
+    ``query_budget`` attribute, which tests and QueryBudgetMiddleware read.
+    """
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.query_budget = QueryBudget(statements, repeats)
+        return endpoint
+    return decorate
+
+
+def budget_for(endpoint: Callable) -> Optional[QueryBudget]:
+    """The budget declared on an endpoint, if any"""
+    return getattr(endpoint, "query_budget", None)
+
+
+# Capture for the current request (set by QueryBudgetMiddleware)
+_request_capture: ContextVar[Optional[QueryCapture]] = ContextVar("request_query_capture", default=None)
+# Captures opened with capture_queries(); they see statements from every thread
+_global_captures: List[QueryCapture] = []
+_capture_lock = threading.Lock()
+
+
+def install(engine: Any) -> None:
+    """
+    Add the capture hook to a (sync) Engine. Without an active capture the
+    hook is a ContextVar lookup and an empty-list check. Safe to call more
+    than once per engine.
+    """
+    from sqlalchemy import event
+    
+    if getattr(engine, "_query_capture_installed", False):
+        return
+    engine._query_capture_installed = True
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        capture = _request_capture.get()
+        if capture is None and not _global_captures:
+            return
+        site = call_site()
+        if capture is not None:
+            capture.record(statement, site)
+        for global_capture in list(_global_captures):
+            global_capture.record(statement, site)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryCapture]:
+    """
+    Capture every statement on instrumented engines until the block exits.
+    
+    Not scoped to a request: meant for tests and scripts, where the code
+    under test may run on another thread (e.g. the TestClient portal).
+    """
+    capture = QueryCapture()
+    with _capture_lock:
+        _global_captures.append(capture)
+    try:
+        yield capture
+    finally:
+        with _capture_lock:
+            _global_captures.remove(capture)
+
+
+class QueryBudgetMiddleware:
+    """
+    Debug middleware checking each request against its endpoint's budget.
+    
+    ``mode="warn"`` logs violations and repeated statement shapes;
+    ``mode="raise"`` raises QueryBudgetExceeded after the response.
+    """
+    
+    def __init__(self, app: Any, mode: str = "warn") -> None:
+        if mode not in ("warn", "raise"):
+            raise ValueError("mode must be 'warn' or 'raise'")
+        self.app = app
+        self.mode = mode
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        capture = QueryCapture()
+        token = _request_capture.set(capture)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_capture.reset(token)
+        
+        endpoint = scope.get("endpoint")
+        budget = budget_for(endpoint) if endpoint is not None else None
+        label = f"{scope['method']} {scope['path']}"
+        if budget is None:
+            budget = QueryBudget(statements=sys.maxsize)
+        problems = budget.violations(capture)
+        if not problems:
+            return
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(f"{label}: " + "; ".join(problems) + "\n" + capture.report())
+        logger.warning("Query budget exceeded for %s: %s\n%s", label, "; ".join(problems), capture.report())
@@ -0,0 +1,176 @@
+"""
+Token-bucket rate limiting and admission control for authentication
+"""
+import math
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, password_hasher
+
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key, refilled at ``rate`` tokens per second up to
+    ``burst``.
+    
+    A bucket is stored as a ``(tokens, updated_at)`` tuple in a dict kept
+    in least-recently-used order. Every ``sweep_seconds`` buckets that have
+    refilled completely are dropped, since a full bucket behaves exactly
+    like a missing one; past ``max_keys`` the least recently used bucket is
+    dropped as well. Memory therefore tracks the number of recently active
+    clients, not the number ever seen.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 100000,
+        sweep_seconds: float = 60.0
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.sweep_seconds = sweep_seconds
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_seconds
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+    
+    def acquire(self, key: Hashable, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; returns 0 if allowed, else seconds until it would be"""
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+                self.allowed += 1
+            else:
+                wait = (cost - tokens) / self.rate if self.rate > 0 else math.inf
+                self.rejected += 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.pop(next(iter(self._buckets)))
+                self.evicted += 1
+            return wait
+    
+    def _sweep(self, now: float) -> None:
+        full = [
+            key for key, (tokens, updated_at) in self._buckets.items()
+            if tokens + (now - updated_at) * self.rate >= self.burst
+        ]
+        for key in full:
+            del self._buckets[key]
+        self.evicted += len(full)
+        self._next_sweep = now + self.sweep_seconds
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+    
+    def clear(self) -> None:
+        """Drop every bucket"""
+        with self._lock:
+            self._buckets.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Tracked keys and allowed/rejected/evicted counters"""
+        return {
+            "keys": len(self._buckets),
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
+
+
+def client_ip(request: Request) -> str:
+    """Client address, taken from X-Forwarded-For only when configured to trust it"""
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class AuthAdmission:
+    """
+    Cheap checks run before any database or bcrypt work on auth endpoints.
+    
+    Requests are rejected with 429 when the client IP or the target username
+    is out of tokens, and with 503 when the password hashing pool is
+    already full.
+    """
+    
+    def __init__(
+        self,
+        by_ip: TokenBucketLimiter,
+        by_username: TokenBucketLimiter,
+        hasher: PasswordHasher,
+        enabled: bool = True
+    ) -> None:
+        self.by_ip = by_ip
+        self.by_username = by_username
+        self.hasher = hasher
+        self.enabled = enabled
+        self.rejected_busy = 0
+    
+    def admit(self, request: Request, username: Optional[str]) -> None:
+        """Raise 429/503 if the request should not reach the database"""
+        if not self.enabled:
+            return
+        wait = self.by_ip.acquire(client_ip(request))
+        if not wait and username:
+            wait = self.by_username.acquire(username.strip().lower())
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication attempts, please retry later",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+        if self.hasher.saturated:
+            self.rejected_busy += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+    
+    def clear(self) -> None:
+        """Reset every bucket"""
+        self.by_ip.clear()
+        self.by_username.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-IP and per-username limiter counters and busy rejections"""
+        return {
+            "enabled": self.enabled,
+            "by_ip": self.by_ip.stats(),
+            "by_username": self.by_username.stats(),
+            "rejected_busy": self.rejected_busy,
+        }
+
+
+# Global admission control for /auth/token and /auth/register
+auth_admission = AuthAdmission(
+    by_ip=TokenBucketLimiter(
+        rate=settings.AUTH_RATE_LIMIT_IP_PER_MINUTE / 60.0,
+        burst=settings.AUTH_RATE_LIMIT_IP_BURST,
+        max_keys=settings.AUTH_RATE_LIMIT_MAX_KEYS,
+    ),
+    by_username=TokenBucketLimiter(
+        rate=settings.AUTH_RATE_LIMIT_USERNAME_PER_MINUTE / 60.0,
+        burst=settings.AUTH_RATE_LIMIT_USERNAME_BURST,
+        max_keys=settings.AUTH_RATE_LIMIT_MAX_KEYS,
+    ),
+    hasher=password_hasher,
+    enabled=settings.AUTH_RATE_LIMIT_ENABLED,
+)
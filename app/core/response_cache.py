@@ -0,0 +1,126 @@
+"""
+Cache of fully encoded response bodies for read-mostly endpoints
+"""
+import gzip
+import json
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+
+JSON_MEDIA_TYPE = "application/json"
+
+_json_adapter = TypeAdapter(Any)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content to the same bytes an uncached FastAPI response would
+    carry: pydantic's JSON mode (models, datetimes) encoded the way
+    Starlette's JSONResponse does
+    """
+    return json.dumps(
+        _json_adapter.dump_python(content, mode="json", by_alias=True),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def gzip_etag(etag: str) -> str:
+    """Distinct strong ETag for the gzip-encoded representation"""
+    return f'{etag[:-1]}-gzip"'
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip"""
+    if not accept_encoding:
+        return False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class CachedBody:
+    """Encoded body, its gzip variant (if worth it) and response headers"""
+    
+    __slots__ = ("body", "gzip_body", "etag", "headers")
+    
+    def __init__(self, body: bytes, etag: str, headers: Dict[str, str], gzip_min_size: int) -> None:
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= gzip_min_size else None
+        self.etag = etag
+        self.headers = headers
+    
+    def to_response(self, use_gzip: bool) -> Response:
+        """Response writing the stored bytes as-is"""
+        headers = {**self.headers, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if use_gzip and self.gzip_body is not None:
+            headers[ETAG_HEADER] = gzip_etag(self.etag)
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=self.gzip_body, media_type=JSON_MEDIA_TYPE, headers=headers)
+        headers[ETAG_HEADER] = self.etag
+        return Response(content=self.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+class ResponseBytesCache:
+    """
+    LRU of encoded bodies keyed by endpoint, data version and parameters.
+
+    Keys must include whatever version identifies the underlying data
+    (e.g. the catalog digest), so entries never need invalidating; stale
+    ones simply age out.
+    """
+    
+    def __init__(self, maxsize: int = 256, gzip_min_size: int = 1024) -> None:
+        self.gzip_min_size = gzip_min_size
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+    
+    def respond(
+        self,
+        key: Hashable,
+        etag: str,
+        build: Callable[[], Any],
+        if_none_match: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+        headers: Optional[Callable[[Any], Dict[str, str]]] = None
+    ) -> Response:
+        """
+        304 if the client's tag matches, else the cached bytes for ``key``.
+
+        On a miss ``build`` produces the content (a pydantic model or
+        JSON-compatible data) and ``headers`` any extra response headers
+        derived from it.
+        """
+        use_gzip = accepts_gzip(accept_encoding)
+        for tag in (gzip_etag(etag), etag) if use_gzip else (etag,):
+            if etag_matches(if_none_match, tag):
+                return not_modified(tag)
+        
+        entry = self._entries.get(key)
+        if entry is None:
+            content = build()
+            extra_headers = headers(content) if headers else {}
+            entry = CachedBody(dumps(content), etag, extra_headers, self.gzip_min_size)
+            self._entries.set(key, entry)
+        return entry.to_response(use_gzip)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters"""
+        return self._entries.stats()
+
+
+# Encoded menu list / category bodies
+menu_response_cache = ResponseBytesCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    gzip_min_size=settings.RESPONSE_GZIP_MIN_SIZE,
+)
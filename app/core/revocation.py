@@ -0,0 +1,64 @@
+"""
+In-memory revocation set for stateless access tokens
+"""
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+from app.core.config import settings
+
+
+class RevocationSet:
+    """
+    Minimum accepted token version per user.
+
+    A token carrying ``(user_id, version)`` is revoked when ``version`` is
+    below the stored minimum. Entries are reloaded from the database every
+    ``refresh_interval`` seconds; changes made on this worker apply
+    immediately through ``revoke``.
+    """
+    
+    def __init__(self, refresh_interval: float = 5.0) -> None:
+        self.refresh_interval = refresh_interval
+        self._min_versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._next_refresh = 0.0
+    
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        """Check whether a token version has been revoked for a user"""
+        return token_version < self._min_versions.get(user_id, 0)
+    
+    def revoke(self, user_id: int, min_token_version: int) -> None:
+        """Reject tokens for a user below the given version"""
+        with self._lock:
+            if min_token_version > self._min_versions.get(user_id, 0):
+                self._min_versions[user_id] = min_token_version
+    
+    def claim_refresh(self) -> bool:
+        """Return True (once per interval) when the set should be reloaded"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_refresh:
+                return False
+            self._next_refresh = now + self.refresh_interval
+            return True
+    
+    def load(self, entries: Iterable[Tuple[int, int]]) -> None:
+        """Replace the set with ``(user_id, min_token_version)`` pairs"""
+        with self._lock:
+            pending = self._min_versions
+            self._min_versions = {}
+            for user_id, min_version in entries:
+                self._min_versions[user_id] = max(min_version, pending.get(user_id, 0))
+    
+    def clear(self) -> None:
+        """Drop all entries and force a reload on next use"""
+        with self._lock:
+            self._min_versions = {}
+            self._next_refresh = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._min_versions)
+
+
+# Global revocation set instance
+revocation_set = RevocationSet(refresh_interval=settings.TOKEN_REVOCATION_REFRESH_SECONDS)
@@ -2,14 +2,20 @@
 Security utilities for authentication and authorization
 """
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Union, Any, Dict
 from fastapi import HTTPException, status
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def password_context():
+    """Password hashing context, created on first use"""
+    # passlib (and jose, below) are imported lazily: together they are a
+    # noticeable share of worker startup and only needed by auth requests
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class SecurityManager:
@@ -18,19 +24,22 @@ class SecurityManager:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_context().verify(plain_password, hashed_password)
     
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Generate password hash"""
-        return pwd_context.hash(password)
+        return password_context().hash(password)
     
     @staticmethod
     def create_access_token(
         subject: Union[str, Any], 
-        expires_delta: Optional[timedelta] = None
+        expires_delta: Optional[timedelta] = None,
+        claims: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Create JWT access token"""
+        """Create JWT access token, optionally with extra authorization claims"""
+        from jose import jwt
+        
         if expires_delta:
             expire = datetime.utcnow() + expires_delta
         else:
@@ -39,6 +48,8 @@ class SecurityManager:
             )
         
         to_encode = {"exp": expire, "sub": str(subject)}
+        if claims:
+            to_encode.update(claims)
         encoded_jwt = jwt.encode(
             to_encode, 
             settings.SECRET_KEY, 
@@ -47,28 +58,34 @@ class SecurityManager:
         return encoded_jwt
     
     @staticmethod
-    def verify_token(token: str) -> str:
-        """Verify and decode JWT token"""
+    def decode_token(token: str) -> Dict[str, Any]:
+        """Verify and decode JWT token, returning all claims"""
+        from jose import JWTError, jwt
+        
         try:
             payload = jwt.decode(
                 token, 
                 settings.SECRET_KEY, 
                 algorithms=[settings.ALGORITHM]
             )
-            username: str = payload.get("sub")
-            if username is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not validate credentials",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            return username
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if payload.get("sub") is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return payload
+    
+    @staticmethod
+    def verify_token(token: str) -> str:
+        """Verify and decode JWT token"""
+        return SecurityManager.decode_token(token)["sub"]
 
 
 # Global security manager instance
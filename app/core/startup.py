@@ -0,0 +1,43 @@
+"""
+Startup phase timings
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupTimer:
+    """Wall-clock seconds spent in each named startup phase"""
+    
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+    
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase ``name``"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+    
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+    
+    def summary(self) -> str:
+        """e.g. ``412.3 ms (imports 398.1, schema_check 1.2, ...)``"""
+        parts = ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in self.phases.items())
+        return f"{self.total * 1000:.1f} ms ({parts})"
+    
+    def stats(self) -> Dict[str, float]:
+        result = dict(self.phases)
+        result["total"] = self.total
+        return result
+
+
+# Global startup timer, filled in by app.main
+startup_timer = StartupTimer()
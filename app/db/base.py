@@ -1,23 +1,56 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core import query_budget
+from app.core.metrics import instrument_engine
+from app.db import schema_version
+
+
+def _engine_options(url: str) -> dict:
+    """Engine keyword arguments appropriate for the database backend"""
+    if url.startswith("sqlite"):
+        # SQLite connections are shared across the threadpool / event loop
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+        "pool_size": 10,
+        "max_overflow": 20,
+    }
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine (asyncpg for PostgreSQL, aiosqlite for SQLite)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **_engine_options(settings.ASYNC_DATABASE_URL)
+)
+
+if settings.METRICS_ENABLED:
+    instrument_engine(engine, "sync")
+    instrument_engine(async_engine.sync_engine, "async")
+for _engine in (engine, async_engine.sync_engine):
+    query_budget.install(_engine)
+
+# Create async session factory; attributes stay loaded after commit so that
+# response serialization never triggers lazy I/O outside the event loop
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -31,17 +64,40 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """Create all database tables"""
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def create_tables(bind=None):
+    """
+    Create all database tables (on ``bind``, default the application engine).
+    
+    A database that held none of them is stamped with the current Alembic
+    revision, since its schema now matches the models; one that already had
+    tables keeps whatever revision it was at.
+    """
     # Import all models to ensure they are registered with SQLAlchemy
     from app.models.user import User
     from app.models.menu_item import MenuItem
     from app.models.order import Order
     from app.models.order_item import OrderItem
+    from app.models.token_revocation import TokenRevocation
+    from app.models.sales_rollup import DailySales, DailyCategorySales, DailyMenuItemSales, SalesDelta
+    from app.models.idempotency_key import IdempotencyKey
+    # Registers the search index DDL that runs after menu_items is created
+    from app.db import menu_search
     
-    Base.metadata.create_all(bind=engine)
+    with (bind if bind is not None else engine).begin() as conn:
+        fresh = not set(inspect(conn).get_table_names()) & set(Base.metadata.tables)
+        Base.metadata.create_all(bind=conn)
+        if fresh:
+            schema_version.stamp(conn)
 
 
-def drop_tables():
+def drop_tables(bind=None):
     """Drop all database tables (use with caution!)"""
-    Base.metadata.drop_all(bind=engine) 
\ No newline at end of file
+    bind = bind if bind is not None else engine
+    Base.metadata.drop_all(bind=bind)
+    schema_version.alembic_version.drop(bind=bind, checkfirst=True)
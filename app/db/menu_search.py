@@ -0,0 +1,200 @@
+"""
+Full-text search over menu items
+
+PostgreSQL keeps a weighted ``tsvector`` column on ``menu_items`` behind a
+GIN index, plus a ``pg_trgm`` index on ``name`` for partial matches. SQLite
+mirrors name and description into an FTS5 virtual table. Any other backend
+falls back to unindexed ``ILIKE`` matching. The search structures are
+created alongside the ``menu_items`` table and kept current by
+``MenuService`` through ``index_item`` / ``remove_item``.
+"""
+import re
+from typing import Any, List, Optional
+from sqlalchemy import DDL, column, event, false, func, literal_column, or_, select, table, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models.menu_item import MenuItem
+
+FTS_TABLE = "menu_items_fts"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(search_term: str) -> List[str]:
+    """Words in a search term, lowercased; punctuation is dropped"""
+    return [token.lower() for token in _TOKEN_PATTERN.findall(search_term)]
+
+
+def _like_pattern(search_term: str) -> str:
+    """``%term%`` with LIKE wildcards in the term escaped by ``!``"""
+    escaped = search_term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+class MenuSearchBackend:
+    """Fallback search: case-insensitive substring match, ordered by ID"""
+
+    def search_statement(self, search_term: str) -> Select:
+        """SELECT of matching menu items, best matches first"""
+        return select(MenuItem).where(self._match(search_term)).order_by(MenuItem.id)
+
+    def count_statement(self, search_term: str) -> Select:
+        """SELECT COUNT of matching menu items"""
+        return select(func.count(MenuItem.id)).where(self._match(search_term))
+
+    def index_item(self, db: Session, menu_item: MenuItem) -> None:
+        """Bring the search index up to date for one item (flushed, not committed)"""
+
+    def remove_item(self, db: Session, item_id: int) -> None:
+        """Drop one item from the search index"""
+
+    def rebuild(self, db: Session) -> None:
+        """Re-index every menu item, e.g. after a bulk load"""
+
+    def _match(self, search_term: str) -> Any:
+        pattern = _like_pattern(search_term)
+        return or_(
+            MenuItem.name.ilike(pattern, escape="!"),
+            MenuItem.description.ilike(pattern, escape="!")
+        )
+
+
+class PostgresMenuSearch(MenuSearchBackend):
+    """
+    Weighted tsvector (name 'A', description 'B') with a GIN index, and a
+    trigram GIN index on name so substrings of a word still match.
+    """
+
+    _search_vector = literal_column(f"menu_items.{SEARCH_VECTOR_COLUMN}", type_=TSVECTOR)
+    _vector_expression = (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    )
+
+    def search_statement(self, search_term: str) -> Select:
+        query = func.websearch_to_tsquery("english", search_term)
+        rank = func.ts_rank(self._search_vector, query) + func.similarity(MenuItem.name, search_term)
+        return select(MenuItem).where(
+            self._match(search_term)
+        ).order_by(rank.desc(), MenuItem.id)
+
+    def index_item(self, db: Session, menu_item: MenuItem) -> None:
+        db.execute(
+            text(f"UPDATE menu_items SET {SEARCH_VECTOR_COLUMN} = {self._vector_expression} WHERE id = :id"),
+            {"id": menu_item.id}
+        )
+
+    def rebuild(self, db: Session) -> None:
+        db.execute(text(f"UPDATE menu_items SET {SEARCH_VECTOR_COLUMN} = {self._vector_expression}"))
+
+    def _match(self, search_term: str) -> Any:
+        query = func.websearch_to_tsquery("english", search_term)
+        return or_(
+            self._search_vector.op("@@")(query),
+            MenuItem.name.ilike(_like_pattern(search_term), escape="!")
+        )
+
+
+class SQLiteMenuSearch(MenuSearchBackend):
+    """
+    FTS5 table holding a copy of name and description keyed by item ID.
+    Every search word is matched as a prefix and results are ranked by
+    bm25 with name matches weighted above description matches.
+    """
+
+    _fts_table = table(FTS_TABLE, column("rowid"))
+    _fts = literal_column(FTS_TABLE)
+
+    def search_statement(self, search_term: str) -> Select:
+        match_query = self._match_query(search_term)
+        if match_query is None:
+            return select(MenuItem).where(false())
+        return select(MenuItem).join(
+            self._fts_table, self._fts_table.c.rowid == MenuItem.id
+        ).where(
+            self._fts.op("MATCH")(match_query)
+        ).order_by(func.bm25(self._fts, 10.0, 1.0), MenuItem.id)
+
+    def count_statement(self, search_term: str) -> Select:
+        match_query = self._match_query(search_term)
+        if match_query is None:
+            return select(func.count()).where(false())
+        return select(func.count()).select_from(self._fts_table).where(
+            self._fts.op("MATCH")(match_query)
+        )
+
+    def index_item(self, db: Session, menu_item: MenuItem) -> None:
+        self.remove_item(db, menu_item.id)
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (:id, :name, :description)"),
+            {"id": menu_item.id, "name": menu_item.name, "description": menu_item.description or ""}
+        )
+
+    def remove_item(self, db: Session, item_id: int) -> None:
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": item_id})
+
+    def rebuild(self, db: Session) -> None:
+        db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        db.execute(text(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, description) "
+            f"SELECT id, name, coalesce(description, '') FROM menu_items"
+        ))
+
+    @staticmethod
+    def _match_query(search_term: str) -> Optional[str]:
+        """FTS5 query requiring every word as a prefix, or None if no words"""
+        tokens = _tokens(search_term)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+
+_fallback_backend = MenuSearchBackend()
+_backends = {
+    "postgresql": PostgresMenuSearch(),
+    "sqlite": SQLiteMenuSearch(),
+}
+
+
+def get_search_backend(db: Session) -> MenuSearchBackend:
+    """Search backend for the database the session is bound to"""
+    return _backends.get(db.get_bind().dialect.name, _fallback_backend)
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    Alembic autogenerate filter: search structures are managed here, not by
+    the ORM models, so they must not show up as schema drift
+    """
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "column" and name == SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == "index" and name in ("ix_menu_items_search_vector", "ix_menu_items_name_trgm"):
+        return False
+    return True
+
+
+# Create the search structures whenever menu_items is created via metadata
+_menu_items = MenuItem.__table__
+for _statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE menu_items ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector",
+    f"CREATE INDEX ix_menu_items_search_vector ON menu_items USING gin ({SEARCH_VECTOR_COLUMN})",
+    "CREATE INDEX ix_menu_items_name_trgm ON menu_items USING gin (name gin_trgm_ops)",
+):
+    event.listen(_menu_items, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+event.listen(
+    _menu_items, "after_create",
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(name, description, tokenize = 'porter unicode61')"
+    ).execute_if(dialect="sqlite")
+)
+event.listen(
+    _menu_items, "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,53 @@
+"""
+Schema revision check
+
+Startup compares the revision recorded by Alembic with the one this code
+expects in a single query, instead of inspecting every table the way
+``create_all`` does on each boot of each worker.
+"""
+from typing import Optional
+from sqlalchemy import Column, MetaData, String, Table, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+# Head of alembic/versions; bump together with every new migration
+SCHEMA_REVISION = "0007"
+
+# Alembic's own bookkeeping table, kept out of the models' metadata
+alembic_version = Table(
+    "alembic_version",
+    MetaData(),
+    Column("version_num", String(32), primary_key=True),
+)
+
+
+def current_revision(conn: Connection) -> Optional[str]:
+    """Revision the database is stamped with (None if it is not under Alembic)"""
+    try:
+        return conn.scalar(select(alembic_version.c.version_num))
+    except DBAPIError:
+        conn.rollback()
+        return None
+
+
+def stamp(conn: Connection) -> None:
+    """Mark a database whose tables were just created from the models as being at head"""
+    alembic_version.create(conn, checkfirst=True)
+    if current_revision(conn) is None:
+        conn.execute(alembic_version.insert().values(version_num=SCHEMA_REVISION))
+
+
+def verify_schema(engine: Engine) -> str:
+    """Raise unless the database is at ``SCHEMA_REVISION``"""
+    with engine.connect() as conn:
+        revision = current_revision(conn)
+    if revision == SCHEMA_REVISION:
+        return revision
+    if revision is None:
+        problem = "is not under migration control"
+    else:
+        problem = f"is at revision {revision}"
+    raise RuntimeError(
+        f"Database {problem}, this version expects {SCHEMA_REVISION}; run `alembic upgrade head` "
+        "(or set SCHEMA_CHECK=create for a throwaway database)"
+    )
@@ -1,11 +1,84 @@
 """
 Main FastAPI application for Food Order Booking System
 """
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from app.core import metrics
+from app.core.catalog import menu_catalog
 from app.core.config import settings
-from app.db.base import create_tables
+from app.core.events import order_events
+from app.core.hashing import password_hasher
+from app.core.idempotency import idempotency_store
+from app.core.kitchen import kitchen_queue
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.rate_limit import auth_admission
+from app.core.startup import startup_timer
+from app.db.base import SessionLocal, create_tables, engine
+from app.db.schema_version import verify_schema
 from app.api.v1.api import api_router
+from app.services.analytics_service import AnalyticsService
+from app.services.idempotency_service import IdempotencyService
+from app.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+
+def _fold_sales_deltas() -> None:
+    db = SessionLocal()
+    try:
+        AnalyticsService.fold_deltas(db)
+    finally:
+        db.close()
+
+
+async def _fold_sales_deltas_periodically(interval: float) -> None:
+    """Keep the sales rollups current off the request path"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_fold_sales_deltas)
+        except Exception:
+            logger.exception("Folding sales deltas failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check the schema and warm in-process state before serving requests"""
+    with startup_timer.phase("schema_check"):
+        if settings.SCHEMA_CHECK == "verify":
+            verify_schema(engine)
+        elif settings.SCHEMA_CHECK == "create":
+            create_tables()
+    db = SessionLocal()
+    try:
+        # Load active orders so the first kitchen queue read needs no query
+        with startup_timer.phase("kitchen_queue"):
+            OrderService.rebuild_kitchen_queue(db)
+        with startup_timer.phase("idempotency_purge"):
+            IdempotencyService.purge_expired(db)
+    finally:
+        db.close()
+    logger.info("Startup took %s", startup_timer.summary())
+    
+    folder = None
+    if settings.SALES_DELTA_FOLD_SECONDS > 0:
+        folder = asyncio.create_task(_fold_sales_deltas_periodically(settings.SALES_DELTA_FOLD_SECONDS))
+    
+    yield
+    
+    # Release background resources on shutdown
+    if folder is not None:
+        folder.cancel()
+    password_hasher.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -14,7 +87,8 @@ app = FastAPI(
     description="A modern food ordering and management system with authentication",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,6 +100,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware, mode=settings.QUERY_BUDGET_MODE)
+
+if settings.METRICS_ENABLED:
+    # Outermost, so latency includes the other middleware
+    app.add_middleware(metrics.MetricsMiddleware)
+    
+    for name, help, stats in (
+        ("app_auth_rate_limit_ip", "Per-IP auth rate limiter counters", auth_admission.by_ip.stats),
+        ("app_auth_rate_limit_username", "Per-username auth rate limiter counters", auth_admission.by_username.stats),
+        ("app_auth_admission", "Auth requests rejected because the hashing pool was full", auth_admission.stats),
+        ("app_password_hasher", "Password hashing pool state", password_hasher.stats),
+        ("app_menu_catalog", "Menu catalog version and hit/load counters", menu_catalog.stats),
+        ("app_order_events", "Order event broker subscribers and counters", order_events.stats),
+        ("app_kitchen_queue", "Kitchen queue size and loads", kitchen_queue.stats),
+        ("app_idempotency", "Idempotency key executions and replays", idempotency_store.stats),
+        ("app_startup_seconds", "Seconds spent in each startup phase", startup_timer.stats),
+    ):
+        metrics.registry.stats_gauge(name, help, stats)
+    
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Metrics in the Prometheus text exposition format"""
+        return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 # Include API routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -57,11 +156,8 @@ async def root():
         }
     }
 
-# Create database tables on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup"""
-    create_tables()
+# Everything above: importing the application and building its routes
+startup_timer.record("imports", time.perf_counter() - _import_started)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,23 @@
+"""
+Idempotency key model for replaying responses to retried requests
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """Response stored for a client-supplied Idempotency-Key"""
+    
+    __tablename__ = "idempotency_keys"
+    
+    # Keys are scoped per user; no foreign key so the row outlives the user
+    user_id = Column(Integer, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of the request payload; a reused key with another payload is rejected
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(user_id={self.user_id}, key='{self.key}', status_code={self.status_code})>"
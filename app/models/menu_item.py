@@ -1,7 +1,7 @@
 """
 Menu item model for food menu management
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -31,4 +31,8 @@ class MenuItem(Base):
     @property
     def formatted_price(self) -> str:
         """Get formatted price string"""
-        return f"${self.price:.2f}" 
\ No newline at end of file
+        return f"${self.price:.2f}" 
+
+
+# Menu listing filters on category and availability together
+Index("ix_menu_items_category_is_available", MenuItem.category, MenuItem.is_available)
@@ -1,11 +1,24 @@
 """
 Order model for order management
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 
+# SQLite's CURRENT_TIMESTAMP default has second precision; storing bound
+# values the same way keeps (created_at, id) keyset comparisons consistent
+_SQLITE_TIMESTAMP = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+# Statuses after which an order no longer changes
+COMPLETED_STATUSES = ("delivered", "cancelled")
+
+# Statuses of orders the kitchen is working on
+KITCHEN_STATUSES = ("confirmed", "preparing")
+
 
 class Order(Base):
     """Order model for order management"""
@@ -19,7 +32,10 @@ class Order(Base):
     delivery_address = Column(Text, nullable=False)
     phone_number = Column(String, nullable=False)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True).with_variant(_SQLITE_TIMESTAMP, "sqlite"),
+        server_default=func.now()
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
@@ -37,4 +53,12 @@ class Order(Base):
     @property
     def is_completed(self) -> bool:
         """Check if order is completed"""
-        return self.status in ["delivered", "cancelled"] 
\ No newline at end of file
+        return self.status in COMPLETED_STATUSES 
+
+
+# Access paths used by OrderService: a user's orders newest first (listing,
+# history and their keyset cursors), the kitchen status feed oldest first,
+# and the admin-wide listing newest first
+Index("ix_orders_user_id_created_at", Order.user_id, Order.created_at.desc(), Order.id.desc())
+Index("ix_orders_status_created_at", Order.status, Order.created_at, Order.id)
+Index("ix_orders_created_at", Order.created_at.desc(), Order.id.desc())
@@ -0,0 +1,70 @@
+"""
+Sales rollup models for analytics reporting
+"""
+from sqlalchemy import Column, Integer, String, Float, Date, JSON
+from app.db.base import Base
+
+
+class DailySales(Base):
+    """Revenue, order count and items sold per day"""
+    
+    __tablename__ = "sales_daily"
+    
+    day = Column(Date, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    item_quantity = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<DailySales(day={self.day}, revenue={self.revenue}, orders={self.order_count})>"
+
+
+class DailyCategorySales(Base):
+    """Revenue, orders containing the category and items sold per day and category"""
+    
+    __tablename__ = "sales_daily_category"
+    
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    item_quantity = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<DailyCategorySales(day={self.day}, category='{self.category}', revenue={self.revenue})>"
+
+
+class DailyMenuItemSales(Base):
+    """Revenue, orders and quantity sold per day and menu item"""
+    
+    __tablename__ = "sales_daily_menu_item"
+    
+    day = Column(Date, primary_key=True)
+    # No foreign key: reports keep deleted menu items' history
+    menu_item_id = Column(Integer, primary_key=True)
+    menu_item_name = Column(String, nullable=False)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+    item_quantity = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<DailyMenuItemSales(day={self.day}, menu_item_id={self.menu_item_id}, revenue={self.revenue})>"
+
+
+class SalesDelta(Base):
+    """
+    An order added to (``sign`` 1) or removed from (-1) the sales, not yet
+    folded into the rollup tables
+    """
+    
+    __tablename__ = "sales_deltas"
+    
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    sign = Column(Integer, nullable=False)
+    total_amount = Column(Float, nullable=False)
+    # [menu_item_id, name, category, quantity, price] per order item
+    lines = Column(JSON, nullable=False)
+    
+    def __repr__(self):
+        return f"<SalesDelta(id={self.id}, day={self.day}, sign={self.sign}, total={self.total_amount})>"
@@ -0,0 +1,19 @@
+"""
+Token revocation model for invalidating issued access tokens
+"""
+from sqlalchemy import Column, Integer, DateTime
+from app.db.base import Base
+
+
+class TokenRevocation(Base):
+    """Minimum token version still accepted for a user"""
+    
+    __tablename__ = "token_revocations"
+    
+    # No foreign key: the row must outlive a deleted user until their tokens expire
+    user_id = Column(Integer, primary_key=True)
+    min_token_version = Column(Integer, nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<TokenRevocation(user_id={self.user_id}, min_token_version={self.min_token_version})>"
@@ -0,0 +1,33 @@
+"""
+Analytics schemas for sales reporting responses
+"""
+from pydantic import BaseModel
+from datetime import date
+
+
+class DailySalesResponse(BaseModel):
+    """Sales totals for one day"""
+    day: date
+    revenue: float
+    order_count: int
+    item_quantity: int
+    
+    class Config:
+        from_attributes = True
+
+
+class CategorySalesResponse(BaseModel):
+    """Sales totals for one category over a date range"""
+    category: str
+    revenue: float
+    order_count: int
+    item_quantity: int
+
+
+class MenuItemSalesResponse(BaseModel):
+    """Sales totals for one menu item over a date range"""
+    menu_item_id: int
+    menu_item_name: str
+    revenue: float
+    order_count: int
+    item_quantity: int
@@ -7,4 +7,13 @@ from pydantic import BaseModel
 class Token(BaseModel):
     """Schema for authentication token"""
     access_token: str
-    token_type: str = "bearer" 
\ No newline at end of file
+    token_type: str = "bearer" 
+
+
+class TokenPrincipal(BaseModel):
+    """Authenticated caller as described by access token claims"""
+    id: int
+    username: str
+    is_active: bool
+    is_superuser: bool
+    token_version: int = 0
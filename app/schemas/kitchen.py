@@ -0,0 +1,33 @@
+"""
+Kitchen queue schemas for order preparation
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+
+class KitchenTicketItem(BaseModel):
+    """Schema for one line of a kitchen ticket"""
+    menu_item_id: int
+    name: str
+    quantity: int
+
+
+class KitchenTicketResponse(BaseModel):
+    """Schema for an active order in the kitchen queue"""
+    order_id: int
+    status: str
+    created_at: datetime
+    promised_at: datetime
+    start_by: datetime
+    prep_minutes: float
+    items: List[KitchenTicketItem]
+    
+    class Config:
+        from_attributes = True
+
+
+class KitchenQueueResponse(BaseModel):
+    """Schema for the head of the kitchen queue"""
+    orders: List[KitchenTicketResponse]
+    total: int
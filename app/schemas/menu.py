@@ -29,7 +29,7 @@ class MenuItemBase(BaseModel):
 
 class MenuItemCreate(MenuItemBase):
     """Schema for menu item creation"""
-    pass
+    is_available: bool = True
 
 
 class MenuItemUpdate(BaseModel):
@@ -63,5 +63,6 @@ class MenuItemList(BaseModel):
     """Schema for menu item list response"""
     items: list[MenuItemResponse]
     total: int
-    page: int
-    size: int 
\ No newline at end of file
+    page: Optional[int] = None  # None when paginating by cursor
+    size: int
+    next_cursor: Optional[str] = None 
\ No newline at end of file
@@ -2,7 +2,7 @@
 Order schemas for request/response validation
 """
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from app.schemas.menu import MenuItemResponse
 
@@ -97,5 +97,33 @@ class OrderList(BaseModel):
     """Schema for order list response"""
     orders: List[OrderResponse]
     total: int
-    page: int
-    size: int 
\ No newline at end of file
+    total_is_estimate: bool = False
+    page: Optional[int] = None  # None when paginating by cursor
+    size: int
+    next_cursor: Optional[str] = None 
+
+
+class OrderBatchCreate(BaseModel):
+    """Schema for bulk order submission; each entry is validated as OrderCreate"""
+    orders: List[Dict[str, Any]]
+    
+    @validator('orders')
+    def orders_not_empty(cls, v):
+        if not v:
+            raise ValueError('Batch must contain at least one order')
+        return v
+
+
+class OrderBatchResult(BaseModel):
+    """Outcome for a single order in a batch"""
+    index: int
+    success: bool
+    order: Optional[OrderResponse] = None
+    error: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    """Schema for bulk order submission response"""
+    created: int
+    failed: int
+    results: List[OrderBatchResult]
@@ -48,6 +48,15 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserSnapshot(UserResponse):
+    """Immutable copy of a user record, safe to share between requests"""
+    token_version: int = 0
+    
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class UserInDB(UserResponse):
     """Schema for user in database (includes hashed password)"""
     hashed_password: str 
\ No newline at end of file
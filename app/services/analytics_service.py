@@ -0,0 +1,365 @@
+"""
+Analytics service for sales rollups and reporting
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, desc, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.sales_rollup import DailyCategorySales, DailyMenuItemSales, DailySales, SalesDelta
+
+# Orders in these statuses do not count as sales
+EXCLUDED_STATUSES = ("cancelled",)
+
+# (menu_item_id, menu item name, category, quantity, unit price)
+SaleLine = Tuple[int, str, str, int, float]
+
+_ADDITIVE_COLUMNS = ("revenue", "order_count", "item_quantity")
+
+
+def counts_as_sale(status: Optional[str]) -> bool:
+    """Whether an order in this status is included in the rollups"""
+    return status not in EXCLUDED_STATUSES
+
+
+def sales_day(created_at: Optional[datetime]) -> date:
+    """Rollup day (UTC) of an order timestamp"""
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+class _Totals:
+    """Accumulates signed revenue / order / quantity deltas per rollup key"""
+    
+    def __init__(self) -> None:
+        self.daily: Dict[date, List[float]] = defaultdict(lambda: [0.0, 0, 0])
+        self.category: Dict[Tuple[date, str], List[float]] = defaultdict(lambda: [0.0, 0, 0])
+        self.item: Dict[Tuple[date, int], List[float]] = defaultdict(lambda: [0.0, 0, 0])
+        self.item_names: Dict[int, str] = {}
+    
+    def add_order(self, day: date, total_amount: float, lines: Iterable[SaleLine], sign: int) -> None:
+        daily = self.daily[day]
+        daily[0] += sign * float(total_amount)
+        daily[1] += sign
+        
+        categories = set()
+        items = set()
+        for menu_item_id, name, category, quantity, price in lines:
+            revenue = sign * float(price) * quantity
+            daily[2] += sign * quantity
+            
+            category_totals = self.category[(day, category)]
+            category_totals[0] += revenue
+            category_totals[2] += sign * quantity
+            if category not in categories:
+                categories.add(category)
+                category_totals[1] += sign
+            
+            item_totals = self.item[(day, menu_item_id)]
+            item_totals[0] += revenue
+            item_totals[2] += sign * quantity
+            if menu_item_id not in items:
+                items.add(menu_item_id)
+                item_totals[1] += sign
+            self.item_names[menu_item_id] = name
+    
+    def rows(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Rollup rows in primary key order, so concurrent upserts lock rows in the same order"""
+        def values(totals: List[float]) -> Dict[str, Any]:
+            return dict(zip(_ADDITIVE_COLUMNS, (round(totals[0], 2), int(totals[1]), int(totals[2]))))
+        
+        daily = [dict(day=day, **values(totals)) for day, totals in sorted(self.daily.items())]
+        category = [
+            dict(day=day, category=category, **values(totals))
+            for (day, category), totals in sorted(self.category.items())
+        ]
+        item = [
+            dict(day=day, menu_item_id=menu_item_id, menu_item_name=self.item_names[menu_item_id], **values(totals))
+            for (day, menu_item_id), totals in sorted(self.item.items())
+        ]
+        return daily, category, item
+
+
+class AnalyticsService:
+    """Service class for sales rollups and reports"""
+    
+    @staticmethod
+    def record_orders(
+        db: Session,
+        orders: Iterable[Tuple[Order, Iterable[SaleLine]]],
+        sign: int = 1
+    ) -> None:
+        """
+        Add (``sign=1``) or remove (``sign=-1``) orders from the sales
+        
+        Appends one delta row per order in the caller's transaction (a single
+        insert). Rollup rows are only written by ``fold_deltas``, so order
+        transactions never contend on the hot per-day rows.
+        """
+        rows = [
+            {
+                "day": sales_day(db_order.created_at),
+                "sign": sign,
+                "total_amount": float(db_order.total_amount),
+                "lines": [list(line) for line in lines],
+            }
+            for db_order, lines in orders
+        ]
+        if rows:
+            db.execute(insert(SalesDelta), rows)
+    
+    @staticmethod
+    def fold_deltas(db: Session, batch_size: int = 5000) -> int:
+        """
+        Fold pending deltas into the rollup tables and commit
+        
+        Each batch is claimed by deleting it (``FOR UPDATE SKIP LOCKED`` on
+        PostgreSQL), so concurrent folds take disjoint batches, and added to
+        the rollups with at most one upsert per table. Returns the number of
+        deltas folded.
+        """
+        deltas_table = SalesDelta.__table__
+        columns = (deltas_table.c.day, deltas_table.c.sign, deltas_table.c.total_amount, deltas_table.c.lines)
+        folded = 0
+        while True:
+            batch = select(deltas_table.c.id).order_by(deltas_table.c.id).limit(batch_size).with_for_update(
+                skip_locked=True
+            )
+            if db.get_bind().dialect.delete_returning:
+                deltas = db.execute(
+                    deltas_table.delete().where(deltas_table.c.id.in_(batch)).returning(*columns)
+                ).all()
+            else:
+                claimed = db.execute(batch.add_columns(*columns)).all()
+                db.execute(deltas_table.delete().where(deltas_table.c.id.in_([row[0] for row in claimed])))
+                deltas = [row[1:] for row in claimed]
+            if not deltas:
+                db.commit()
+                return folded
+            
+            totals = _Totals()
+            for day, sign, total_amount, lines in deltas:
+                totals.add_order(day, total_amount, [tuple(line) for line in lines], sign)
+            daily, category, item = totals.rows()
+            AnalyticsService._upsert(db, DailySales, ("day",), daily)
+            AnalyticsService._upsert(db, DailyCategorySales, ("day", "category"), category)
+            AnalyticsService._upsert(db, DailyMenuItemSales, ("day", "menu_item_id"), item)
+            db.commit()
+            folded += len(deltas)
+            if len(deltas) < batch_size:
+                return folded
+    
+    @staticmethod
+    def sale_lines(item_rows: Iterable[Dict[str, Any]], menu_items: Dict[int, MenuItem]) -> List[SaleLine]:
+        """Sale lines for order item rows priced against ``menu_items``"""
+        return [
+            (
+                row["menu_item_id"],
+                menu_items[row["menu_item_id"]].name,
+                menu_items[row["menu_item_id"]].category,
+                row["quantity"],
+                row["price"]
+            )
+            for row in item_rows
+        ]
+    
+    @staticmethod
+    def order_sale_lines(db_order: Order) -> List[SaleLine]:
+        """Sale lines of an order whose items and menu items are already loaded"""
+        return [
+            (
+                order_item.menu_item_id,
+                order_item.menu_item.name,
+                order_item.menu_item.category,
+                order_item.quantity,
+                order_item.price
+            )
+            for order_item in db_order.order_items
+        ]
+    
+    @staticmethod
+    def record_order_change(db: Session, db_order: Order, sign: int) -> None:
+        """Add or remove one stored order, loading its lines in one query"""
+        lines = db.execute(
+            select(
+                OrderItem.menu_item_id, MenuItem.name, MenuItem.category,
+                OrderItem.quantity, OrderItem.price
+            ).join(MenuItem, OrderItem.menu_item_id == MenuItem.id).where(
+                OrderItem.order_id == db_order.id
+            )
+        ).all()
+        AnalyticsService.record_orders(db, [(db_order, [tuple(line) for line in lines])], sign)
+    
+    @staticmethod
+    def _upsert(db: Session, model, keys: Tuple[str, ...], rows: List[Dict[str, Any]]) -> None:
+        """Add ``rows`` onto existing rollup rows, inserting missing keys"""
+        if not rows:
+            return
+        
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = insert(model).values(rows)
+            updates = {
+                column: getattr(model, column) + getattr(statement.excluded, column)
+                for column in _ADDITIVE_COLUMNS
+            }
+            if "menu_item_name" in rows[0]:
+                updates["menu_item_name"] = statement.excluded.menu_item_name
+            db.execute(statement.on_conflict_do_update(index_elements=list(keys), set_=updates))
+            return
+        
+        # Portable fallback: one lookup per rollup row
+        for row in rows:
+            existing = db.get(model, tuple(row[key] for key in keys))
+            if existing is None:
+                db.add(model(**row))
+                continue
+            for column in _ADDITIVE_COLUMNS:
+                setattr(existing, column, getattr(existing, column) + row[column])
+            if "menu_item_name" in row:
+                existing.menu_item_name = row["menu_item_name"]
+        db.flush()
+    
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 5000) -> int:
+        """
+        Rebuild every rollup from the orders tables and commit
+        
+        Rows are streamed in batches and aggregated in memory, so only the
+        rollups (not the orders) are held at once. Pending deltas are
+        discarded, since the orders they describe are counted directly.
+        Returns the number of orders counted.
+        """
+        for model in (SalesDelta, DailySales, DailyCategorySales, DailyMenuItemSales):
+            db.execute(delete(model))
+        
+        counted = Order.status.notin_(EXCLUDED_STATUSES)
+        totals = _Totals()
+        order_count = 0
+        
+        orders = db.execute(
+            select(Order.created_at, Order.total_amount).where(counted).execution_options(yield_per=batch_size)
+        )
+        for created_at, total_amount in orders:
+            totals.add_order(sales_day(created_at), total_amount, (), 1)
+            order_count += 1
+        
+        lines = db.execute(
+            select(
+                Order.id, Order.created_at, OrderItem.menu_item_id, MenuItem.name,
+                MenuItem.category, OrderItem.quantity, OrderItem.price
+            ).join(OrderItem, OrderItem.order_id == Order.id).join(
+                MenuItem, OrderItem.menu_item_id == MenuItem.id
+            ).where(counted).order_by(Order.id).execution_options(yield_per=batch_size)
+        )
+        current_id, current_day, current_lines = None, None, []
+        for order_id, created_at, *line in lines:
+            if order_id != current_id:
+                if current_lines:
+                    AnalyticsService._add_lines(totals, current_day, current_lines)
+                current_id, current_day, current_lines = order_id, sales_day(created_at), []
+            current_lines.append(tuple(line))
+        if current_lines:
+            AnalyticsService._add_lines(totals, current_day, current_lines)
+        
+        daily, category, item = totals.rows()
+        for model, rows in ((DailySales, daily), (DailyCategorySales, category), (DailyMenuItemSales, item)):
+            if rows:
+                db.execute(model.__table__.insert(), rows)
+        db.commit()
+        return order_count
+    
+    @staticmethod
+    def _add_lines(totals: _Totals, day: date, lines: List[SaleLine]) -> None:
+        """Add an order's lines without touching its daily revenue / count"""
+        totals.add_order(day, 0.0, lines, 1)
+        totals.daily[day][1] -= 1
+    
+    @staticmethod
+    def default_range(start: Optional[date], end: Optional[date], days: int = 30) -> Tuple[date, date]:
+        """Fill in a missing report range: the ``days`` days ending today (UTC)"""
+        end = end or datetime.now(timezone.utc).date()
+        start = start or end - timedelta(days=days - 1)
+        return start, end
+    
+    @staticmethod
+    def get_daily_sales(db: Session, start: date, end: date) -> List[DailySales]:
+        """Daily totals between two dates (inclusive)"""
+        return db.query(DailySales).filter(
+            DailySales.day >= start, DailySales.day <= end
+        ).order_by(DailySales.day).all()
+    
+    @staticmethod
+    def get_category_sales(db: Session, start: date, end: date) -> List[Dict[str, Any]]:
+        """Per-category totals between two dates, highest revenue first"""
+        revenue = func.sum(DailyCategorySales.revenue)
+        rows = db.query(
+            DailyCategorySales.category,
+            revenue.label("revenue"),
+            func.sum(DailyCategorySales.order_count).label("order_count"),
+            func.sum(DailyCategorySales.item_quantity).label("item_quantity")
+        ).filter(
+            DailyCategorySales.day >= start, DailyCategorySales.day <= end
+        ).group_by(DailyCategorySales.category).order_by(desc(revenue), DailyCategorySales.category)
+        return [row._asdict() for row in rows]
+    
+    @staticmethod
+    def get_menu_item_sales(db: Session, start: date, end: date, limit: int = 20) -> List[Dict[str, Any]]:
+        """Top menu items by revenue between two dates"""
+        revenue = func.sum(DailyMenuItemSales.revenue)
+        rows = db.query(
+            DailyMenuItemSales.menu_item_id,
+            func.max(DailyMenuItemSales.menu_item_name).label("menu_item_name"),
+            revenue.label("revenue"),
+            func.sum(DailyMenuItemSales.order_count).label("order_count"),
+            func.sum(DailyMenuItemSales.item_quantity).label("item_quantity")
+        ).filter(
+            DailyMenuItemSales.day >= start, DailyMenuItemSales.day <= end
+        ).group_by(DailyMenuItemSales.menu_item_id).order_by(
+            desc(revenue), DailyMenuItemSales.menu_item_id
+        ).limit(limit)
+        return [row._asdict() for row in rows]
+
+
+class AsyncAnalyticsService:
+    """
+    Async variant of AnalyticsService for ``async def`` endpoints.
+    
+    Methods delegate to AnalyticsService through ``AsyncSession.run_sync``.
+    """
+    
+    @staticmethod
+    async def fold_deltas(db: AsyncSession) -> int:
+        """Fold pending deltas into the rollup tables"""
+        return await db.run_sync(AnalyticsService.fold_deltas)
+    
+    @staticmethod
+    async def backfill(db: AsyncSession) -> int:
+        """Rebuild every rollup from the orders tables"""
+        return await db.run_sync(AnalyticsService.backfill)
+    
+    @staticmethod
+    async def get_daily_sales(db: AsyncSession, start: date, end: date) -> List[DailySales]:
+        """Daily totals between two dates (inclusive)"""
+        return await db.run_sync(AnalyticsService.get_daily_sales, start, end)
+    
+    @staticmethod
+    async def get_category_sales(db: AsyncSession, start: date, end: date) -> List[Dict[str, Any]]:
+        """Per-category totals between two dates, highest revenue first"""
+        return await db.run_sync(AnalyticsService.get_category_sales, start, end)
+    
+    @staticmethod
+    async def get_menu_item_sales(
+        db: AsyncSession, start: date, end: date, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Top menu items by revenue between two dates"""
+        return await db.run_sync(AnalyticsService.get_menu_item_sales, start, end, limit)
@@ -0,0 +1,78 @@
+"""
+Idempotency key service for persisting replayable responses
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.idempotency import StoredResponse
+from app.models.idempotency_key import IdempotencyKey
+
+
+def _expiry_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+
+
+class IdempotencyService:
+    """Service class for stored idempotent responses"""
+    
+    @staticmethod
+    def get_response(db: Session, user_id: int, key: str) -> Optional[StoredResponse]:
+        """Get the stored response for a user's key; expired rows are deleted"""
+        row = db.get(IdempotencyKey, (user_id, key))
+        if row is None:
+            return None
+        
+        created_at = row.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at < _expiry_cutoff():
+            db.delete(row)
+            db.commit()
+            return None
+        return StoredResponse(row.fingerprint, row.status_code, row.response_body.encode())
+    
+    @staticmethod
+    def key_exists(db: Session, user_id: int, key: str) -> bool:
+        """Whether a row is stored for the user's key, expired or not"""
+        return db.get(IdempotencyKey, (user_id, key)) is not None
+    
+    @staticmethod
+    def save_response(db: Session, user_id: int, key: str, stored: StoredResponse) -> None:
+        """Add a response row to the caller's transaction (not committed)"""
+        db.add(IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            fingerprint=stored.fingerprint,
+            status_code=stored.status_code,
+            response_body=stored.body.decode(),
+            created_at=datetime.now(timezone.utc)
+        ))
+    
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        """Delete keys older than the replay window; returns the number removed"""
+        removed = db.query(IdempotencyKey).filter(
+            IdempotencyKey.created_at < _expiry_cutoff()
+        ).delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+
+class AsyncIdempotencyService:
+    """
+    Async variant of IdempotencyService for ``async def`` endpoints.
+    
+    Methods delegate to IdempotencyService through ``AsyncSession.run_sync``.
+    """
+    
+    @staticmethod
+    async def get_response(db: AsyncSession, user_id: int, key: str) -> Optional[StoredResponse]:
+        """Get the stored response for a user's key"""
+        return await db.run_sync(IdempotencyService.get_response, user_id, key)
+    
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        """Delete keys older than the replay window"""
+        return await db.run_sync(IdempotencyService.purge_expired)
@@ -1,10 +1,15 @@
 """
 Menu service for food order booking system
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.catalog import CatalogSnapshot, menu_catalog
+from app.core.pagination import decode_cursor, encode_cursor, invalid_cursor
+from app.db.menu_search import get_search_backend
 from app.models.menu_item import MenuItem
-from app.schemas.menu import MenuItemCreate, MenuItemUpdate
+from app.schemas.menu import MenuItemCreate, MenuItemResponse, MenuItemUpdate
 
 
 class MenuService:
@@ -22,28 +27,77 @@ class MenuService:
             image_url=menu_data.image_url
         )
         db.add(db_menu_item)
+        db.flush()
+        get_search_backend(db).index_item(db, db_menu_item)
         db.commit()
+        menu_catalog.bump()
         db.refresh(db_menu_item)
         return db_menu_item
     
+    @staticmethod
+    def get_all_menu_items(db: Session) -> List[MenuItem]:
+        """Get every menu item ordered by ID (catalog snapshot source)"""
+        return db.query(MenuItem).order_by(MenuItem.id).all()
+    
+    @staticmethod
+    def get_catalog_marker(db: Session) -> Tuple:
+        """Row count, highest ID and latest update of the menu: changes with any menu write"""
+        return tuple(db.query(
+            func.count(MenuItem.id), func.max(MenuItem.id), func.max(MenuItem.updated_at)
+        ).one())
+    
     @staticmethod
     def get_menu_items(
         db: Session, 
         skip: int = 0, 
         limit: int = 100,
         category: Optional[str] = None,
-        available_only: bool = False
+        available_only: bool = False,
+        cursor: Optional[str] = None
     ) -> List[MenuItem]:
-        """Get all menu items with optional filtering"""
-        query = db.query(MenuItem)
+        """Get all menu items with optional filtering, ordered by ID"""
+        query = MenuService._filter_menu_items(db.query(MenuItem), category, available_only)
         
+        query = query.order_by(MenuItem.id)
+        if cursor:
+            # Seek past the last ID seen instead of using OFFSET
+            try:
+                last_id = int(decode_cursor(cursor)["id"])
+            except (KeyError, TypeError, ValueError):
+                raise invalid_cursor()
+            query = query.filter(MenuItem.id > last_id)
+        else:
+            query = query.offset(skip)
+        
+        return query.limit(limit).all()
+    
+    @staticmethod
+    def _filter_menu_items(query, category: Optional[str], available_only: bool):
+        """Apply the optional category and availability filters"""
         if category:
             query = query.filter(MenuItem.category == category)
         
         if available_only:
             query = query.filter(MenuItem.is_available == True)
         
-        return query.offset(skip).limit(limit).all()
+        return query
+    
+    @staticmethod
+    def count_menu_items(
+        db: Session,
+        category: Optional[str] = None,
+        available_only: bool = False
+    ) -> int:
+        """Count menu items matching the filters"""
+        query = db.query(func.count(MenuItem.id))
+        return MenuService._filter_menu_items(query, category, available_only).scalar()
+    
+    @staticmethod
+    def next_cursor(menu_items: List[MenuItem], limit: int) -> Optional[str]:
+        """Cursor for the page after ``menu_items``, or None on the last page"""
+        if len(menu_items) < limit:
+            return None
+        return encode_cursor({"id": menu_items[-1].id})
     
     @staticmethod
     def get_menu_item(db: Session, item_id: int) -> Optional[MenuItem]:
@@ -65,7 +119,12 @@ class MenuService:
         for field, value in update_data.items():
             setattr(db_menu_item, field, value)
         
+        if "name" in update_data or "description" in update_data:
+            db.flush()
+            get_search_backend(db).index_item(db, db_menu_item)
+        
         db.commit()
+        menu_catalog.bump()
         db.refresh(db_menu_item)
         return db_menu_item
     
@@ -76,8 +135,10 @@ class MenuService:
         if not db_menu_item:
             return False
         
+        get_search_backend(db).remove_item(db, item_id)
         db.delete(db_menu_item)
         db.commit()
+        menu_catalog.bump()
         return True
     
     @staticmethod
@@ -93,8 +154,109 @@ class MenuService:
         skip: int = 0, 
         limit: int = 100
     ) -> List[MenuItem]:
-        """Search menu items by name or description"""
-        return db.query(MenuItem).filter(
-            (MenuItem.name.ilike(f"%{search_term}%")) |
-            (MenuItem.description.ilike(f"%{search_term}%"))
-        ).offset(skip).limit(limit).all() 
\ No newline at end of file
+        """Search menu items by name or description, best matches first"""
+        statement = get_search_backend(db).search_statement(search_term)
+        return db.scalars(statement.offset(skip).limit(limit)).all()
+    
+    @staticmethod
+    def count_search_results(db: Session, search_term: str) -> int:
+        """Count menu items matching a search term"""
+        return db.scalar(get_search_backend(db).count_statement(search_term))
+    
+    @staticmethod
+    def rebuild_search_index(db: Session) -> None:
+        """Re-index every menu item for search (after bulk loads)"""
+        get_search_backend(db).rebuild(db)
+        db.commit()
+        menu_catalog.bump()
+
+
+class AsyncMenuService:
+    """
+    Async variant of MenuService for ``async def`` endpoints.
+    
+    Methods delegate to MenuService through ``AsyncSession.run_sync``.
+    """
+    
+    @staticmethod
+    async def get_catalog(db: AsyncSession) -> CatalogSnapshot:
+        """Current menu catalog snapshot, loaded from the database only when stale"""
+        async def load() -> List[MenuItemResponse]:
+            menu_items = await db.run_sync(MenuService.get_all_menu_items)
+            return [MenuItemResponse.model_validate(item) for item in menu_items]
+        
+        async def marker():
+            return await db.run_sync(MenuService.get_catalog_marker)
+        
+        return await menu_catalog.get(load, marker)
+    
+    @staticmethod
+    async def create_menu_item(db: AsyncSession, menu_data: MenuItemCreate) -> MenuItem:
+        """Create a new menu item"""
+        return await db.run_sync(MenuService.create_menu_item, menu_data)
+    
+    @staticmethod
+    async def get_menu_items(
+        db: AsyncSession, 
+        skip: int = 0, 
+        limit: int = 100,
+        category: Optional[str] = None,
+        available_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> List[MenuItem]:
+        """Get all menu items with optional filtering, ordered by ID"""
+        return await db.run_sync(
+            MenuService.get_menu_items,
+            skip=skip, limit=limit, category=category, available_only=available_only,
+            cursor=cursor
+        )
+    
+    @staticmethod
+    async def count_menu_items(
+        db: AsyncSession,
+        category: Optional[str] = None,
+        available_only: bool = False
+    ) -> int:
+        """Count menu items matching the filters"""
+        return await db.run_sync(
+            MenuService.count_menu_items, category=category, available_only=available_only
+        )
+    
+    @staticmethod
+    async def get_menu_item(db: AsyncSession, item_id: int) -> Optional[MenuItem]:
+        """Get a specific menu item by ID"""
+        return await db.run_sync(MenuService.get_menu_item, item_id)
+    
+    @staticmethod
+    async def update_menu_item(
+        db: AsyncSession, 
+        item_id: int, 
+        menu_data: MenuItemUpdate
+    ) -> Optional[MenuItem]:
+        """Update a menu item"""
+        return await db.run_sync(MenuService.update_menu_item, item_id, menu_data)
+    
+    @staticmethod
+    async def delete_menu_item(db: AsyncSession, item_id: int) -> bool:
+        """Delete a menu item"""
+        return await db.run_sync(MenuService.delete_menu_item, item_id)
+    
+    @staticmethod
+    async def get_categories(db: AsyncSession) -> List[str]:
+        """Get all available menu categories"""
+        return await db.run_sync(MenuService.get_categories)
+    
+    @staticmethod
+    async def search_menu_items(
+        db: AsyncSession, 
+        search_term: str, 
+        skip: int = 0, 
+        limit: int = 100
+    ) -> List[MenuItem]:
+        """Search menu items by name or description, best matches first"""
+        return await db.run_sync(MenuService.search_menu_items, search_term, skip, limit)
+    
+    @staticmethod
+    async def count_search_results(db: AsyncSession, search_term: str) -> int:
+        """Count menu items matching a search term"""
+        return await db.run_sync(MenuService.count_search_results, search_term)
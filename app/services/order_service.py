@@ -1,12 +1,24 @@
 """
 Order service for food order booking system
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from app.models.order import Order
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, and_, func, insert, or_, select, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.etag import make_etag
+from app.core.kitchen import KitchenTicket, kitchen_queue
+from app.core.idempotency import StoredResponse
+from app.core.events import ALL_ORDERS_TOPIC, order_events, order_topic, status_topic
+from app.core.pagination import decode_cursor, encode_cursor, invalid_cursor
+from app.models.order import COMPLETED_STATUSES, KITCHEN_STATUSES, Order
 from app.models.order_item import OrderItem
 from app.models.menu_item import MenuItem
-from app.schemas.order import OrderCreate, OrderUpdate, OrderItemCreate
+from app.services.analytics_service import AnalyticsService, counts_as_sale
+from app.services.idempotency_service import IdempotencyService
+from app.schemas.order import OrderCreate, OrderResponse, OrderUpdate, OrderItemCreate
 from decimal import Decimal
 
 
@@ -14,10 +26,81 @@ class OrderService:
     """Service class for order operations"""
     
     @staticmethod
-    def create_order(db: Session, order_data: OrderCreate, user_id: int) -> Order:
-        """Create a new order with order items"""
-        # Calculate total amount
+    def _fetch_menu_items(db: Session, menu_item_ids: Iterable[int]) -> Dict[int, MenuItem]:
+        """Fetch every referenced menu item in a single IN query"""
+        ids = set(menu_item_ids)
+        if not ids:
+            return {}
+        return {
+            menu_item.id: menu_item
+            for menu_item in db.query(MenuItem).filter(MenuItem.id.in_(ids))
+        }
+    
+    @staticmethod
+    def _price_order_items(
+        order_data: OrderCreate,
+        menu_items: Dict[int, MenuItem]
+    ) -> Tuple[List[Dict[str, Any]], Decimal, List[int]]:
+        """Build order item rows and the order total; also return unavailable item IDs"""
         total_amount = Decimal('0.0')
+        item_rows = []
+        unavailable = []
+        for item_data in order_data.items:
+            menu_item = menu_items.get(item_data.menu_item_id)
+            if menu_item and menu_item.is_available:
+                item_rows.append({
+                    "menu_item_id": menu_item.id,
+                    "quantity": item_data.quantity,
+                    "price": menu_item.price
+                })
+                # Convert both price and quantity to Decimal for precise calculation
+                total_amount += Decimal(str(menu_item.price)) * Decimal(str(item_data.quantity))
+            else:
+                unavailable.append(item_data.menu_item_id)
+        return item_rows, total_amount, unavailable
+    
+    @staticmethod
+    def _insert_order_items(
+        db: Session,
+        orders: List[Tuple[Order, List[Dict[str, Any]]]],
+        menu_items: Dict[int, MenuItem]
+    ) -> None:
+        """
+        Insert the items of already-flushed orders in one multi-row
+        INSERT ... RETURNING and attach them in memory, so responses can be
+        built without re-querying
+        """
+        rows = []
+        for db_order, item_rows in orders:
+            for row in item_rows:
+                rows.append(dict(row, order_id=db_order.id))
+        
+        items_by_order: Dict[int, List[OrderItem]] = {db_order.id: [] for db_order, _ in orders}
+        if rows:
+            for order_item in db.scalars(insert(OrderItem).returning(OrderItem), rows):
+                set_committed_value(order_item, "menu_item", menu_items[order_item.menu_item_id])
+                items_by_order[order_item.order_id].append(order_item)
+        
+        for db_order, _ in orders:
+            set_committed_value(db_order, "order_items", items_by_order[db_order.id])
+    
+    @staticmethod
+    def create_order(
+        db: Session,
+        order_data: OrderCreate,
+        user_id: int,
+        before_commit: Optional[Callable[[Session, Order], None]] = None
+    ) -> Order:
+        """
+        Create a new order with order items
+        
+        ``before_commit`` is called with the flushed order, items attached,
+        so callers can write related rows in the same transaction.
+        """
+        menu_items = OrderService._fetch_menu_items(
+            db, (item_data.menu_item_id for item_data in order_data.items)
+        )
+        item_rows, total_amount, _ = OrderService._price_order_items(order_data, menu_items)
         
         # Create order with default status
         db_order = Order(
@@ -31,27 +114,138 @@ class OrderService:
         db.add(db_order)
         db.flush()  # Get the order ID without committing
         
-        # Create order items and calculate total
-        for item_data in order_data.items:
-            menu_item = db.query(MenuItem).filter(MenuItem.id == item_data.menu_item_id).first()
-            if menu_item and menu_item.is_available:
-                order_item = OrderItem(
-                    order_id=db_order.id,
-                    menu_item_id=item_data.menu_item_id,
-                    quantity=item_data.quantity,
-                    price=menu_item.price
-                )
-                db.add(order_item)
-                # Convert both price and quantity to Decimal for precise calculation
-                total_amount += Decimal(str(menu_item.price)) * Decimal(str(item_data.quantity))
-        
-        # Update order total
-        db_order.total_amount = total_amount
+        OrderService._insert_order_items(db, [(db_order, item_rows)], menu_items)
+        AnalyticsService.record_orders(
+            db, [(db_order, AnalyticsService.sale_lines(item_rows, menu_items))]
+        )
+        if before_commit is not None:
+            before_commit(db, db_order)
         db.commit()
-        db.refresh(db_order)
+        OrderService._publish_order_event("order.created", db_order)
+        return db_order
+    
+    @staticmethod
+    def create_order_idempotent(
+        db: Session,
+        order_data: OrderCreate,
+        user_id: int,
+        key: str,
+        fingerprint: str
+    ) -> Optional[StoredResponse]:
+        """
+        Create an order and store its encoded response under an idempotency
+        key in the same transaction
+        
+        Returns None, creating nothing, if the key was stored concurrently
+        by another process. Other integrity errors are re-raised.
+        """
+        stored = None
         
-        # Load the order with relationships for response
-        return OrderService.get_order_with_items(db, db_order.id)
+        def store_response(db: Session, db_order: Order) -> None:
+            nonlocal stored
+            body = OrderResponse.model_validate(db_order).model_dump_json().encode()
+            stored = StoredResponse(fingerprint, 201, body)
+            IdempotencyService.save_response(db, user_id, key, stored)
+        
+        try:
+            OrderService.create_order(db, order_data, user_id, before_commit=store_response)
+        except IntegrityError:
+            db.rollback()
+            if not IdempotencyService.key_exists(db, user_id, key):
+                raise
+            return None
+        return stored
+    
+    @staticmethod
+    def _publish_order_event(event_type: str, db_order: Order, previous_status: Optional[str] = None) -> None:
+        """Notify subscribers of a committed order change"""
+        topics = [ALL_ORDERS_TOPIC, order_topic(db_order.id), status_topic(db_order.status)]
+        if previous_status and previous_status != db_order.status:
+            topics.append(status_topic(previous_status))
+        order_events.publish(topics, {
+            "event": event_type,
+            "order_id": db_order.id,
+            "user_id": db_order.user_id,
+            "status": db_order.status,
+            "previous_status": previous_status,
+            # A just-created order still holds the Decimal it was summed as
+            "total_amount": float(db_order.total_amount),
+        })
+    
+    @staticmethod
+    def create_orders_batch(
+        db: Session,
+        orders_data: List[OrderCreate],
+        user_id: int,
+        chunk_size: int = 500
+    ) -> List[Tuple[Optional[OrderResponse], Optional[str]]]:
+        """
+        Create many orders, returning an ``(order, error)`` pair per input
+        
+        Menu items for the whole batch are fetched once. Each chunk of
+        orders is written with one orders INSERT and one order items INSERT
+        and committed on its own, so a failing chunk does not undo earlier
+        ones. Orders referencing unknown or unavailable menu items fail
+        individually. Orders are serialised as each chunk commits, since a
+        later chunk's rollback expires every instance in the session.
+        """
+        menu_items = OrderService._fetch_menu_items(
+            db,
+            (item_data.menu_item_id for order_data in orders_data for item_data in order_data.items)
+        )
+        
+        results: List[Tuple[Optional[OrderResponse], Optional[str]]] = [(None, None)] * len(orders_data)
+        accepted = []
+        for index, order_data in enumerate(orders_data):
+            item_rows, total_amount, unavailable = OrderService._price_order_items(
+                order_data, menu_items
+            )
+            if unavailable:
+                results[index] = (None, f"Menu items not available: {sorted(set(unavailable))}")
+                continue
+            accepted.append((index, order_data, item_rows, total_amount))
+        
+        for start in range(0, len(accepted), chunk_size):
+            chunk = accepted[start:start + chunk_size]
+            order_rows = [
+                {
+                    "user_id": user_id,
+                    "total_amount": total_amount,
+                    "status": 'pending',
+                    "delivery_address": order_data.delivery_address,
+                    "phone_number": order_data.phone_number,
+                    "notes": order_data.notes
+                }
+                for _, order_data, _, total_amount in chunk
+            ]
+            try:
+                # Parameter order lets rows be matched back to their inputs;
+                # PostgreSQL sends this as one statement, SQLite one per row
+                db_orders = list(db.scalars(
+                    insert(Order).returning(Order, sort_by_parameter_order=True),
+                    order_rows
+                ))
+                OrderService._insert_order_items(
+                    db,
+                    [(db_order, item_rows) for db_order, (_, _, item_rows, _) in zip(db_orders, chunk)],
+                    menu_items
+                )
+                AnalyticsService.record_orders(db, [
+                    (db_order, AnalyticsService.sale_lines(item_rows, menu_items))
+                    for db_order, (_, _, item_rows, _) in zip(db_orders, chunk)
+                ])
+                db.commit()
+            except SQLAlchemyError:
+                db.rollback()
+                for index, _, _, _ in chunk:
+                    results[index] = (None, "Order could not be saved")
+                continue
+            
+            for db_order, (index, _, _, _) in zip(db_orders, chunk):
+                results[index] = (OrderResponse.model_validate(db_order), None)
+                OrderService._publish_order_event("order.created", db_order)
+        
+        return results
     
     @staticmethod
     def get_orders(
@@ -59,26 +253,137 @@ class OrderService:
         user_id: Optional[int] = None,
         skip: int = 0, 
         limit: int = 100,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Order]:
-        """Get orders with optional filtering"""
+        """Get orders with optional filtering, newest first"""
+        # selectinload keeps LIMIT on the orders themselves and fetches items
+        # with batched IN queries instead of a joined cartesian row set
         query = db.query(Order).options(
-            joinedload(Order.order_items).joinedload(OrderItem.menu_item)
+            selectinload(Order.order_items).selectinload(OrderItem.menu_item)
         )
-        
+        query = OrderService._filter_orders(query, user_id, status)
+        return OrderService._paginate(query, skip, limit, cursor).all()
+    
+    @staticmethod
+    def _filter_orders(query, user_id: Optional[int], status: Optional[str]):
+        """Apply the optional user and status filters shared by list and count"""
         if user_id:
             query = query.filter(Order.user_id == user_id)
         
         if status:
             query = query.filter(Order.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        return query
+    
+    @staticmethod
+    def count_orders(
+        db: Session,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        estimate: bool = False
+    ) -> Tuple[int, bool]:
+        """
+        Count orders matching the filters, returning ``(total, is_estimate)``
+        
+        With ``estimate`` and no filters, PostgreSQL's planner row estimate is
+        used instead of scanning the table; other backends count exactly.
+        """
+        if estimate and user_id is None and status is None:
+            estimated = OrderService._estimate_table_rows(db, Order.__tablename__)
+            if estimated is not None:
+                return estimated, True
+        
+        query = OrderService._filter_orders(db.query(func.count(Order.id)), user_id, status)
+        return query.scalar(), False
+    
+    @staticmethod
+    def _estimate_table_rows(db: Session, table_name: str) -> Optional[int]:
+        """Planner row estimate for a table (PostgreSQL only)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        estimated = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": table_name}
+        ).scalar()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        return estimated if estimated and estimated > 0 else None
+    
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, cursor: Optional[str]):
+        """
+        Order newest first and apply a page window; a cursor seeks past the
+        last (created_at, id) seen instead of using OFFSET
+        """
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
+        if cursor:
+            position = decode_cursor(cursor)
+            try:
+                created_at = datetime.fromisoformat(position["created_at"])
+                last_id = int(position["id"])
+            except (KeyError, TypeError, ValueError):
+                raise invalid_cursor()
+            query = query.filter(or_(
+                Order.created_at < created_at,
+                and_(Order.created_at == created_at, Order.id < last_id)
+            ))
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+    
+    @staticmethod
+    def next_cursor(orders: List[Order], limit: int) -> Optional[str]:
+        """Cursor for the page after ``orders``, or None on the last page"""
+        if len(orders) < limit:
+            return None
+        last = orders[-1]
+        return encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
     
     @staticmethod
     def get_order(db: Session, order_id: int, user_id: Optional[int] = None) -> Optional[Order]:
         """Get a specific order by ID"""
         return OrderService.get_order_with_items(db, order_id, user_id)
     
+    @staticmethod
+    def completed_order_etag(db: Session, order_id: int, user_id: Optional[int] = None) -> Optional[str]:
+        """
+        ETag for a completed order, or None if the order is missing, not
+        visible to the user or still in progress.
+        
+        Computed from one aggregate row (status, timestamps and the newest
+        change to its menu items) without loading the order's lines.
+        """
+        query = db.query(
+            Order.id,
+            Order.status,
+            Order.created_at,
+            Order.updated_at,
+            func.count(OrderItem.id),
+            func.max(func.coalesce(MenuItem.updated_at, MenuItem.created_at))
+        ).outerjoin(Order.order_items).outerjoin(OrderItem.menu_item).filter(
+            Order.id == order_id,
+            Order.status.in_(COMPLETED_STATUSES)
+        ).group_by(Order.id, Order.status, Order.created_at, Order.updated_at)
+        
+        if user_id:
+            query = query.filter(Order.user_id == user_id)
+        
+        row = query.first()
+        if row is None:
+            return None
+        return make_etag("order", *row)
+    
+    @staticmethod
+    def get_order_status(db: Session, order_id: int, user_id: Optional[int] = None) -> Optional[str]:
+        """Current status of an order, or None if missing or not visible to the user"""
+        query = db.query(Order.status).filter(Order.id == order_id)
+        
+        if user_id:
+            query = query.filter(Order.user_id == user_id)
+        
+        row = query.first()
+        return row.status if row else None
+    
     @staticmethod
     def get_order_with_items(db: Session, order_id: int, user_id: Optional[int] = None) -> Optional[Order]:
         """Get a specific order by ID with loaded relationships"""
@@ -99,24 +404,23 @@ class OrderService:
         user_id: Optional[int] = None
     ) -> Optional[Order]:
         """Update an order"""
-        query = db.query(Order).filter(Order.id == order_id)
-        
-        if user_id:
-            query = query.filter(Order.user_id == user_id)
-        
-        db_order = query.first()
+        # Load the relationships the response needs up front, so no
+        # refresh or re-fetch is needed after commit
+        db_order = OrderService.get_order_with_items(db, order_id, user_id)
         if not db_order:
             return None
         
+        previous_status = db_order.status
         update_data = order_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_order, field, value)
+        db_order.updated_at = datetime.now(timezone.utc)
         
+        OrderService._record_status_change(db, db_order, previous_status)
         db.commit()
-        db.refresh(db_order)
-        
-        # Return order with loaded relationships
-        return OrderService.get_order_with_items(db, order_id, user_id)
+        OrderService._publish_order_event("order.updated", db_order, previous_status)
+        kitchen_queue.update(db_order, KITCHEN_STATUSES)
+        return db_order
     
     @staticmethod
     def delete_order(db: Session, order_id: int, user_id: Optional[int] = None) -> bool:
@@ -130,12 +434,16 @@ class OrderService:
         if not db_order:
             return False
         
+        if counts_as_sale(db_order.status):
+            AnalyticsService.record_order_change(db, db_order, -1)
+        
         # Delete associated order items first
         db.query(OrderItem).filter(OrderItem.order_id == order_id).delete()
         
         # Delete the order
         db.delete(db_order)
         db.commit()
+        kitchen_queue.remove(order_id)
         return True
     
     @staticmethod
@@ -143,40 +451,82 @@ class OrderService:
         """Get all items for a specific order"""
         return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
     
+    @staticmethod
+    def _record_status_change(db: Session, db_order: Order, previous_status: Optional[str]) -> None:
+        """
+        Add or remove the order (items already loaded) from the sales rollups
+        when it is (un)cancelled
+        """
+        was_sale, is_sale = counts_as_sale(previous_status), counts_as_sale(db_order.status)
+        if was_sale != is_sale:
+            AnalyticsService.record_orders(
+                db, [(db_order, AnalyticsService.order_sale_lines(db_order))], 1 if is_sale else -1
+            )
+    
     @staticmethod
     def update_order_status(db: Session, order_id: int, status: str) -> Optional[Order]:
         """Update order status"""
-        db_order = db.query(Order).filter(Order.id == order_id).first()
+        db_order = OrderService.get_order_with_items(db, order_id)
         if not db_order:
             return None
         
+        previous_status = db_order.status
         db_order.status = status
+        db_order.updated_at = datetime.now(timezone.utc)
+        OrderService._record_status_change(db, db_order, previous_status)
         db.commit()
-        db.refresh(db_order)
-        
-        # Return order with loaded relationships
-        return OrderService.get_order_with_items(db, order_id)
+        OrderService._publish_order_event("order.status_changed", db_order, previous_status)
+        kitchen_queue.update(db_order, KITCHEN_STATUSES)
+        return db_order
     
     @staticmethod
     def get_user_order_history(
         db: Session, 
         user_id: int, 
         skip: int = 0, 
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[str] = None
     ) -> List[Order]:
         """Get order history for a specific user"""
-        return db.query(Order).options(
-            joinedload(Order.order_items).joinedload(OrderItem.menu_item)
+        query = db.query(Order).options(
+            selectinload(Order.order_items).selectinload(OrderItem.menu_item)
         ).filter(
             Order.user_id == user_id
-        ).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+        )
+        return OrderService._paginate(query, skip, limit, cursor).all()
     
     @staticmethod
-    def get_orders_by_status(db: Session, status: str) -> List[Order]:
-        """Get all orders with a specific status"""
-        return db.query(Order).options(
-            joinedload(Order.order_items).joinedload(OrderItem.menu_item)
-        ).filter(Order.status == status).all()
+    def orders_by_status_statement(status: str) -> Select:
+        """SELECT for orders with a status, oldest first, with items loaded in batches"""
+        return select(Order).options(
+            selectinload(Order.order_items).selectinload(OrderItem.menu_item)
+        ).where(Order.status == status).order_by(Order.created_at, Order.id)
+    
+    @staticmethod
+    def get_kitchen_orders(db: Session) -> List[Order]:
+        """Get every order the kitchen is working on, with items loaded"""
+        return list(db.scalars(
+            select(Order).options(
+                selectinload(Order.order_items).selectinload(OrderItem.menu_item)
+            ).where(Order.status.in_(KITCHEN_STATUSES))
+        ))
+    
+    @staticmethod
+    def rebuild_kitchen_queue(db: Session) -> int:
+        """Reload the kitchen queue from the database; returns its size"""
+        kitchen_queue.rebuild(OrderService.get_kitchen_orders(db))
+        return len(kitchen_queue)
+    
+    @staticmethod
+    def get_orders_by_status(
+        db: Session, 
+        status: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Order]:
+        """Get a page of orders with a specific status, oldest first"""
+        statement = OrderService.orders_by_status_statement(status).offset(skip).limit(limit)
+        return list(db.scalars(statement))
     
     @staticmethod
     def calculate_order_total(db: Session, order_id: int) -> Decimal:
@@ -185,4 +535,172 @@ class OrderService:
         total = Decimal('0.0')
         for item in order_items:
             total += Decimal(str(item.price)) * Decimal(str(item.quantity))
-        return total 
\ No newline at end of file
+        return total 
+
+
+class AsyncOrderService:
+    """
+    Async variant of OrderService for ``async def`` endpoints.
+    
+    Methods delegate to OrderService through ``AsyncSession.run_sync``; the
+    returned orders have their items and menu items already loaded.
+    """
+    
+    @staticmethod
+    async def create_order(db: AsyncSession, order_data: OrderCreate, user_id: int) -> Order:
+        """Create a new order with order items"""
+        return await db.run_sync(OrderService.create_order, order_data, user_id)
+    
+    @staticmethod
+    async def create_order_idempotent(
+        db: AsyncSession,
+        order_data: OrderCreate,
+        user_id: int,
+        key: str,
+        fingerprint: str
+    ) -> Optional[StoredResponse]:
+        """Create an order and store its response under an idempotency key"""
+        return await db.run_sync(
+            OrderService.create_order_idempotent, order_data, user_id, key, fingerprint
+        )
+    
+    @staticmethod
+    async def create_orders_batch(
+        db: AsyncSession,
+        orders_data: List[OrderCreate],
+        user_id: int,
+        chunk_size: int = 500
+    ) -> List[Tuple[Optional[OrderResponse], Optional[str]]]:
+        """Create many orders, returning an ``(order, error)`` pair per input"""
+        return await db.run_sync(
+            OrderService.create_orders_batch, orders_data, user_id, chunk_size=chunk_size
+        )
+    
+    @staticmethod
+    async def get_orders(
+        db: AsyncSession, 
+        user_id: Optional[int] = None,
+        skip: int = 0, 
+        limit: int = 100,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Order]:
+        """Get orders with optional filtering, newest first"""
+        return await db.run_sync(
+            OrderService.get_orders,
+            user_id=user_id, skip=skip, limit=limit, status=status, cursor=cursor
+        )
+    
+    @staticmethod
+    async def count_orders(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        estimate: bool = False
+    ) -> Tuple[int, bool]:
+        """Count orders matching the filters, returning ``(total, is_estimate)``"""
+        return await db.run_sync(
+            OrderService.count_orders, user_id=user_id, status=status, estimate=estimate
+        )
+    
+    @staticmethod
+    async def get_order(db: AsyncSession, order_id: int, user_id: Optional[int] = None) -> Optional[Order]:
+        """Get a specific order by ID"""
+        return await db.run_sync(OrderService.get_order, order_id, user_id)
+    
+    @staticmethod
+    async def get_order_status(
+        db: AsyncSession, order_id: int, user_id: Optional[int] = None
+    ) -> Optional[str]:
+        """Current status of an order, or None"""
+        return await db.run_sync(OrderService.get_order_status, order_id, user_id)
+    
+    @staticmethod
+    async def completed_order_etag(
+        db: AsyncSession, order_id: int, user_id: Optional[int] = None
+    ) -> Optional[str]:
+        """ETag for a completed order, or None"""
+        return await db.run_sync(OrderService.completed_order_etag, order_id, user_id)
+    
+    @staticmethod
+    async def update_order(
+        db: AsyncSession, 
+        order_id: int, 
+        order_data: OrderUpdate,
+        user_id: Optional[int] = None
+    ) -> Optional[Order]:
+        """Update an order"""
+        return await db.run_sync(OrderService.update_order, order_id, order_data, user_id)
+    
+    @staticmethod
+    async def delete_order(db: AsyncSession, order_id: int, user_id: Optional[int] = None) -> bool:
+        """Delete an order"""
+        return await db.run_sync(OrderService.delete_order, order_id, user_id)
+    
+    @staticmethod
+    async def update_order_status(db: AsyncSession, order_id: int, status: str) -> Optional[Order]:
+        """Update order status"""
+        return await db.run_sync(OrderService.update_order_status, order_id, status)
+    
+    @staticmethod
+    async def get_user_order_history(
+        db: AsyncSession, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> List[Order]:
+        """Get order history for a specific user"""
+        return await db.run_sync(
+            OrderService.get_user_order_history, user_id, skip=skip, limit=limit, cursor=cursor
+        )
+    
+    @staticmethod
+    async def get_orders_by_status(
+        db: AsyncSession, 
+        status: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Order]:
+        """Get a page of orders with a specific status, oldest first"""
+        return await db.run_sync(
+            OrderService.get_orders_by_status, status, skip=skip, limit=limit
+        )
+    
+    @staticmethod
+    async def get_kitchen_queue(db: AsyncSession, limit: int) -> Tuple[List[KitchenTicket], int]:
+        """
+        Next ``limit`` kitchen tickets and the queue size
+        
+        Served from the in-memory queue; the database is read only to build
+        it on first use and at each resync interval.
+        """
+        await kitchen_queue.ensure_loaded(lambda: db.run_sync(OrderService.get_kitchen_orders))
+        return kitchen_queue.peek(limit), len(kitchen_queue)
+    
+    @staticmethod
+    async def stream_orders_by_status(
+        db: AsyncSession,
+        status: str,
+        batch_size: int = 500
+    ) -> AsyncIterator[List[Order]]:
+        """
+        Yield every order with a status in batches of ``batch_size``
+        
+        Rows come from a server-side cursor (``stream_results``/``yield_per``)
+        and each batch is expunged once the caller has consumed it, so memory
+        stays flat however many orders match.
+        """
+        statement = OrderService.orders_by_status_statement(status).execution_options(
+            yield_per=batch_size
+        )
+        result = await db.stream(statement)
+        try:
+            async for partition in result.scalars().partitions():
+                yield partition
+                for order in partition:
+                    for order_item in order.order_items:
+                        db.expunge(order_item)
+                    db.expunge(order)
+        finally:
+            await result.close()
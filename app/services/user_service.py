@@ -1,10 +1,17 @@
 """
 User service for user management business logic
 """
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from app.models.token_revocation import TokenRevocation
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.revocation import revocation_set
 from app.core.security import security
 from fastapi import HTTPException, status
 
@@ -33,8 +40,8 @@ class UserService:
         return db.query(User).offset(skip).limit(limit).all()
     
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
-        """Create a new user"""
+    def ensure_user_available(db: Session, user_data: UserCreate) -> None:
+        """Raise if the username or email is already registered"""
         # Check if username already exists
         if UserService.get_user_by_username(db, user_data.username):
             raise HTTPException(
@@ -48,10 +55,19 @@ class UserService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
+    
+    @staticmethod
+    def create_user(db: Session, user_data: UserCreate) -> User:
+        """Create a new user"""
+        UserService.ensure_user_available(db, user_data)
         
         # Hash password
         hashed_password = security.get_password_hash(user_data.password)
-        
+        return UserService.insert_user(db, user_data, hashed_password)
+    
+    @staticmethod
+    def insert_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
+        """Insert a user whose password has already been hashed"""
         # Create user
         db_user = User(
             username=user_data.username,
@@ -71,13 +87,27 @@ class UserService:
         if not db_user:
             return None
         
+        previous_username = db_user.username
+        
         # Update fields
         update_data = user_data.dict(exclude_unset=True)
+        claims_changed = any(
+            field in update_data and update_data[field] != getattr(db_user, field)
+            for field in ("username", "is_active", "is_superuser")
+        )
         for field, value in update_data.items():
             setattr(db_user, field, value)
         
+        # Tokens embed these fields, so outstanding ones must be revoked
+        if claims_changed:
+            UserService.revoke_tokens(db, db_user)
+        
         db.commit()
         db.refresh(db_user)
+        if claims_changed:
+            revocation_set.revoke(db_user.id, db_user.token_version)
+        for key in (db_user.id, previous_username, db_user.username):
+            principal_cache.invalidate(key)
         return db_user
     
     @staticmethod
@@ -87,10 +117,48 @@ class UserService:
         if not db_user:
             return False
         
+        username = db_user.username
+        UserService.revoke_tokens(db, db_user)
+        min_token_version = db_user.token_version
         db.delete(db_user)
         db.commit()
+        revocation_set.revoke(user_id, min_token_version)
+        principal_cache.invalidate(user_id)
+        principal_cache.invalidate(username)
         return True
     
+    @staticmethod
+    def revoke_tokens(db: Session, db_user: User) -> None:
+        """Bump the user's token version and record it as the minimum accepted"""
+        db_user.token_version = (db_user.token_version or 0) + 1
+        revocation = db.get(TokenRevocation, db_user.id)
+        if revocation is None:
+            revocation = TokenRevocation(user_id=db_user.id)
+            db.add(revocation)
+        revocation.min_token_version = db_user.token_version
+        revocation.revoked_at = datetime.now(timezone.utc)
+    
+    @staticmethod
+    def get_token_revocations(db: Session) -> List[Tuple[int, int]]:
+        """Get (user_id, min_token_version) pairs for tokens that may still be unexpired"""
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        )
+        rows = db.query(
+            TokenRevocation.user_id, TokenRevocation.min_token_version
+        ).filter(TokenRevocation.revoked_at >= cutoff).all()
+        return [(row[0], row[1]) for row in rows]
+    
+    @staticmethod
+    def token_claims(user: User) -> Dict[str, Any]:
+        """Authorization claims embedded in access tokens"""
+        return {
+            "uid": user.id,
+            "active": bool(user.is_active),
+            "su": bool(user.is_superuser),
+            "ver": user.token_version or 0,
+        }
+    
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
         """Authenticate user with username and password"""
@@ -109,4 +177,66 @@ class UserService:
     @staticmethod
     def is_superuser(user: User) -> bool:
         """Check if user is superuser"""
-        return user.is_superuser 
\ No newline at end of file
+        return user.is_superuser 
+
+
+class AsyncUserService:
+    """
+    Async variant of UserService for ``async def`` endpoints.
+
+    Each method runs the synchronous implementation through
+    ``AsyncSession.run_sync``, so statements are issued over the async driver
+    without blocking the event loop while the query logic lives in one place.
+    """
+    
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID"""
+        return await db.run_sync(UserService.get_user_by_id, user_id)
+    
+    @staticmethod
+    async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+        """Get user by username"""
+        return await db.run_sync(UserService.get_user_by_username, username)
+    
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email"""
+        return await db.run_sync(UserService.get_user_by_email, email)
+    
+    @staticmethod
+    async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+        """Get list of users with pagination"""
+        return await db.run_sync(UserService.get_users, skip, limit)
+    
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """Create a new user, hashing the password on the worker pool"""
+        await db.run_sync(UserService.ensure_user_available, user_data)
+        hashed_password = await password_hasher.hash(user_data.password)
+        return await db.run_sync(UserService.insert_user, user_data, hashed_password)
+    
+    @staticmethod
+    async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate) -> Optional[User]:
+        """Update user information"""
+        return await db.run_sync(UserService.update_user, user_id, user_data)
+    
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
+        """Delete a user"""
+        return await db.run_sync(UserService.delete_user, user_id)
+    
+    @staticmethod
+    async def get_token_revocations(db: AsyncSession) -> List[Tuple[int, int]]:
+        """Get (user_id, min_token_version) pairs for tokens that may still be unexpired"""
+        return await db.run_sync(UserService.get_token_revocations)
+    
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+        """Authenticate user with username and password, verifying on the worker pool"""
+        user = await AsyncUserService.get_user_by_username(db, username)
+        if not user:
+            return None
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for the service layer
+"""
+import os
+
+# Settings validation rejects the placeholder password; benchmarks bring
+# their own database URL and never use the application's
+os.environ.setdefault("DB_PASSWORD", "benchmark-db-password")
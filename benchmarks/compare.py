@@ -0,0 +1,63 @@
+"""
+Compare two benchmark reports and flag regressions
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json
+
+A benchmark regresses when its p50 latency grows by more than
+``--threshold`` (default 15%) or it issues more statements per call.
+Exits with status 1 if anything regressed.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as report:
+        return json.load(report)
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float = 0.15) -> Tuple[List[str], List[str]]:
+    """Return (table lines, regression descriptions) for benchmarks in both reports"""
+    lines = [f"{'benchmark':<34} {'p50 base':>10} {'p50 head':>10} {'change':>8} {'stmts':>11}"]
+    regressions = []
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None:
+            lines.append(f"{name:<34} {'-':>10} {head_result['p50_ms']:>10.3f} {'new':>8}")
+            continue
+        change = head_result["p50_ms"] / base_result["p50_ms"] - 1 if base_result["p50_ms"] else 0.0
+        statements = f"{base_result['statements_per_call']:g}->{head_result['statements_per_call']:g}"
+        lines.append(
+            f"{name:<34} {base_result['p50_ms']:>10.3f} {head_result['p50_ms']:>10.3f} "
+            f"{change:>+8.1%} {statements:>11}"
+        )
+        if change > threshold:
+            regressions.append(f"{name}: p50 {change:+.1%}")
+        if head_result["statements_per_call"] > base_result["statements_per_call"]:
+            regressions.append(f"{name}: statements per call {statements}")
+    return lines, regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base", help="Report from the baseline commit")
+    parser.add_argument("head", help="Report from the commit under test")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed p50 growth (fraction)")
+    args = parser.parse_args(argv)
+    
+    base, head = load(args.base), load(args.head)
+    for key in ("database", "dataset"):
+        if base.get(key) != head.get(key):
+            print(f"warning: {key} differs: {base.get(key)} vs {head.get(key)}", file=sys.stderr)
+    
+    lines, regressions = compare(base, head, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Seeded databases for the service benchmarks
+
+Datasets are generated by ``scripts.seed_data`` (deterministic by seed,
+skewed like real traffic), so a dataset of a given size has the same shape
+on SQLite and PostgreSQL.
+"""
+from typing import Dict
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from app.db.base import drop_tables
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.user import User
+from scripts.seed_data import DEFAULT_PASSWORD, DISHES, USERNAME_TEMPLATE, SeedConfig, seed_database
+
+# Every seeded user shares this password
+BENCH_PASSWORD = DEFAULT_PASSWORD
+
+
+class DatasetSize:
+    """Row counts of a benchmark dataset"""
+    
+    __slots__ = ("users", "menu_items", "orders")
+    
+    def __init__(self, orders: int, users: int = 0, menu_items: int = 200) -> None:
+        self.orders = orders
+        self.users = users or max(10, orders // 50)
+        self.menu_items = menu_items
+    
+    def as_dict(self) -> Dict[str, int]:
+        return {"users": self.users, "menu_items": self.menu_items, "orders": self.orders}
+
+
+def row_counts(engine: Engine) -> Dict[str, int]:
+    """Current users / menu_items / orders counts (zero if the tables are missing)"""
+    counts = {}
+    with engine.connect() as conn:
+        for key, model in (("users", User), ("menu_items", MenuItem), ("orders", Order)):
+            if not engine.dialect.has_table(conn, model.__tablename__):
+                return {"users": 0, "menu_items": 0, "orders": 0}
+            counts[key] = conn.scalar(select(func.count()).select_from(model))
+    return counts
+
+
+def seed(engine: Engine, size: DatasetSize, seed: int = 0) -> None:
+    """Create the schema on an empty database and fill it with ``size`` rows"""
+    config = SeedConfig(orders=size.orders, users=size.users, menu_items=size.menu_items, seed=seed)
+    seed_database(engine, config, rollups=False)
+
+
+def trim(engine: Engine, size: DatasetSize) -> None:
+    """Delete orders created after seeding (ids beyond the seeded range)"""
+    with engine.begin() as conn:
+        conn.execute(OrderItem.__table__.delete().where(OrderItem.order_id > size.orders))
+        conn.execute(Order.__table__.delete().where(Order.id > size.orders))
+
+
+def ensure_dataset(engine: Engine, size: DatasetSize, seed_value: int = 0, reseed: bool = False) -> bool:
+    """
+    Seed the database unless it already holds a dataset of this size;
+    returns whether it was seeded. Orders left behind by an earlier run are
+    trimmed; a database holding other data is only replaced when ``reseed``
+    is set.
+    """
+    counts = row_counts(engine)
+    if (
+        not reseed
+        and counts["users"] == size.users
+        and counts["menu_items"] == size.menu_items
+        and counts["orders"] >= size.orders
+    ):
+        if counts["orders"] > size.orders:
+            trim(engine, size)
+        return False
+    if any(counts.values()):
+        if not reseed:
+            raise ValueError(f"Database holds a different dataset {counts}; reseed to replace it")
+        drop_tables(bind=engine)
+    seed(engine, size, seed=seed_value)
+    return True
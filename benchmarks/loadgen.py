@@ -0,0 +1,451 @@
+"""
+End-to-end load generator driven by a scenario file
+
+Virtual users log in, browse the menu, place and poll orders while kitchen
+staff advance order statuses; the number of concurrent virtual users follows
+the scenario's ramp stages. Reports throughput and per-endpoint latency
+percentiles:
+
+    python -m benchmarks.loadgen benchmarks/scenarios/lunch_rush.json --base-url http://127.0.0.1:8000
+    python -m benchmarks.loadgen benchmarks/scenarios/lunch_rush.json --launch --workers 4 --output rush.json
+
+``--launch`` seeds the benchmark dataset into ``--database-url`` (SQLite by
+default, or a local PostgreSQL) and starts ``uvicorn app.main:app`` with
+``--workers`` processes against it for the duration of the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import httpx
+from sqlalchemy import create_engine
+from benchmarks.dataset import DatasetSize, ensure_dataset
+from benchmarks.services import DEFAULT_DATABASE_URL, percentile
+
+API = "/api/v1"
+# Next status for each status kitchen staff act on
+NEXT_STATUS = {"pending": "confirmed", "confirmed": "preparing", "preparing": "delivered"}
+TICK_SECONDS = 0.2
+
+
+class Scenario:
+    """A parsed scenario file: credentials, ramp stages and action mix"""
+    
+    def __init__(self, data: Dict[str, Any]) -> None:
+        try:
+            self.name = data.get("name", "scenario")
+            self.username = data["users"]["username"]
+            self.password = data["users"]["password"]
+            self.user_count = int(data["users"]["count"])
+            self.admin = (data["admin"]["username"], data["admin"]["password"]) if data.get("admin") else None
+            self.think_time = tuple(float(value) for value in data.get("think_time_seconds", (0.0, 0.0)))
+            self.stages = [(float(stage["duration"]), int(stage["target"])) for stage in data["stages"]]
+            self.mix = {name: float(weight) for name, weight in data["mix"].items()}
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid scenario: {exc!r}")
+        unknown = set(self.mix) - set(LoadRun.ACTIONS)
+        if unknown:
+            raise ValueError(f"Unknown actions in mix: {', '.join(sorted(unknown))}")
+        if "admin_advance" in self.mix and self.admin is None:
+            raise ValueError("admin_advance needs admin credentials")
+        if not self.stages or self.user_count < 1 or len(self.think_time) != 2:
+            raise ValueError("Scenario needs stages, a positive user count and a [min, max] think time")
+    
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        with open(path) as scenario:
+            return cls(json.load(scenario))
+    
+    @property
+    def duration(self) -> float:
+        return sum(duration for duration, _ in self.stages)
+    
+    @property
+    def peak_users(self) -> int:
+        return max(target for _, target in self.stages)
+    
+    def target_at(self, elapsed: float) -> Tuple[int, int]:
+        """``(stage index, virtual users)`` at ``elapsed`` seconds, ramping linearly within a stage"""
+        start_users = 0
+        for index, (duration, target) in enumerate(self.stages):
+            if elapsed < duration:
+                fraction = elapsed / duration if duration else 1.0
+                return index, round(start_users + (target - start_users) * fraction)
+            elapsed -= duration
+            start_users = target
+        return len(self.stages) - 1, self.stages[-1][1]
+
+
+class VirtualUser:
+    """Per-user state carried between actions"""
+    
+    __slots__ = ("index", "username", "token", "order_ids", "etags", "rng")
+    
+    def __init__(self, index: int, username: str, rng: random.Random) -> None:
+        self.index = index
+        self.username = username
+        self.token: Optional[str] = None
+        self.order_ids: List[int] = []
+        # Validators of responses seen, sent back as If-None-Match
+        self.etags: Dict[str, str] = {}
+        self.rng = rng
+
+
+class LoadRun:
+    """One execution of a scenario against a running server"""
+    
+    # Scenario mix names; each is a method taking the VirtualUser
+    ACTIONS = (
+        "browse_menu", "search_menu", "login", "place_order",
+        "poll_status", "order_history", "admin_advance",
+    )
+    
+    def __init__(self, scenario: Scenario, client: httpx.AsyncClient, seed: int = 0) -> None:
+        self.scenario = scenario
+        self.client = client
+        self.seed = seed
+        self.stage = 0
+        # (endpoint, stage, seconds, status); status 0 is a transport error
+        self.samples: List[Tuple[str, int, float, int]] = []
+        self.menu_item_ids: List[int] = []
+        self.categories: List[str] = []
+        self.search_words: List[str] = []
+        self.admin_token: Optional[str] = None
+        self._names = list(scenario.mix)
+        self._weights = [scenario.mix[name] for name in self._names]
+    
+    async def request(self, endpoint: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """Send a request and record its latency under ``endpoint``"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        self.samples.append((endpoint, self.stage, time.perf_counter() - started, status))
+        return response
+    
+    async def _token(self, username: str, password: str) -> Optional[str]:
+        response = await self.request(
+            "POST /auth/token", "POST", f"{API}/auth/token",
+            data={"username": username, "password": password}
+        )
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()["access_token"]
+    
+    @staticmethod
+    def _auth(token: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+    
+    async def setup(self) -> None:
+        """Read the menu (untimed) and log in the admin user"""
+        response = await self.client.get(f"{API}/menu/", params={"limit": 1000, "available_only": True})
+        response.raise_for_status()
+        items = response.json()["items"]
+        if not items:
+            raise RuntimeError("The server has no available menu items to order")
+        self.menu_item_ids = [item["id"] for item in items]
+        self.categories = sorted({item["category"] for item in items})
+        self.search_words = sorted({word for item in items for word in item["name"].split() if word.isalpha()})
+        if self.scenario.admin is not None:
+            self.admin_token = await self._token(*self.scenario.admin)
+            if self.admin_token is None:
+                raise RuntimeError("Admin login failed")
+    
+    async def _conditional_get(
+        self,
+        user: VirtualUser,
+        endpoint: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """GET revalidating the user's cached copy, as a browser would"""
+        key = f"{url}?{sorted((params or {}).items())}"
+        headers = dict(headers or {})
+        if key in user.etags:
+            headers["If-None-Match"] = user.etags[key]
+        response = await self.request(endpoint, "GET", url, params=params, headers=headers)
+        if response is not None and response.headers.get("etag"):
+            user.etags[key] = response.headers["etag"]
+    
+    async def browse_menu(self, user: VirtualUser) -> None:
+        params: Dict[str, Any] = {"limit": 50}
+        if user.rng.random() < 0.5:
+            params["category"] = user.rng.choice(self.categories)
+        await self._conditional_get(user, "GET /menu/", f"{API}/menu/", params=params)
+        item_id = user.rng.choice(self.menu_item_ids)
+        await self.request("GET /menu/{id}", "GET", f"{API}/menu/{item_id}")
+    
+    async def search_menu(self, user: VirtualUser) -> None:
+        term = user.rng.choice(self.search_words) if self.search_words else "a"
+        await self.request("GET /menu/?search", "GET", f"{API}/menu/", params={"search": term, "limit": 20})
+    
+    async def login(self, user: VirtualUser) -> None:
+        user.token = await self._token(user.username, self.scenario.password) or user.token
+    
+    async def _ensure_token(self, user: VirtualUser) -> bool:
+        if user.token is None:
+            await self.login(user)
+        return user.token is not None
+    
+    async def place_order(self, user: VirtualUser) -> None:
+        if not await self._ensure_token(user):
+            return
+        count = user.rng.randint(1, min(3, len(self.menu_item_ids)))
+        order = {
+            "delivery_address": f"{user.rng.randint(1, 999)} Load Street",
+            "phone_number": "5550001111",
+            "items": [
+                {"menu_item_id": item_id, "quantity": user.rng.randint(1, 3)}
+                for item_id in user.rng.sample(self.menu_item_ids, count)
+            ],
+        }
+        response = await self.request(
+            "POST /orders/", "POST", f"{API}/orders/", json=order,
+            headers={**self._auth(user.token), "Idempotency-Key": str(uuid.uuid4())}
+        )
+        if response is not None and response.status_code == 201:
+            user.order_ids = (user.order_ids + [response.json()["id"]])[-5:]
+    
+    async def poll_status(self, user: VirtualUser) -> None:
+        if not await self._ensure_token(user):
+            return
+        if not user.order_ids:
+            await self.request("GET /orders/", "GET", f"{API}/orders/", params={"limit": 10}, headers=self._auth(user.token))
+            return
+        order_id = user.rng.choice(user.order_ids)
+        await self._conditional_get(
+            user, "GET /orders/{id}", f"{API}/orders/{order_id}", headers=self._auth(user.token)
+        )
+    
+    async def order_history(self, user: VirtualUser) -> None:
+        if await self._ensure_token(user):
+            await self.request("GET /orders/history", "GET", f"{API}/orders/history", headers=self._auth(user.token))
+    
+    async def admin_advance(self, user: VirtualUser) -> None:
+        status = user.rng.choice(list(NEXT_STATUS))
+        headers = self._auth(self.admin_token)
+        response = await self.request(
+            "GET /orders/status/{status}", "GET", f"{API}/orders/status/{status}",
+            params={"limit": 20}, headers=headers
+        )
+        if response is None or response.status_code != 200 or not response.json():
+            return
+        order_id = user.rng.choice(response.json())["id"]
+        await self.request(
+            "PATCH /orders/{id}/status", "PATCH", f"{API}/orders/{order_id}/status",
+            params={"status": NEXT_STATUS[status]}, headers=headers
+        )
+    
+    async def _virtual_user(self, user: VirtualUser, stop: asyncio.Event) -> None:
+        low, high = self.scenario.think_time
+        while not stop.is_set():
+            action = user.rng.choices(self._names, self._weights)[0]
+            await getattr(self, action)(user)
+            try:
+                await asyncio.wait_for(stop.wait(), user.rng.uniform(low, high))
+            except asyncio.TimeoutError:
+                pass
+    
+    def _new_user(self, index: int) -> VirtualUser:
+        username = self.scenario.username.format(n=index % self.scenario.user_count + 1)
+        return VirtualUser(index, username, random.Random(self.seed * 1000003 + index))
+    
+    async def run(self) -> float:
+        """Drive virtual users through the ramp stages; returns elapsed seconds"""
+        running: List[Tuple[asyncio.Task, asyncio.Event]] = []
+        tasks: List[asyncio.Task] = []
+        started = time.monotonic()
+        try:
+            while True:
+                elapsed = time.monotonic() - started
+                if elapsed >= self.scenario.duration:
+                    break
+                self.stage, target = self.scenario.target_at(elapsed)
+                while len(running) < target:
+                    stop = asyncio.Event()
+                    task = asyncio.create_task(self._virtual_user(self._new_user(len(tasks)), stop))
+                    running.append((task, stop))
+                    tasks.append(task)
+                while len(running) > target:
+                    # Retire the newest user once its current action finishes
+                    running.pop()[1].set()
+                await asyncio.sleep(TICK_SECONDS)
+        finally:
+            for _, stop in running:
+                stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return time.monotonic() - started
+
+
+def summarize(samples: Sequence[Tuple[str, int, float, int]], elapsed: float) -> Dict[str, Any]:
+    """Throughput, error counts and latency percentiles overall, per endpoint and per stage"""
+    def stats(latencies: List[float], statuses: Counter, seconds: float) -> Dict[str, Any]:
+        latencies = sorted(latencies)
+        errors = {str(status): count for status, count in sorted(statuses.items()) if status == 0 or status >= 400}
+        return {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / seconds, 2) if seconds else None,
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+    
+    by_endpoint: Dict[str, Tuple[List[float], Counter]] = defaultdict(lambda: ([], Counter()))
+    by_stage: Dict[int, Tuple[List[float], Counter]] = defaultdict(lambda: ([], Counter()))
+    all_latencies: List[float] = []
+    all_statuses: Counter = Counter()
+    for endpoint, stage, seconds, status in samples:
+        for latencies, statuses in (by_endpoint[endpoint], by_stage[stage]):
+            latencies.append(seconds)
+            statuses[status] += 1
+        all_latencies.append(seconds)
+        all_statuses[status] += 1
+    
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total": stats(all_latencies, all_statuses, elapsed),
+        "endpoints": {name: stats(*by_endpoint[name], elapsed) for name in sorted(by_endpoint)},
+        # Stage rates are over the whole run; compare stages by latency
+        "stages": {str(stage): stats(*by_stage[stage], elapsed) for stage in sorted(by_stage)},
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Per-endpoint table followed by the totals"""
+    lines = [f"{'endpoint':<30} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  errors"]
+    rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+    for name, stats in rows:
+        errors = " ".join(f"{status}x{count}" for status, count in stats["errors"].items()) or "-"
+        lines.append(
+            f"{name:<30} {stats['requests']:>7} {stats['rps']:>8} {stats['p50_ms']:>9} "
+            f"{stats['p90_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}  {errors}"
+        )
+    return "\n".join(lines)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    base_url: str,
+    seed: int = 0,
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> Dict[str, Any]:
+    """Run ``scenario`` against ``base_url`` and summarize the samples"""
+    limits = httpx.Limits(max_connections=scenario.peak_users + 10, max_keepalive_connections=scenario.peak_users + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0, transport=transport) as client:
+        run = LoadRun(scenario, client, seed=seed)
+        await run.setup()
+        cpu_started = time.process_time()
+        elapsed = await run.run()
+        cpu = time.process_time() - cpu_started
+    summary = summarize(run.samples, elapsed)
+    summary["scenario"] = scenario.name
+    summary["base_url"] = base_url
+    # Near 1.0 the generator itself is the bottleneck
+    summary["generator_cpu"] = round(cpu / elapsed, 2) if elapsed else None
+    return summary
+
+
+def _wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout:.0f}s")
+
+
+@contextmanager
+def launched_server(
+    database_url: str,
+    workers: int,
+    port: int,
+    size: DatasetSize,
+    rate_limits: bool = False
+) -> Iterator[str]:
+    """Seed the benchmark dataset and serve app.main:app on it; yields the base URL"""
+    if ensure_dataset(create_engine(database_url), size):
+        print(f"Seeded {size.as_dict()}", file=sys.stderr)
+    env = {
+        **os.environ,
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        # Load tests log in from one address far faster than the defaults allow
+        "AUTH_RATE_LIMIT_ENABLED": "true" if rate_limits else "false",
+    }
+    env.setdefault("DB_PASSWORD", "benchmark-db-password")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_ready(base_url, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenario", help="Scenario JSON file, e.g. benchmarks/scenarios/lunch_rush.json")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server to load (ignored with --launch)")
+    parser.add_argument("--launch", action="store_true", help="Start a local server on the benchmark dataset")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes with --launch")
+    parser.add_argument("--port", type=int, default=8089, help="Port for the launched server")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="Database for the launched server")
+    parser.add_argument("--orders", type=int, default=10000, help="Seeded orders for the launched server")
+    parser.add_argument("--rate-limits", action="store_true", help="Keep auth rate limiting on in the launched server")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for virtual users")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    args = parser.parse_args(argv)
+    
+    try:
+        scenario = Scenario.load(args.scenario)
+    except ValueError as exc:
+        parser.error(str(exc))
+    
+    if args.launch:
+        size = DatasetSize(orders=args.orders)
+        if scenario.user_count > size.users:
+            parser.error(f"Scenario uses {scenario.user_count} users but the dataset seeds {size.users}")
+        with launched_server(args.database_url, args.workers, args.port, size, args.rate_limits) as base_url:
+            summary = asyncio.run(run_scenario(scenario, base_url, args.seed))
+        summary["workers"] = args.workers
+    else:
+        summary = asyncio.run(run_scenario(scenario, args.base_url, args.seed))
+    
+    print(format_summary(summary))
+    print(f"\n{summary['total']['rps']} req/s over {summary['elapsed_seconds']}s, generator CPU {summary['generator_cpu']:.0%}")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(summary, output, indent=2)
+            output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
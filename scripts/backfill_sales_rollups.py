@@ -0,0 +1,28 @@
+"""
+Rebuild the daily sales rollup tables from the orders tables
+
+Run after applying the rollup migration to an existing database, or any
+time the rollups need to be recomputed:
+
+    python -m scripts.backfill_sales_rollups [--batch-size N]
+"""
+import argparse
+from app.db.base import SessionLocal
+from app.services.analytics_service import AnalyticsService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows fetched per round trip")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        counted = AnalyticsService.backfill(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Rebuilt sales rollups from {counted} orders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Generate a large synthetic dataset of users, menu items and orders
+
+Data is deterministic for a given --seed and --end and skewed the way real
+traffic is: a few menu items and heavy users account for most orders,
+orders cluster around lunch and dinner and towards the weekend, and only
+recent orders are still in flight (set --end to a lunch hour for a busy
+kitchen). Rows are bulk loaded (COPY on
+PostgreSQL, executemany elsewhere) with the orders indexes built once at
+the end, into an empty database:
+
+    python -m scripts.seed_data --orders 3000000 [--users N] [--menu-items N] [--seed N]
+    python -m scripts.seed_data --database-url sqlite:///./big.db --orders 1000000 --skip-rollups
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Table, create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.core.security import security
+from app.db.base import create_tables, engine as app_engine
+from app.db.menu_search import get_search_backend
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+
+USERNAME_TEMPLATE = "user_{n}"
+# Every generated user shares this password (hashed once); user 1 is a superuser
+DEFAULT_PASSWORD = "seed-password"
+
+CATEGORIES = ("Starters", "Mains", "Pizza", "Burgers", "Salads", "Desserts", "Drinks", "Sides")
+DISHES = (
+    "Chicken", "Beef", "Tofu", "Mushroom", "Salmon", "Lamb", "Halloumi", "Prawn",
+    "Spinach", "Pepper", "Cheese", "Garlic", "Chili", "Lemon", "Basil", "Truffle",
+)
+STYLES = ("Grilled", "Spicy", "Crispy", "Roasted", "Smoked", "Classic", "Fresh", "Baked")
+STREETS = ("Main St", "High St", "Station Rd", "Park Ave", "Church Ln", "Mill Rd", "King St", "Queen St")
+
+# Relative order volume per hour of day (lunch and dinner peaks) and per
+# weekday (Monday first)
+HOUR_WEIGHTS = (1, 0.5, 0.2, 0.1, 0.1, 0.2, 0.5, 1, 2, 2, 3, 8, 12, 9, 4, 3, 4, 7, 11, 12, 8, 5, 3, 2)
+WEEKDAY_WEIGHTS = (0.9, 0.9, 1.0, 1.0, 1.2, 1.4, 1.1)
+# Lines per order and quantity per line
+LINE_COUNT_WEIGHTS = ((1, 45), (2, 30), (3, 15), (4, 7), (5, 3))
+QUANTITY_WEIGHTS = ((1, 70), (2, 22), (3, 8))
+# Status mix by order age: orders still in flight are recent
+STATUS_BY_AGE = (
+    (timedelta(minutes=15), (("pending", 50), ("confirmed", 30), ("preparing", 15), ("cancelled", 5))),
+    (timedelta(minutes=90), (("confirmed", 10), ("preparing", 30), ("delivered", 55), ("cancelled", 5))),
+    (timedelta.max, (("delivered", 93), ("cancelled", 7))),
+)
+
+
+class SeedConfig:
+    """Sizes, skew and seed of a generated dataset"""
+    
+    __slots__ = ("users", "menu_items", "orders", "days", "end", "item_skew", "user_skew", "seed", "batch_size")
+    
+    def __init__(
+        self,
+        orders: int,
+        users: int = 0,
+        menu_items: int = 200,
+        days: int = 180,
+        end: Optional[datetime] = None,
+        item_skew: float = 1.1,
+        user_skew: float = 0.6,
+        seed: int = 0,
+        batch_size: int = 20000
+    ) -> None:
+        self.orders = orders
+        self.users = users or max(10, orders // 50)
+        self.menu_items = menu_items
+        self.days = days
+        # Default to the start of the current hour so reruns within it match
+        self.end = end or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self.item_skew = item_skew
+        self.user_skew = user_skew
+        self.seed = seed
+        self.batch_size = batch_size
+
+
+def _cumulative(weights: Sequence[float]) -> List[float]:
+    total, cumulative = 0.0, []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def zipf_weights(count: int, skew: float, rng: random.Random) -> List[float]:
+    """Zipf weights ``1 / rank ** skew`` assigned to ids in shuffled order"""
+    weights = [1.0 / rank ** skew for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return weights
+
+
+def _weighted(pairs: Sequence[Tuple[Any, float]]) -> Tuple[List[Any], List[float]]:
+    return [value for value, _ in pairs], _cumulative([weight for _, weight in pairs])
+
+
+def user_rows(config: SeedConfig, hashed_password: str) -> Iterator[tuple]:
+    """(id, username, email, hashed_password, is_active, is_superuser, token_version)"""
+    for user_id in range(1, config.users + 1):
+        username = USERNAME_TEMPLATE.format(n=user_id)
+        yield (user_id, username, f"{username}@example.com", hashed_password, True, user_id == 1, 0)
+
+
+def menu_item_rows(config: SeedConfig, rng: random.Random) -> List[tuple]:
+    """(id, name, description, price, category, is_available)"""
+    rows = []
+    for item_id in range(1, config.menu_items + 1):
+        style, dish = rng.choice(STYLES), rng.choice(DISHES)
+        category = CATEGORIES[item_id % len(CATEGORIES)]
+        description = f"{style} {dish.lower()} with {rng.choice(DISHES).lower()} and {rng.choice(DISHES).lower()}"
+        price = round(rng.uniform(2.5, 30.0), 2)
+        rows.append((item_id, f"{style} {dish} {category.rstrip('s')} {item_id}", description, price, category, rng.random() > 0.05))
+    return rows
+
+
+def order_batches(
+    config: SeedConfig,
+    prices: Sequence[float],
+    rng: random.Random
+) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+    """
+    Batches of (order rows, order item rows).
+    
+    Orders are (id, user_id, total_amount, status, delivery_address,
+    phone_number, notes, created_at, updated_at); items are (id, order_id,
+    menu_item_id, quantity, price). Random draws are made a batch at a time
+    with cumulative weights, which keeps generation at a few microseconds
+    per row.
+    """
+    user_ids = range(1, config.users + 1)
+    user_weights = _cumulative(zipf_weights(config.users, config.user_skew, rng))
+    item_ids = range(1, config.menu_items + 1)
+    item_weights = _cumulative(zipf_weights(config.menu_items, config.item_skew, rng))
+    
+    start_day = (config.end - timedelta(days=config.days)).replace(hour=0)
+    days = range(config.days + 1)
+    # Volume grows towards the end of the period and peaks at weekends
+    day_weights = _cumulative([
+        WEEKDAY_WEIGHTS[(start_day + timedelta(days=day)).weekday()] * (0.6 + 0.4 * day / max(config.days, 1))
+        for day in days
+    ])
+    hours, hour_weights = range(24), _cumulative(HOUR_WEIGHTS)
+    line_counts, line_count_weights = _weighted(LINE_COUNT_WEIGHTS)
+    quantities, quantity_weights = _weighted(QUANTITY_WEIGHTS)
+    status_tables = [(max_age, *_weighted(pairs)) for max_age, pairs in STATUS_BY_AGE]
+    
+    order_id = item_id = 0
+    while order_id < config.orders:
+        count = min(config.batch_size, config.orders - order_id)
+        batch_users = rng.choices(user_ids, cum_weights=user_weights, k=count)
+        batch_days = rng.choices(days, cum_weights=day_weights, k=count)
+        batch_hours = rng.choices(hours, cum_weights=hour_weights, k=count)
+        batch_lines = rng.choices(line_counts, cum_weights=line_count_weights, k=count)
+        orders, items = [], []
+        for index in range(count):
+            created_at = start_day + timedelta(
+                days=batch_days[index], hours=batch_hours[index], seconds=rng.randrange(3600)
+            )
+            if created_at > config.end:
+                # Today's hours past the end time wrap back a day
+                created_at -= timedelta(days=1)
+            order_id += 1
+            total = 0.0
+            for menu_item_id in set(rng.choices(item_ids, cum_weights=item_weights, k=batch_lines[index])):
+                quantity = rng.choices(quantities, cum_weights=quantity_weights)[0]
+                price = prices[menu_item_id - 1]
+                total += price * quantity
+                item_id += 1
+                items.append((item_id, order_id, menu_item_id, quantity, price))
+            
+            age = config.end - created_at
+            for max_age, statuses, status_weights in status_tables:
+                if age < max_age:
+                    status = rng.choices(statuses, cum_weights=status_weights)[0]
+                    break
+            updated_at = None
+            if status != "pending":
+                updated_at = min(created_at + timedelta(minutes=rng.randint(5, 60)), config.end)
+            orders.append((
+                order_id, batch_users[index], round(total, 2), status,
+                f"{rng.randint(1, 999)} {rng.choice(STREETS)}", f"555{rng.randrange(10000000):07d}",
+                None, created_at, updated_at,
+            ))
+        yield orders, items
+
+
+USER_COLUMNS = ("id", "username", "email", "hashed_password", "is_active", "is_superuser", "token_version")
+MENU_ITEM_COLUMNS = ("id", "name", "description", "price", "category", "is_available")
+ORDER_COLUMNS = (
+    "id", "user_id", "total_amount", "status", "delivery_address",
+    "phone_number", "notes", "created_at", "updated_at",
+)
+ORDER_ITEM_COLUMNS = ("id", "order_id", "menu_item_id", "quantity", "price")
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy_rows(conn: Connection, table: Table, columns: Sequence[str], rows: Sequence[tuple]) -> None:
+    """COPY ... FROM STDIN in CSV (unquoted empty fields are NULL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(value) for value in row])
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def _insert_rows(conn: Connection, table: Table, columns: Sequence[str], rows: Sequence[tuple]) -> None:
+    conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+def bulk_writer(conn: Connection) -> Callable[[Connection, Table, Sequence[str], Sequence[tuple]], None]:
+    """COPY for PostgreSQL through psycopg2, executemany inserts otherwise"""
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        return _copy_rows
+    return _insert_rows
+
+
+def _reset_sequences(conn: Connection) -> None:
+    """Move PostgreSQL id sequences past the explicitly inserted ids"""
+    for model in (User, MenuItem, Order, OrderItem):
+        table = model.__tablename__
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def seed_database(
+    engine: Engine,
+    config: SeedConfig,
+    rollups: bool = True,
+    progress: Optional[Callable[[str], None]] = None
+) -> Dict[str, int]:
+    """
+    Create the schema if needed and load ``config`` into empty tables;
+    returns the row counts written.
+    
+    Secondary indexes on orders and order_items are dropped for the load
+    and rebuilt once afterwards, which is much faster than maintaining
+    them row by row.
+    """
+    report = progress or (lambda message: None)
+    create_tables(bind=engine)
+    with engine.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(User)) or conn.scalar(select(func.count()).select_from(Order)):
+            raise ValueError("Refusing to seed a database that already has users or orders")
+    
+    rng = random.Random(config.seed)
+    hashed_password = security.get_password_hash(DEFAULT_PASSWORD)
+    menu_items = menu_item_rows(config, rng)
+    prices = [row[3] for row in menu_items]
+    deferred = [index for model in (Order, OrderItem) for index in model.__table__.indexes]
+    counts = {"users": config.users, "menu_items": config.menu_items, "orders": 0, "order_items": 0}
+    started = time.perf_counter()
+    
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # Only this connection; durability does not matter mid-load
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+        write = bulk_writer(conn)
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+        
+        users = list(user_rows(config, hashed_password))
+        for start in range(0, len(users), config.batch_size):
+            write(conn, User.__table__, USER_COLUMNS, users[start:start + config.batch_size])
+        write(conn, MenuItem.__table__, MENU_ITEM_COLUMNS, menu_items)
+        
+        for orders, items in order_batches(config, prices, rng):
+            write(conn, Order.__table__, ORDER_COLUMNS, orders)
+            write(conn, OrderItem.__table__, ORDER_ITEM_COLUMNS, items)
+            counts["orders"] += len(orders)
+            counts["order_items"] += len(items)
+            elapsed = time.perf_counter() - started
+            report(f"{counts['orders']:,}/{config.orders:,} orders ({(counts['orders'] + counts['order_items']) / elapsed:,.0f} rows/s)")
+        
+        report("Building indexes")
+        for index in deferred:
+            index.create(conn)
+        if conn.dialect.name == "postgresql":
+            _reset_sequences(conn)
+    
+    with Session(engine) as db:
+        get_search_backend(db).rebuild(db)
+        db.commit()
+        if rollups:
+            report("Rebuilding sales rollups")
+            AnalyticsService.backfill(db)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Target database (default: the application database)")
+    parser.add_argument("--orders", type=int, required=True, help="Orders to generate")
+    parser.add_argument("--users", type=int, default=0, help="Users (default orders / 50)")
+    parser.add_argument("--menu-items", type=int, default=200, help="Menu items")
+    parser.add_argument("--days", type=int, default=180, help="Days of order history")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Newest order time, ISO format (default this hour, UTC)")
+    parser.add_argument("--item-skew", type=float, default=1.1, help="Zipf exponent of menu item popularity")
+    parser.add_argument("--user-skew", type=float, default=0.6, help="Zipf exponent of orders per user")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Orders per bulk write")
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild the sales rollups afterwards")
+    args = parser.parse_args()
+    
+    end = args.end
+    if end is not None and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    config = SeedConfig(
+        orders=args.orders, users=args.users, menu_items=args.menu_items, days=args.days, end=end,
+        item_skew=args.item_skew, user_skew=args.user_skew, seed=args.seed, batch_size=args.batch_size
+    )
+    engine = create_engine(args.database_url) if args.database_url else app_engine
+    
+    started = time.perf_counter()
+    try:
+        counts = seed_database(
+            engine, config, rollups=not args.skip_rollups,
+            progress=lambda message: print(message, file=sys.stderr)
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
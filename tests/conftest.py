@@ -1,11 +1,26 @@
 """
 Pytest configuration and fixtures for testing
 """
+import os
+
+# Settings validation rejects the placeholder password; tests never reach Postgres
+os.environ.setdefault("DB_PASSWORD", "test-db-password")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.db.base import Base
+from sqlalchemy.pool import NullPool
+from app.core.cache import principal_cache
+from app.core.catalog import menu_catalog
+from app.core.idempotency import idempotency_store
+from app.core.kitchen import kitchen_queue
+from app.core import query_budget
+from app.core.metrics import instrument_engine
+from app.core.rate_limit import auth_admission
+from app.core.revocation import revocation_set
+from app.db.base import Base, get_async_db
 from app.api.dependencies import get_db
 from app.main import app
 
@@ -14,6 +29,17 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database file; NullPool because the TestClient
+# may run each request on a different event loop
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+# Same SQL metrics hooks as the application engines
+instrument_engine(async_engine.sync_engine, "test")
+query_budget.install(async_engine.sync_engine)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -40,7 +66,19 @@ def client(db_session):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
+    # Each test recreates the schema, so cached users would have stale ids
+    principal_cache.clear()
+    revocation_set.clear()
+    menu_catalog.clear()
+    kitchen_queue.clear()
+    idempotency_store.clear()
+    auth_admission.clear()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -103,4 +141,62 @@ def admin_headers(client):
     
     token = response.json()["access_token"]
     
-    return {"Authorization": f"Bearer {token}"} 
\ No newline at end of file
+    return {"Authorization": f"Bearer {token}"} 
+
+
+def _register(client, username, email, password):
+    """Register a user through the API"""
+    client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": email, "password": password}
+    )
+
+
+def _login(client, username, password):
+    """Return bearer headers from the OAuth2 token endpoint"""
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": username, "password": password}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def user_token_headers(client):
+    """Bearer headers for a regular user obtained via /auth/token"""
+    _register(client, "customer", "customer@example.com", "customerpass123")
+    return _login(client, "customer", "customerpass123")
+
+
+@pytest.fixture
+def superuser_token_headers(client, db_session):
+    """Bearer headers for a superuser obtained via /auth/token"""
+    from app.models.user import User
+    
+    _register(client, "manager", "manager@example.com", "managerpass123")
+    db_session.query(User).filter(User.username == "manager").update({"is_superuser": True})
+    db_session.commit()
+    # Log in after promotion so the token carries the superuser claim
+    return _login(client, "manager", "managerpass123")
+
+
+@pytest.fixture
+def menu_items(client, superuser_token_headers):
+    """Factory that creates menu items as the superuser and returns their ids
+    
+    Each item is a name or a dict of fields; keyword arguments set defaults
+    for the fields an item leaves out.
+    """
+    def create(*items, **defaults):
+        ids = []
+        for item in items:
+            if isinstance(item, str):
+                item = {"name": item}
+            data = {"description": "Test", "price": 5.0, "category": "Main", **defaults, **item}
+            response = client.post("/api/v1/menu/", json=data, headers=superuser_token_headers)
+            assert response.status_code == 201, response.text
+            ids.append(response.json()["id"])
+        return ids
+    
+    return create
@@ -0,0 +1,174 @@
+"""
+Tests for sales rollups and analytics endpoints
+"""
+import os
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.db.base import create_tables, drop_tables
+from app.models.sales_rollup import DailyMenuItemSales, DailySales, SalesDelta
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def menu_ids(menu_items):
+    """Two lunch dishes and one drink"""
+    return menu_items(
+        {"name": "Soup", "price": 4.0, "category": "Lunch"},
+        {"name": "Salad", "price": 6.0, "category": "Lunch"},
+        {"name": "Tea", "price": 2.0, "category": "Drinks"},
+    )
+
+
+def _place(client, headers, *items):
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "delivery_address": "3 Report Ave",
+            "phone_number": "5550004444",
+            "items": [{"menu_item_id": item_id, "quantity": quantity} for item_id, quantity in items]
+        },
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+def _reports(client, headers):
+    return (
+        client.get("/api/v1/analytics/daily", headers=headers).json(),
+        client.get("/api/v1/analytics/categories", headers=headers).json(),
+        client.get("/api/v1/analytics/menu-items", headers=headers).json(),
+    )
+
+
+def test_rollups_follow_order_lifecycle(client, user_token_headers, superuser_token_headers, menu_ids):
+    """Test that creating, cancelling and deleting orders keep the rollups current"""
+    soup, salad, tea = menu_ids
+    _place(client, user_token_headers, (soup, 2), (tea, 1))
+    cancelled = _place(client, user_token_headers, (salad, 1))
+    deleted = _place(client, user_token_headers, (salad, 3), (tea, 2))
+    
+    daily, categories, items = _reports(client, superuser_token_headers)
+    assert len(daily) == 1
+    assert daily[0]["revenue"] == pytest.approx(10.0 + 6.0 + 22.0)
+    assert daily[0]["order_count"] == 3 and daily[0]["item_quantity"] == 9
+    assert [row["category"] for row in categories] == ["Lunch", "Drinks"]
+    assert items[0]["menu_item_name"] == "Salad" and items[0]["item_quantity"] == 4
+    
+    response = client.patch(
+        f"/api/v1/orders/{cancelled}/status?status=cancelled", headers=superuser_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.delete(f"/api/v1/orders/{deleted}", headers=superuser_token_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    
+    daily, categories, items = _reports(client, superuser_token_headers)
+    assert daily[0]["revenue"] == pytest.approx(10.0)
+    assert daily[0]["order_count"] == 1 and daily[0]["item_quantity"] == 3
+    lunch = next(row for row in categories if row["category"] == "Lunch")
+    assert lunch["revenue"] == pytest.approx(8.0) and lunch["order_count"] == 1
+    by_name = {row["menu_item_name"]: row for row in items}
+    assert by_name["Salad"]["revenue"] == pytest.approx(0.0)
+    assert by_name["Tea"]["order_count"] == 1
+    
+    # Reinstating a cancelled order adds it back
+    client.patch(f"/api/v1/orders/{cancelled}/status?status=confirmed", headers=superuser_token_headers)
+    daily, _, _ = _reports(client, superuser_token_headers)
+    assert daily[0]["order_count"] == 2
+
+
+def test_backfill_matches_incremental_rollups(client, db_session, user_token_headers, superuser_token_headers, menu_ids):
+    """Test that a full rebuild reproduces the incrementally maintained rollups"""
+    soup, salad, tea = menu_ids
+    _place(client, user_token_headers, (soup, 1), (salad, 2))
+    _place(client, user_token_headers, (tea, 4))
+    cancelled = _place(client, user_token_headers, (soup, 5))
+    client.patch(f"/api/v1/orders/{cancelled}/status?status=cancelled", headers=superuser_token_headers)
+    client.post(
+        "/api/v1/orders/batch",
+        json={"orders": [{
+            "delivery_address": "3 Report Ave",
+            "phone_number": "5550004444",
+            "items": [{"menu_item_id": salad, "quantity": 1}]
+        }] * 3},
+        headers=user_token_headers
+    )
+    incremental = _reports(client, superuser_token_headers)
+    
+    assert AnalyticsService.backfill(db_session, batch_size=2) == 5
+    assert _reports(client, superuser_token_headers) == incremental
+
+
+def test_analytics_requires_superuser(client, user_token_headers):
+    """Test that regular users cannot read sales reports"""
+    response = client.get("/api/v1/analytics/daily", headers=user_token_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_analytics_rejects_inverted_range(client, superuser_token_headers):
+    """Test that a start date after the end date is rejected"""
+    response = client.get(
+        "/api/v1/analytics/daily?start=2026-02-01&end=2026-01-01", headers=superuser_token_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def rollup_engine(request, tmp_path):
+    """Scratch database; PostgreSQL runs when TEST_POSTGRES_URL points at one"""
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path / 'rollups.db'}"
+    else:
+        url = os.environ.get("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(url)
+    create_tables(bind=engine)
+    yield engine
+    drop_tables(bind=engine)
+    engine.dispose()
+
+
+def test_concurrent_orders_and_folds(rollup_engine):
+    """Test that concurrent order transactions and folds neither block each other nor double count"""
+    Session = sessionmaker(bind=rollup_engine)
+    order = SimpleNamespace(created_at=datetime(2026, 3, 2, 12, 0), total_amount=6.0)
+    soup, tea = (1, "Soup", "Lunch", 1, 4.0), (2, "Tea", "Drinks", 1, 2.0)
+    # Both transactions stay open together; SQLite would just serialize them
+    both_written = threading.Barrier(2) if rollup_engine.dialect.name == "postgresql" else None
+    errors = []
+    
+    def run(work):
+        try:
+            with Session() as db:
+                work(db)
+        except Exception as exc:
+            errors.append(exc)
+    
+    def place(lines):
+        def work(db):
+            for _ in range(10):
+                AnalyticsService.record_orders(db, [(order, lines)])
+            if both_written is not None:
+                both_written.wait(timeout=10)
+            db.commit()
+        return work
+    
+    for works in ([place([soup, tea]), place([tea, soup])], [AnalyticsService.fold_deltas] * 2):
+        threads = [threading.Thread(target=run, args=(work,)) for work in works]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        assert errors == []
+    
+    with Session() as db:
+        assert db.scalar(select(func.count()).select_from(SalesDelta)) == 0
+        daily = db.scalars(select(DailySales)).one()
+        assert (daily.revenue, daily.order_count, daily.item_quantity) == (120.0, 20, 40)
+        assert [row.order_count for row in db.scalars(select(DailyMenuItemSales))] == [20, 20]
@@ -0,0 +1,71 @@
+"""
+Tests for the async database layer and async service variants
+"""
+import asyncio
+import pytest
+from fastapi import status
+from app.core.config import Settings
+from app.schemas.menu import MenuItemCreate
+from app.services.menu_service import AsyncMenuService
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def test_async_database_url_uses_async_drivers():
+    """Test driver mapping for the async engine URL"""
+    pg = Settings(DB_PASSWORD="s3cret-password")
+    assert pg.ASYNC_DATABASE_URL.startswith("postgresql+asyncpg://")
+    
+    lite = Settings(DB_PASSWORD="s3cret-password", SQLALCHEMY_DATABASE_URI="sqlite:///./local.db")
+    assert lite.ASYNC_DATABASE_URL == "sqlite+aiosqlite:///./local.db"
+
+
+def test_async_menu_service_round_trip(db_session):
+    """Test that the async service variant reads back what it wrote"""
+    async def scenario():
+        async with TestingAsyncSessionLocal() as db:
+            created = await AsyncMenuService.create_menu_item(
+                db,
+                MenuItemCreate(name="Falafel", description="Chickpea", price=6.5, category="Wraps")
+            )
+            # Concurrent reads on separate sessions overlap on the event loop
+            results = await asyncio.gather(*[_read(created.id) for _ in range(5)])
+            return created, results
+    
+    async def _read(item_id):
+        async with TestingAsyncSessionLocal() as db:
+            return await AsyncMenuService.get_menu_item(db, item_id)
+    
+    created, results = asyncio.run(scenario())
+    assert created.is_available is True
+    assert all(item.name == "Falafel" for item in results)
+
+
+def test_order_flow_through_async_endpoints(client, user_token_headers, superuser_token_headers):
+    """Test placing and reading an order via the async session dependency"""
+    menu_response = client.post(
+        "/api/v1/menu/",
+        json={"name": "Ramen", "description": "Pork broth", "price": 12.0, "category": "Noodles"},
+        headers=superuser_token_headers
+    )
+    assert menu_response.status_code == status.HTTP_201_CREATED
+    menu_id = menu_response.json()["id"]
+    
+    order_response = client.post(
+        "/api/v1/orders/",
+        json={
+            "delivery_address": "1 Async Way",
+            "phone_number": "5550001111",
+            "items": [{"menu_item_id": menu_id, "quantity": 2}]
+        },
+        headers=user_token_headers
+    )
+    assert order_response.status_code == status.HTTP_201_CREATED
+    order = order_response.json()
+    assert order["total_amount"] == pytest.approx(24.0)
+    assert order["order_items"][0]["menu_item"]["name"] == "Ramen"
+    
+    response = client.get(f"/api/v1/orders/{order['id']}", headers=user_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    
+    me = client.get("/api/v1/users/me", headers=user_token_headers)
+    assert me.json()["username"] == "customer"
@@ -0,0 +1,38 @@
+"""
+Tests for the service benchmark suite
+"""
+from sqlalchemy import create_engine
+from benchmarks.compare import compare
+from benchmarks.dataset import DatasetSize, ensure_dataset, row_counts
+from benchmarks.services import run_suite
+
+
+def test_suite_reports_timings_and_statements(tmp_path):
+    """Test a tiny run end to end, leaving the seeded dataset unchanged"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    size = DatasetSize(orders=60, users=5, menu_items=12)
+    assert ensure_dataset(engine, size) is True
+    assert ensure_dataset(engine, size) is False
+    
+    report = run_suite(engine, size, iterations=3, warmup=1, only=["menu.", "order."])
+    
+    assert report["database"] == "sqlite"
+    assert report["dataset"] == {"users": 5, "menu_items": 12, "orders": 60}
+    assert "user.authenticate_user" not in report["results"]
+    history = report["results"]["order.get_user_order_history"]
+    assert history["iterations"] == 3
+    assert history["p50_ms"] <= history["p99_ms"]
+    # Orders, then items and their menu items in one batched query each
+    assert history["statements_per_call"] == 3
+    assert row_counts(engine) == size.as_dict()
+
+
+def test_compare_flags_slower_calls_and_extra_statements():
+    """Test that regressions are reported against the baseline"""
+    def report(p50_ms, statements):
+        return {"results": {"order.get_orders": {"p50_ms": p50_ms, "statements_per_call": statements}}}
+    
+    _, regressions = compare(report(2.0, 3), report(2.2, 3))
+    assert regressions == []
+    _, regressions = compare(report(2.0, 3), report(3.0, 4))
+    assert regressions == ["order.get_orders: p50 +50.0%", "order.get_orders: statements per call 3->4"]
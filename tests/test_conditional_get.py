@@ -0,0 +1,108 @@
+"""
+Tests for ETag / If-None-Match handling on menu and order reads
+"""
+import pytest
+from fastapi import status
+from app.core.etag import etag_matches
+from app.core.query_budget import capture_queries
+
+
+def test_etag_matching():
+    """Test If-None-Match parsing"""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+@pytest.fixture
+def menu_item_id(menu_items):
+    """One menu item"""
+    return menu_items({"name": "Ramen", "description": "Noodles", "price": 12.0, "category": "Noodles"})[0]
+
+
+@pytest.mark.parametrize("path", ["/api/v1/menu/", "/api/v1/menu/categories", "/api/v1/menu/{id}"])
+def test_menu_conditional_get(client, superuser_token_headers, menu_item_id, path):
+    """Test that menu reads revalidate to 304 until the menu changes"""
+    path = path.format(id=menu_item_id)
+    first = client.get(path)
+    etag = first.headers["ETag"]
+    assert first.status_code == status.HTTP_200_OK
+    
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    
+    client.put(
+        f"/api/v1/menu/{menu_item_id}", json={"category": "Soup"}, headers=superuser_token_headers
+    )
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.headers["ETag"] != etag
+
+
+def test_menu_listing_etag_depends_on_query(client, menu_item_id):
+    """Test that different filters of the same catalog get different tags"""
+    etag = client.get("/api/v1/menu/").headers["ETag"]
+    filtered = client.get("/api/v1/menu/", params={"category": "Noodles"}, headers={"If-None-Match": etag})
+    assert filtered.status_code == status.HTTP_200_OK
+    assert "ETag" not in client.get("/api/v1/menu/", params={"search": "ramen"}).headers
+
+
+@pytest.fixture
+def order_id(client, user_token_headers, menu_item_id):
+    """An order placed by the regular user"""
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "delivery_address": "1 Noodle Way",
+            "phone_number": "5550003333",
+            "items": [{"menu_item_id": menu_item_id, "quantity": 1}]
+        },
+        headers=user_token_headers
+    )
+    return response.json()["id"]
+
+
+def test_completed_order_conditional_get(client, user_token_headers, superuser_token_headers, order_id):
+    """Test that completed orders revalidate to 304 without loading the order"""
+    in_progress = client.get(f"/api/v1/orders/{order_id}", headers=user_token_headers)
+    assert "ETag" not in in_progress.headers
+    
+    client.patch(
+        f"/api/v1/orders/{order_id}/status", params={"status": "delivered"}, headers=superuser_token_headers
+    )
+    first = client.get(f"/api/v1/orders/{order_id}", headers=user_token_headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    
+    with capture_queries() as capture:
+        cached = client.get(
+            f"/api/v1/orders/{order_id}", headers={**user_token_headers, "If-None-Match": etag}
+        )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert capture.count == 1, capture.report()
+
+
+def test_order_etag_respects_ownership(client, superuser_token_headers, order_id):
+    """Test that a matching tag does not reveal another user's order"""
+    client.patch(
+        f"/api/v1/orders/{order_id}/status", params={"status": "cancelled"}, headers=superuser_token_headers
+    )
+    etag = client.get(f"/api/v1/orders/{order_id}", headers=superuser_token_headers).headers["ETag"]
+    
+    other = client.post(
+        "/api/v1/auth/register",
+        json={"username": "outsider", "email": "outsider@example.com", "password": "outsiderpass1"}
+    )
+    assert other.status_code == status.HTTP_201_CREATED
+    token = client.post(
+        "/api/v1/auth/token", data={"username": "outsider", "password": "outsiderpass1"}
+    ).json()["access_token"]
+    response = client.get(
+        f"/api/v1/orders/{order_id}",
+        headers={"Authorization": f"Bearer {token}", "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
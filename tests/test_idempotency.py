@@ -0,0 +1,148 @@
+"""
+Tests for Idempotency-Key handling on order creation
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException, status
+from app.core.idempotency import IdempotencyStore, StoredResponse, idempotency_store
+from app.core.query_budget import capture_queries
+from app.models.idempotency_key import IdempotencyKey
+from app.models.order import Order
+
+
+@pytest.fixture
+def order_data(menu_items):
+    menu_id, = menu_items({"name": "Wrap", "price": 7.5, "category": "Lunch"})
+    return {
+        "delivery_address": "8 Retry Rd",
+        "phone_number": "5550006666",
+        "items": [{"menu_item_id": menu_id, "quantity": 2}]
+    }
+
+
+def test_retry_replays_original_response(client, db_session, user_token_headers, order_data):
+    """Test that a retried request returns the first response without a new order"""
+    headers = {**user_token_headers, "Idempotency-Key": "retry-1"}
+    first = client.post("/api/v1/orders/", json=order_data, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    assert first.headers["Idempotent-Replayed"] == "false"
+    
+    with capture_queries() as capture:
+        retry = client.post("/api/v1/orders/", json=order_data, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.content == first.content
+    assert not any("INSERT" in statement for statement, _ in capture.statements)
+    assert db_session.query(Order).count() == 1
+    
+    # Without a key every request creates an order
+    client.post("/api/v1/orders/", json=order_data, headers=user_token_headers)
+    assert db_session.query(Order).count() == 2
+
+
+def test_retry_replays_from_database_after_cache_loss(client, db_session, user_token_headers, order_data):
+    """Test that the persisted row answers retries handled by another process"""
+    headers = {**user_token_headers, "Idempotency-Key": "retry-2"}
+    first = client.post("/api/v1/orders/", json=order_data, headers=headers)
+    idempotency_store.clear()
+    
+    retry = client.post("/api/v1/orders/", json=order_data, headers=headers)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert db_session.query(IdempotencyKey).count() == 1
+    assert db_session.query(Order).count() == 1
+
+
+def test_key_reuse_with_different_payload_is_rejected(client, user_token_headers, order_data):
+    """Test that a key cannot be reused for a different request"""
+    headers = {**user_token_headers, "Idempotency-Key": "retry-3"}
+    client.post("/api/v1/orders/", json=order_data, headers=headers)
+    
+    changed = {**order_data, "notes": "extra napkins"}
+    response = client.post("/api/v1/orders/", json=changed, headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    response = client.post(
+        "/api/v1/orders/", json=order_data, headers={**user_token_headers, "Idempotency-Key": " "}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_concurrent_duplicates_wait_for_first_execution():
+    """Test that duplicates arriving mid-flight share the first execution"""
+    store = IdempotencyStore(maxsize=10, ttl=60, wait_seconds=5)
+    executions = []
+    
+    async def lookup():
+        return None
+    
+    async def run():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return StoredResponse("fp", 201, b'{"id":1}')
+    
+    async def scenario():
+        return await asyncio.gather(*(store.execute("key", "fp", lookup, run) for _ in range(5)))
+    
+    results = asyncio.run(scenario())
+    assert len(executions) == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert all(stored.body == b'{"id":1}' for stored, _ in results)
+    assert store.stats()["waits"] == 4 and store.stats()["in_flight"] == 0
+
+
+def test_failed_execution_is_not_stored():
+    """Test that a waiter re-executes when the first attempt fails"""
+    store = IdempotencyStore(maxsize=10, ttl=60, wait_seconds=5)
+    attempts = []
+    
+    async def lookup():
+        return None
+    
+    async def run():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="boom")
+        return StoredResponse("fp", 201, b"{}")
+    
+    async def scenario():
+        return await asyncio.gather(
+            store.execute("key", "fp", lookup, run),
+            store.execute("key", "fp", lookup, run),
+            return_exceptions=True
+        )
+    
+    first, second = asyncio.run(scenario())
+    assert isinstance(first, HTTPException)
+    assert second[1] is False and len(attempts) == 2
+
+
+def test_key_stored_by_another_process_rolls_back_order(client, db_session, user_token_headers, order_data):
+    """Test that losing the key insert race creates no order"""
+    from app.schemas.order import OrderCreate
+    from app.services.idempotency_service import IdempotencyService
+    from app.services.order_service import OrderService
+    
+    IdempotencyService.save_response(db_session, 1, "race", StoredResponse("fp", 201, b"{}"))
+    db_session.commit()
+    
+    stored = OrderService.create_order_idempotent(db_session, OrderCreate(**order_data), 1, "race", "fp")
+    assert stored is None
+    assert db_session.query(Order).count() == 0
+
+
+def test_other_integrity_errors_are_not_treated_as_replays(db_session, order_data, monkeypatch):
+    """Test that a constraint failure in the order itself is re-raised"""
+    from sqlalchemy.exc import IntegrityError
+    from app.schemas.order import OrderCreate
+    from app.services.order_service import OrderService
+    
+    def violate_foreign_key(db, orders, menu_items):
+        raise IntegrityError("INSERT INTO order_items", {}, Exception("FOREIGN KEY constraint failed"))
+    
+    monkeypatch.setattr(OrderService, "_insert_order_items", staticmethod(violate_foreign_key))
+    with pytest.raises(IntegrityError, match="FOREIGN KEY"):
+        OrderService.create_order_idempotent(db_session, OrderCreate(**order_data), 1, "fk", "fp")
+    assert db_session.query(IdempotencyKey).count() == 0
+    assert db_session.query(Order).count() == 0
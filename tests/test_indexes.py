@@ -0,0 +1,114 @@
+"""
+Tests for the Alembic migrations and the indexes behind hot query paths
+"""
+from datetime import datetime, timedelta
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, insert, select, text
+from app.db.base import Base
+from app.db.menu_search import include_object
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.user import User
+from app.services.menu_service import MenuService
+from app.services.order_service import OrderService
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """SQLite database built by running every migration up to head"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = Config("alembic.ini")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded_engine(migrated_engine):
+    """Migrated database with enough rows for the planner to prefer indexes"""
+    statuses = ["pending", "confirmed", "preparing", "delivered", "cancelled"]
+    started = datetime(2024, 1, 1)
+    with migrated_engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "x"}
+            for i in range(1, 51)
+        ])
+        connection.execute(insert(MenuItem), [
+            {"id": i, "name": f"Dish {i}", "price": 5.0, "category": f"Category {i % 20}", "is_available": i % 3 != 0}
+            for i in range(1, 201)
+        ])
+        connection.execute(insert(Order), [
+            {
+                "id": i,
+                "user_id": i % 50 + 1,
+                "total_amount": 10.0,
+                "status": statuses[i % len(statuses)],
+                "delivery_address": "1 Test St",
+                "phone_number": "5550000000",
+                "created_at": started + timedelta(minutes=i),
+            }
+            for i in range(1, 2001)
+        ])
+        connection.execute(insert(OrderItem), [
+            {"order_id": i // 2 + 1, "menu_item_id": i % 200 + 1, "quantity": 1, "price": 5.0}
+            for i in range(4000)
+        ])
+        connection.execute(text("ANALYZE"))
+    return migrated_engine
+
+
+def query_plan(engine, statement) -> str:
+    """EXPLAIN QUERY PLAN output for a statement, one detail per line"""
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_match_models(migrated_engine):
+    """Test that upgrading to head produces exactly the schema the models declare"""
+    with migrated_engine.connect() as connection:
+        diff = compare_metadata(
+            MigrationContext.configure(connection, opts={"include_object": include_object}),
+            Base.metadata
+        )
+    assert diff == []
+
+
+def test_user_order_history_uses_index(seeded_engine):
+    """Test that a user's newest-first order page seeks the user/created_at index"""
+    statement = OrderService._paginate(
+        OrderService._filter_orders(select(Order), user_id=7, status=None), skip=0, limit=20, cursor=None
+    )
+    plan = query_plan(seeded_engine, statement)
+    assert "ix_orders_user_id_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_status_feed_uses_index(seeded_engine):
+    """Test that the oldest-first status feed seeks the status/created_at index"""
+    statement = OrderService.orders_by_status_statement("pending").limit(100)
+    plan = query_plan(seeded_engine, statement)
+    assert "ix_orders_status_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_menu_category_filter_uses_index(seeded_engine):
+    """Test that filtering the menu by category and availability uses the composite index"""
+    statement = MenuService._filter_menu_items(select(MenuItem), category="Category 3", available_only=True)
+    plan = query_plan(seeded_engine, statement)
+    assert "ix_menu_items_category_is_available" in plan
+
+
+def test_order_items_lookup_uses_index(seeded_engine):
+    """Test that loading an order's lines uses the order_items.order_id index"""
+    statement = select(OrderItem).where(OrderItem.order_id.in_([10, 11, 12]))
+    plan = query_plan(seeded_engine, statement)
+    assert "ix_order_items_order_id" in plan
@@ -0,0 +1,134 @@
+"""
+Tests for the in-memory kitchen queue
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from app.core.kitchen import KitchenQueue, kitchen_queue
+from app.core.query_budget import capture_queries
+from app.models.order import KITCHEN_STATUSES
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def _order(order_id, minutes, quantity=1, category="Main", status="confirmed"):
+    """Order-like object placed ``minutes`` after T0 with one line"""
+    menu_item = SimpleNamespace(name="Dish", category=category)
+    line = SimpleNamespace(menu_item_id=1, quantity=quantity, menu_item=menu_item)
+    return SimpleNamespace(
+        id=order_id, status=status, created_at=T0 + timedelta(minutes=minutes), order_items=[line]
+    )
+
+
+def _ids(tickets):
+    return [ticket.order_id for ticket in tickets]
+
+
+def test_priority_accounts_for_age_and_prep_time():
+    """Test that orders are ranked by the time they must be started"""
+    queue = KitchenQueue(target_minutes=30, base_prep_minutes=5, prep_minutes_per_item=2)
+    queue.rebuild([
+        _order(1, 0),               # start by 12:23
+        _order(2, 5, quantity=10),  # 12:35 - 25 min = 12:10
+        _order(3, 1),               # 12:24
+        _order(4, 0),               # ties with 1 on start time and age
+    ])
+    assert _ids(queue.peek(10)) == [2, 1, 4, 3]
+    assert _ids(queue.peek(2)) == [2, 1]
+    
+    slow = KitchenQueue(target_minutes=30, category_prep_minutes={"Grill": 20})
+    slow.rebuild([_order(1, 0), _order(2, 10, category="Grill")])
+    assert _ids(slow.peek(2)) == [2, 1]
+
+
+def test_update_reprioritises_and_removes():
+    """Test that status transitions move orders into, within and out of the queue"""
+    queue = KitchenQueue()
+    queue.rebuild([_order(index, index) for index in range(1, 6)])
+    
+    queue.update(_order(5, 5, quantity=20), KITCHEN_STATUSES)
+    queue.update(_order(1, 1, status="delivered"), KITCHEN_STATUSES)
+    queue.update(_order(6, 6, status="pending"), KITCHEN_STATUSES)
+    assert _ids(queue.peek(10)) == [5, 2, 3, 4]
+    assert len(queue) == 4 and 1 not in queue and 6 not in queue
+    
+    for order_id in (2, 3, 4):
+        queue.remove(order_id)
+    assert _ids(queue.peek(10)) == [5]
+    # Removed entries are compacted away once they outnumber live ones
+    assert queue.stats()["heap_size"] < 6
+
+
+def test_loads_on_successive_event_loops():
+    """Test that the load lock is not tied to the loop the queue was built on"""
+    queue = KitchenQueue(resync_seconds=0)
+    
+    async def load():
+        return [_order(1, 0)]
+    
+    for _ in range(2):
+        asyncio.run(queue.ensure_loaded(load))
+    assert queue.loads == 2 and _ids(queue.peek(1)) == [1]
+
+
+@pytest.fixture
+def menu_id(menu_items):
+    return menu_items({"name": "Curry", "price": 9.0})[0]
+
+
+def _place(client, headers, menu_id, quantity):
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "delivery_address": "5 Kitchen Ln",
+            "phone_number": "5550005555",
+            "items": [{"menu_item_id": menu_id, "quantity": quantity}]
+        },
+        headers=headers
+    )
+    return response.json()["id"]
+
+
+def test_kitchen_queue_endpoint_tracks_status_changes(client, user_token_headers, superuser_token_headers, menu_id):
+    """Test that the queue endpoint follows status updates without querying orders"""
+    small = _place(client, user_token_headers, menu_id, 1)
+    large = _place(client, user_token_headers, menu_id, 8)
+    pending = _place(client, user_token_headers, menu_id, 2)
+    client.patch(f"/api/v1/orders/{small}/status?status=confirmed", headers=superuser_token_headers)
+    
+    response = client.get("/api/v1/kitchen/queue", headers=superuser_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [order["order_id"] for order in response.json()["orders"]] == [small]
+    
+    client.patch(f"/api/v1/orders/{large}/status?status=preparing", headers=superuser_token_headers)
+    with capture_queries() as capture:
+        response = client.get("/api/v1/kitchen/queue?limit=5", headers=superuser_token_headers)
+    data = response.json()
+    assert [order["order_id"] for order in data["orders"]] == [large, small]
+    assert data["total"] == 2
+    assert data["orders"][0]["items"][0] == {"menu_item_id": menu_id, "name": "Curry", "quantity": 8}
+    assert not any("FROM orders" in statement for statement, _ in capture.statements)
+    
+    client.patch(f"/api/v1/orders/{large}/status?status=delivered", headers=superuser_token_headers)
+    client.delete(f"/api/v1/orders/{small}", headers=superuser_token_headers)
+    data = client.get("/api/v1/kitchen/queue", headers=superuser_token_headers).json()
+    assert data == {"orders": [], "total": 0}
+    assert pending not in kitchen_queue
+
+
+def test_kitchen_queue_loads_existing_orders(client, db_session, user_token_headers, superuser_token_headers, menu_id):
+    """Test that an unloaded queue is rebuilt from the database on first read"""
+    order_id = _place(client, user_token_headers, menu_id, 1)
+    client.patch(f"/api/v1/orders/{order_id}/status?status=confirmed", headers=superuser_token_headers)
+    kitchen_queue.clear()
+    
+    data = client.get("/api/v1/kitchen/queue", headers=superuser_token_headers).json()
+    assert [order["order_id"] for order in data["orders"]] == [order_id]
+
+
+def test_kitchen_queue_requires_superuser(client, user_token_headers):
+    """Test that regular users cannot read the kitchen queue"""
+    response = client.get("/api/v1/kitchen/queue", headers=user_token_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
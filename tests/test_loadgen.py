@@ -0,0 +1,58 @@
+"""
+Tests for the scenario-driven load generator
+"""
+import asyncio
+import httpx
+import pytest
+from benchmarks.loadgen import Scenario, run_scenario
+from app.main import app
+
+
+def _scenario(**overrides):
+    data = {
+        "name": "smoke",
+        "users": {"username": "customer", "password": "customerpass123", "count": 1},
+        "admin": {"username": "manager", "password": "managerpass123"},
+        "think_time_seconds": [0.01, 0.02],
+        "stages": [{"duration": 0.4, "target": 2}, {"duration": 0.6, "target": 2}],
+        "mix": {"browse_menu": 3, "search_menu": 1, "place_order": 2, "poll_status": 2, "admin_advance": 1},
+    }
+    data.update(overrides)
+    return Scenario(data)
+
+
+def test_scenario_ramps_linearly_between_stage_targets():
+    """Test the virtual user count at points of a ramp profile"""
+    scenario = _scenario(stages=[{"duration": 10, "target": 20}, {"duration": 10, "target": 0}])
+    assert scenario.target_at(0) == (0, 0)
+    assert scenario.target_at(5) == (0, 10)
+    assert scenario.target_at(15) == (1, 10)
+    assert scenario.target_at(25) == (1, 0)
+    assert scenario.duration == 20 and scenario.peak_users == 20
+
+
+def test_scenario_rejects_unknown_actions():
+    """Test validation of the action mix"""
+    with pytest.raises(ValueError, match="Unknown actions in mix: refund"):
+        _scenario(mix={"refund": 1})
+
+
+def test_run_reports_every_endpoint_in_the_mix(client, user_token_headers, superuser_token_headers):
+    """Test a short in-process run covering browsing, ordering and status changes"""
+    for name, category in (("Margherita Pizza", "Pizza"), ("Caesar Salad", "Salads")):
+        client.post(
+            "/api/v1/menu/",
+            json={"name": name, "description": "Fresh", "price": 9.5, "category": category},
+            headers=superuser_token_headers
+        )
+    
+    summary = asyncio.run(run_scenario(
+        _scenario(), "http://loadgen.test", transport=httpx.ASGITransport(app=app)
+    ))
+    
+    assert summary["total"]["requests"] > 0
+    assert summary["total"]["errors"] == {}
+    assert {"GET /menu/", "GET /menu/{id}", "POST /auth/token", "POST /orders/"} <= set(summary["endpoints"])
+    orders = summary["endpoints"]["POST /orders/"]
+    assert orders["p50_ms"] <= orders["p99_ms"] <= orders["max_ms"]
+    assert set(summary["stages"]) <= {"0", "1"}
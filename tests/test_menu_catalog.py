@@ -0,0 +1,126 @@
+"""
+Tests for the in-process menu catalog
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from fastapi import status
+from app.core.catalog import CatalogSnapshot, MenuCatalog, menu_catalog
+from app.core.query_budget import capture_queries
+from app.models.menu_item import MenuItem
+
+
+def make_item(item_id, category, is_available=True):
+    return SimpleNamespace(id=item_id, category=category, is_available=is_available)
+
+
+def test_snapshot_views():
+    """Test the precomputed category and availability views"""
+    snapshot = CatalogSnapshot(3, [
+        make_item(4, "Pizza"), make_item(1, "Drinks", False), make_item(2, "Pizza", False), make_item(3, "Drinks")
+    ])
+    
+    assert snapshot.version == 3
+    assert snapshot.categories == ("Drinks", "Pizza")
+    assert [item.id for item in snapshot.view().items] == [1, 2, 3, 4]
+    assert [item.id for item in snapshot.view(available_only=True).items] == [3, 4]
+    assert [item.id for item in snapshot.view("Pizza").items] == [2, 4]
+    assert [item.id for item in snapshot.view("Pizza", True).items] == [4]
+    assert len(snapshot.view("Soup")) == 0
+    assert [item.id for item in snapshot.view().after(2, 1)] == [3]
+    assert snapshot.get(2).category == "Pizza"
+    with pytest.raises(TypeError):
+        snapshot.by_id[5] = make_item(5, "Soup")
+
+
+@pytest.fixture
+def menu_ids(menu_items):
+    """A few menu items across two categories"""
+    return menu_items(
+        {"name": "Margherita", "description": "Classic", "price": 9.5, "category": "Pizza"},
+        {"name": "Lemonade", "description": "Fresh", "price": 3.0, "category": "Drinks", "is_available": False},
+        {"name": "Pepperoni", "description": "Spicy", "price": 11.0, "category": "Pizza"},
+    )
+
+
+def test_reads_are_served_from_memory(client, menu_ids, monkeypatch):
+    """Test that repeated menu reads issue no SQL once the catalog is loaded"""
+    monkeypatch.setattr(menu_catalog, "check_interval", 60.0)
+    client.get("/api/v1/menu/")
+    
+    with capture_queries() as capture:
+        listing = client.get("/api/v1/menu/", params={"category": "Pizza", "available_only": True})
+        categories = client.get("/api/v1/menu/categories")
+        item = client.get(f"/api/v1/menu/{menu_ids[1]}")
+        missing = client.get("/api/v1/menu/99999")
+    
+    assert capture.count == 0, capture.report()
+    assert [entry["name"] for entry in listing.json()["items"]] == ["Margherita", "Pepperoni"]
+    assert listing.json()["total"] == 2
+    assert categories.json() == ["Drinks", "Pizza"]
+    assert item.json()["name"] == "Lemonade"
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_writes_bump_the_version(client, superuser_token_headers, menu_ids):
+    """Test that create, update and delete make the next read reload the catalog"""
+    client.get("/api/v1/menu/")
+    version = menu_catalog.version
+    
+    client.put(f"/api/v1/menu/{menu_ids[1]}", json={"is_available": True}, headers=superuser_token_headers)
+    assert menu_catalog.version == version + 1
+    data = client.get("/api/v1/menu/", params={"available_only": True}).json()
+    assert data["total"] == 3
+    
+    client.delete(f"/api/v1/menu/{menu_ids[0]}", headers=superuser_token_headers)
+    client.post(
+        "/api/v1/menu/",
+        json={"name": "Soup", "description": "Hot", "price": 5.0, "category": "Starters"},
+        headers=superuser_token_headers
+    )
+    assert menu_catalog.version == version + 3
+    assert client.get(f"/api/v1/menu/{menu_ids[0]}").status_code == status.HTTP_404_NOT_FOUND
+    assert client.get("/api/v1/menu/categories").json() == ["Drinks", "Pizza", "Starters"]
+
+
+def test_cursor_pages_from_catalog(client, menu_ids):
+    """Test keyset cursors over a catalog view"""
+    first = client.get("/api/v1/menu/", params={"limit": 2})
+    cursor = first.json()["next_cursor"]
+    second = client.get("/api/v1/menu/", params={"limit": 2, "cursor": cursor})
+    
+    assert [entry["id"] for entry in second.json()["items"]] == [menu_ids[2]]
+    assert second.json()["next_cursor"] is None
+    assert client.get("/api/v1/menu/", params={"cursor": "garbage"}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_marker_change_reloads_snapshot():
+    """Test that a changed database marker reloads, in whichever event loop reads"""
+    catalog = MenuCatalog(ttl=60.0, check_interval=0.0)
+    marker_value = [1]
+    
+    async def load():
+        return [make_item(1, "Pizza")]
+    
+    async def marker():
+        return marker_value[0]
+    
+    asyncio.run(catalog.get(load, marker))
+    asyncio.run(catalog.get(load, marker))
+    assert (catalog.loads, catalog.hits) == (1, 1)
+    
+    marker_value[0] = 2
+    asyncio.run(catalog.get(load, marker))
+    assert catalog.loads == 2
+
+
+def test_writes_on_other_workers_are_noticed(client, db_session, menu_ids, monkeypatch):
+    """Test that a menu write that did not bump this worker's version is still picked up"""
+    monkeypatch.setattr(menu_catalog, "check_interval", 0.0)
+    client.get("/api/v1/menu/")
+    
+    # Written directly, as another worker process would
+    db_session.query(MenuItem).filter(MenuItem.id == menu_ids[0]).update({"name": "Marinara"})
+    db_session.commit()
+    
+    assert client.get(f"/api/v1/menu/{menu_ids[0]}").json()["name"] == "Marinara"
@@ -0,0 +1,75 @@
+"""
+Tests for ranked menu search
+"""
+import pytest
+from fastapi import status
+
+
+@pytest.fixture
+def menu_ids(menu_items):
+    """Menu items whose names and descriptions mention chicken to varying degrees"""
+    items = [
+        {"name": "Beef Burger", "description": "Served with a side of chicken wings", "price": 10.99, "category": "Main"},
+        {"name": "Chicken Pizza", "description": "Pizza topped with chicken", "price": 15.99, "category": "Pizza"},
+        {"name": "Garden Salad", "description": "Fresh greens", "price": 6.5, "category": "Salad"},
+        {"name": "Chicken Wings", "description": "Spicy wings", "price": 8.99, "category": "Appetizer"},
+    ]
+    return dict(zip((item["name"] for item in items), menu_items(*items)))
+
+
+def search(client, term, **params):
+    response = client.get("/api/v1/menu/", params={"search": term, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def test_search_ranks_name_matches_first(client, menu_ids):
+    """Test that items named after the term outrank description-only matches"""
+    data = search(client, "chicken")
+    names = [item["name"] for item in data["items"]]
+    assert data["total"] == 3
+    assert set(names[:2]) == {"Chicken Pizza", "Chicken Wings"}
+    assert names[2] == "Beef Burger"
+
+
+def test_search_matches_word_prefixes_and_stems(client, menu_ids):
+    """Test that partial words and inflections still match"""
+    assert [item["name"] for item in search(client, "gard")["items"]] == ["Garden Salad"]
+    assert {item["name"] for item in search(client, "wing")["items"]} == {"Chicken Wings", "Beef Burger"}
+
+
+def test_search_requires_every_word(client, menu_ids):
+    """Test that multi-word searches narrow the results"""
+    data = search(client, "chicken pizza")
+    assert [item["name"] for item in data["items"]] == ["Chicken Pizza"]
+    assert data["total"] == 1
+
+
+def test_search_ignores_query_syntax(client, menu_ids):
+    """Test that FTS operators and quotes in the term are treated as plain text"""
+    assert search(client, '"')["total"] == 0
+    assert search(client, "chicken OR -salad*")["total"] == 0
+    assert search(client, "chicken:")["total"] == 3
+
+
+def test_search_index_follows_updates_and_deletes(client, superuser_token_headers, menu_ids):
+    """Test that renaming or deleting an item updates the search index"""
+    client.put(
+        f"/api/v1/menu/{menu_ids['Garden Salad']}",
+        json={"name": "Chicken Caesar Salad"},
+        headers=superuser_token_headers
+    )
+    client.delete(f"/api/v1/menu/{menu_ids['Chicken Wings']}", headers=superuser_token_headers)
+    
+    assert search(client, "garden")["total"] == 0
+    names = {item["name"] for item in search(client, "chicken")["items"]}
+    assert names == {"Chicken Pizza", "Chicken Caesar Salad", "Beef Burger"}
+
+
+def test_search_pagination(client, menu_ids):
+    """Test that skip/limit page through ranked results"""
+    first = search(client, "chicken", limit=2)
+    second = search(client, "chicken", skip=2, limit=2)
+    assert len(first["items"]) == 2
+    assert [item["name"] for item in second["items"]] == ["Beef Burger"]
+    assert second["page"] == 2
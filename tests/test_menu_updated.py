@@ -31,7 +31,8 @@ def test_get_menu_items(client):
     assert response.status_code == status.HTTP_200_OK
     
     data = response.json()
-    assert isinstance(data, list)
+    assert isinstance(data["items"], list)
+    assert data["total"] == len(data["items"])
 
 
 def test_get_menu_item(client, auth_headers):
@@ -0,0 +1,83 @@
+"""
+Tests for request and database metrics
+"""
+from fastapi import status
+from sqlalchemy import create_engine
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    db_pool_checkout_duration,
+    http_request_db_statements,
+    http_request_duration,
+    instrument_engine,
+    registry,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the Prometheus text format of a labelled histogram"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, ("/a",))
+    
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 4.25' in lines
+
+
+def test_stats_gauge_exports_numeric_values():
+    """Test that a subsystem stats() dict becomes a labelled gauge"""
+    registry = MetricsRegistry()
+    registry.stats_gauge("app_cache", "Cache", lambda: {"hits": 3, "enabled": True, "nested": {}})
+    assert 'app_cache{stat="hits"} 3' in registry.render()
+    assert "enabled" not in registry.render()
+
+
+def test_requests_record_route_latency_and_statements(client, user_token_headers):
+    """Test that requests are labelled by route template and count their SQL"""
+    route = ("GET", "/api/v1/orders/{order_id}")
+    before_count = http_request_duration.count(route + ("4xx",))
+    before_statements = http_request_db_statements.sum(route)
+    
+    for order_id in (101, 102):
+        response = client.get(f"/api/v1/orders/{order_id}", headers=user_token_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    assert http_request_duration.count(route + ("4xx",)) == before_count + 2
+    assert http_request_db_statements.count(route) >= 2
+    assert http_request_db_statements.sum(route) > before_statements
+
+
+def test_metrics_endpoint_exports_prometheus_text(client, user_token_headers):
+    """Test that /metrics serves every metric family in text format"""
+    client.get("/api/v1/orders/", headers=user_token_headers)
+    response = client.get("/metrics")
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/orders/",status="2xx"}' in body
+    assert 'db_statements_total{engine="test"}' in body
+    assert "# TYPE db_pool_checkout_duration_seconds histogram" in body
+    assert 'app_auth_rate_limit_ip{stat="allowed"}' in body
+    assert "/orders/1" not in body
+
+
+def test_pool_metrics_survive_engine_dispose(tmp_path):
+    """Test that checkout timing and pool gauges follow the pool dispose() installs"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    instrument_engine(engine, "disposable")
+    labels = ("disposable",)
+    
+    with engine.connect():
+        assert db_pool_checkout_duration.count(labels) == 1
+    engine.dispose()
+    with engine.connect():
+        assert db_pool_checkout_duration.count(labels) == 2
+        assert 'db_pool_connections_in_use{engine="disposable"} 1' in registry.render()
+    engine.dispose()
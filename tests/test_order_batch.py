@@ -0,0 +1,106 @@
+"""
+Tests for bulk order submission
+"""
+import pytest
+from fastapi import status
+from sqlalchemy.exc import OperationalError
+from app.core.query_budget import capture_queries
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def menu_ids(client, superuser_token_headers, menu_items):
+    """Two available menu items and one unavailable one"""
+    ids = menu_items(
+        {"name": "Soup", "price": 4.0},
+        {"name": "Salad", "price": 6.0},
+        {"name": "Stew", "price": 9.0},
+        category="Lunch",
+    )
+    client.put(f"/api/v1/menu/{ids[2]}", json={"is_available": False}, headers=superuser_token_headers)
+    return ids
+
+
+def _order(*items):
+    return {
+        "delivery_address": "9 Batch St",
+        "phone_number": "5550003333",
+        "items": [{"menu_item_id": item_id, "quantity": quantity} for item_id, quantity in items]
+    }
+
+
+def test_batch_creates_all_orders(client, user_token_headers, menu_ids):
+    """Test that a fully valid batch creates every order"""
+    orders = [_order((menu_ids[0], 1), (menu_ids[1], 2)) for _ in range(10)]
+    
+    response = client.post("/api/v1/orders/batch", json={"orders": orders}, headers=user_token_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["created"] == 10 and data["failed"] == 0
+    assert [result["index"] for result in data["results"]] == list(range(10))
+    first = data["results"][0]["order"]
+    assert first["total_amount"] == pytest.approx(16.0)
+    assert len(first["order_items"]) == 2
+    
+    history = client.get("/api/v1/orders/", headers=user_token_headers).json()
+    assert history["total"] == 10
+
+
+def test_batch_reports_partial_failures(client, user_token_headers, menu_ids):
+    """Test per-order failure reporting for invalid payloads and unavailable items"""
+    orders = [
+        _order((menu_ids[0], 1)),
+        _order((menu_ids[2], 1)),
+        {"delivery_address": "", "phone_number": "5550003333", "items": []},
+        _order((menu_ids[1], 3)),
+    ]
+    
+    response = client.post(
+        "/api/v1/orders/batch?chunk_size=1", json={"orders": orders}, headers=user_token_headers
+    )
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    data = response.json()
+    assert data["created"] == 2 and data["failed"] == 2
+    results = data["results"]
+    assert results[0]["success"] and results[3]["success"]
+    assert results[3]["order"]["total_amount"] == pytest.approx(18.0)
+    assert "not available" in results[1]["error"]
+    assert results[2]["error"].startswith("delivery_address")
+
+
+def test_batch_keeps_committed_chunks_when_a_later_chunk_fails(client, user_token_headers, menu_ids, monkeypatch):
+    """Test that orders from earlier chunks are reported after a later chunk rolls back"""
+    record_orders = AnalyticsService.record_orders
+    calls = []
+    
+    def fail_second_chunk(db, orders):
+        calls.append(len(orders))
+        if len(calls) == 2:
+            raise OperationalError("INSERT INTO sales_deltas", {}, Exception("disk full"))
+        record_orders(db, orders)
+    
+    monkeypatch.setattr(AnalyticsService, "record_orders", staticmethod(fail_second_chunk))
+    orders = [_order((menu_ids[0], 1)), _order((menu_ids[1], 2))]
+    
+    response = client.post(
+        "/api/v1/orders/batch?chunk_size=1", json={"orders": orders}, headers=user_token_headers
+    )
+    assert response.status_code == status.HTTP_207_MULTI_STATUS
+    first, second = response.json()["results"]
+    assert first["success"] and first["order"]["total_amount"] == pytest.approx(4.0)
+    assert len(first["order"]["order_items"]) == 1
+    assert not second["success"] and second["error"] == "Order could not be saved"
+    assert client.get("/api/v1/orders/", headers=user_token_headers).json()["total"] == 1
+
+
+def test_batch_statement_count_does_not_grow_with_items(client, user_token_headers, menu_ids):
+    """Test that menu lookups and item inserts are shared across the batch"""
+    client.get("/api/v1/orders/", headers=user_token_headers)  # warm auth state
+    orders = [_order((menu_ids[0], 1), (menu_ids[1], 1)) for _ in range(5)]
+    
+    with capture_queries() as capture:
+        response = client.post("/api/v1/orders/batch", json={"orders": orders}, headers=user_token_headers)
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    assert sum("FROM menu_items" in statement for statement, _ in capture.statements) == 1
+    assert sum(statement.startswith("INSERT INTO order_items") for statement, _ in capture.statements) == 1
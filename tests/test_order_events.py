@@ -0,0 +1,169 @@
+"""
+Tests for live order events (pub/sub, SSE and the kitchen WebSocket)
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+from fastapi import status
+from starlette.websockets import WebSocketDisconnect
+from app.core.events import EventBroker, order_events, order_topic
+
+
+def test_broker_routes_events_by_topic():
+    """Test that subscribers only see events for their topics"""
+    async def scenario():
+        broker = EventBroker(max_queue_size=10)
+        with broker.subscribe("a") as first, broker.subscribe("a", "b") as second:
+            assert broker.publish(["b"], {"n": 1}) == 1
+            assert broker.publish(["a", "b"], {"n": 2}) == 2
+            return [await first.get(timeout=1)], [await second.get(timeout=1), await second.get(timeout=1)]
+    
+    first, second = asyncio.run(scenario())
+    assert first == [{"n": 2}]
+    assert second == [{"n": 1}, {"n": 2}]
+
+
+def test_broker_evicts_slow_consumers():
+    """Test that a subscriber whose queue overflows is dropped, not waited on"""
+    async def scenario():
+        broker = EventBroker(max_queue_size=2)
+        slow = broker.subscribe("a")
+        for n in range(3):
+            broker.publish(["a"], {"n": n})
+        return broker, slow, await slow.get(timeout=1)
+    
+    broker, slow, event = asyncio.run(scenario())
+    assert event is None
+    assert slow.close_reason == "slow consumer"
+    assert broker.subscriber_count("a") == 0
+    assert broker.evicted == 1
+
+
+def test_broker_accepts_events_from_other_threads():
+    """Test publishing from a thread other than the subscriber's loop"""
+    async def scenario():
+        broker = EventBroker()
+        with broker.subscribe("a") as subscription:
+            threading.Thread(target=broker.publish, args=(["a"], {"n": 1})).start()
+            return await subscription.get(timeout=2)
+    
+    assert asyncio.run(scenario()) == {"n": 1}
+
+
+@pytest.fixture
+def order_id(client, user_token_headers, menu_items):
+    """A pending order placed by the regular user"""
+    menu_id, = menu_items({"name": "Curry", "description": "Hot", "price": 9.0, "category": "Mains"})
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "delivery_address": "2 Spice Rd",
+            "phone_number": "5550004444",
+            "items": [{"menu_item_id": menu_id, "quantity": 1}]
+        },
+        headers=user_token_headers
+    )
+    return response.json()["id"]
+
+
+def _token(headers):
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def _set_status_when_subscribed(client, headers, order_id, new_status):
+    """Change the order status from another thread once a stream is listening"""
+    def run():
+        deadline = time.monotonic() + 5
+        while order_events.subscriber_count(order_topic(order_id)) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client.patch(f"/api/v1/orders/{order_id}/status", params={"status": new_status}, headers=headers)
+    
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _sse_events(body):
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.splitlines() if line.startswith("data: ")
+    ]
+
+
+def test_sse_streams_status_changes_until_completed(client, user_token_headers, superuser_token_headers, order_id):
+    """Test that the order event stream pushes changes and ends on completion"""
+    thread = _set_status_when_subscribed(client, superuser_token_headers, order_id, "delivered")
+    response = client.get(f"/api/v1/orders/{order_id}/events", params={"access_token": _token(user_token_headers)})
+    thread.join()
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [event["event"] for event in events] == ["order.snapshot", "order.status_changed"]
+    assert events[0]["status"] == "pending"
+    assert events[1]["status"] == "delivered"
+    assert events[1]["previous_status"] == "pending"
+    assert order_events.subscriber_count(order_topic(order_id)) == 0
+
+
+def test_sse_rejects_other_users_orders(client, order_id):
+    """Test that streams require authentication and ownership"""
+    assert client.get(f"/api/v1/orders/{order_id}/events").status_code == status.HTTP_401_UNAUTHORIZED
+    
+    client.post(
+        "/api/v1/auth/register",
+        json={"username": "stranger", "email": "stranger@example.com", "password": "strangerpass1"}
+    )
+    token = client.post(
+        "/api/v1/auth/token", data={"username": "stranger", "password": "strangerpass1"}
+    ).json()["access_token"]
+    response = client.get(f"/api/v1/orders/{order_id}/events", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert order_events.subscriber_count(order_topic(order_id)) == 0
+
+
+def test_kitchen_websocket_receives_order_events(client, user_token_headers, superuser_token_headers, order_id):
+    """Test that kitchen screens get new orders and status changes pushed"""
+    token = _token(superuser_token_headers)
+    with client.websocket_connect(f"/api/v1/orders/ws/kitchen?access_token={token}&status=pending") as websocket:
+        client.patch(
+            f"/api/v1/orders/{order_id}/status", params={"status": "preparing"}, headers=superuser_token_headers
+        )
+        event = websocket.receive_json()
+    
+    assert event["event"] == "order.status_changed"
+    assert event["order_id"] == order_id
+    assert (event["previous_status"], event["status"]) == ("pending", "preparing")
+
+
+def test_kitchen_websocket_receives_new_orders(client, user_token_headers, superuser_token_headers, menu_items):
+    """Test that the unfiltered kitchen feed gets created orders as JSON"""
+    menu_id, = menu_items({"name": "Dal", "price": 7.25})
+    token = _token(superuser_token_headers)
+    with client.websocket_connect(f"/api/v1/orders/ws/kitchen?access_token={token}") as websocket:
+        response = client.post(
+            "/api/v1/orders/",
+            json={
+                "delivery_address": "2 Spice Rd",
+                "phone_number": "5550004444",
+                "items": [{"menu_item_id": menu_id, "quantity": 2}]
+            },
+            headers=user_token_headers
+        )
+        event = websocket.receive_json()
+    
+    assert event["event"] == "order.created"
+    assert event["order_id"] == response.json()["id"]
+    assert (event["status"], event["total_amount"]) == ("pending", 14.5)
+
+
+def test_kitchen_websocket_requires_superuser(client, user_token_headers):
+    """Test that non-admin tokens are refused"""
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(
+            f"/api/v1/orders/ws/kitchen?access_token={_token(user_token_headers)}"
+        ) as websocket:
+            websocket.receive_json()
+    assert exc_info.value.code == 1008
@@ -0,0 +1,77 @@
+"""
+Tests for the statement cost of order operations
+"""
+from contextlib import contextmanager
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from tests.conftest import async_engine
+
+
+@contextmanager
+def capture_statements():
+    """Collect SQL statements issued through the async test engine"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def menu_item_ids(menu_items):
+    """Fifteen menu items to order from"""
+    return menu_items(*(f"Dish {index}" for index in range(15)), price=2.5, category="Catering")
+
+
+@pytest.mark.parametrize("line_count", [1, 5, 15])
+def test_create_order_statement_count_is_constant(client, user_token_headers, menu_item_ids, line_count):
+    """Test that order creation costs the same statements for any number of lines"""
+    client.get("/api/v1/orders/", headers=user_token_headers)  # warm auth state
+    order_data = {
+        "delivery_address": "1 Catering Rd",
+        "phone_number": "5550002222",
+        "items": [{"menu_item_id": item_id, "quantity": 2} for item_id in menu_item_ids[:line_count]]
+    }
+    
+    with capture_statements() as statements:
+        response = client.post("/api/v1/orders/", json=order_data, headers=user_token_headers)
+    
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert len(data["order_items"]) == line_count
+    assert data["total_amount"] == pytest.approx(5.0 * line_count)
+    assert all(item["menu_item"]["category"] == "Catering" for item in data["order_items"])
+    # SELECT menu items IN (...), INSERT order, multi-row INSERT order items,
+    # INSERT sales delta (rollups are folded later)
+    assert len(statements) == 4
+
+
+def test_create_order_skips_unavailable_and_unknown_items(client, user_token_headers, superuser_token_headers, menu_item_ids):
+    """Test that unavailable or missing menu items are left out of the order"""
+    client.put(
+        f"/api/v1/menu/{menu_item_ids[1]}", json={"is_available": False}, headers=superuser_token_headers
+    )
+    order_data = {
+        "delivery_address": "1 Catering Rd",
+        "phone_number": "5550002222",
+        "items": [
+            {"menu_item_id": menu_item_ids[0], "quantity": 1},
+            {"menu_item_id": menu_item_ids[1], "quantity": 1},
+            {"menu_item_id": 99999, "quantity": 1}
+        ]
+    }
+    
+    response = client.post("/api/v1/orders/", json=order_data, headers=user_token_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert [item["menu_item_id"] for item in data["order_items"]] == [menu_item_ids[0]]
+    assert data["total_amount"] == pytest.approx(2.5)
+    
+    fetched = client.get(f"/api/v1/orders/{data['id']}", headers=user_token_headers).json()
+    assert fetched["order_items"] == data["order_items"]
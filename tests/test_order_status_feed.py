@@ -0,0 +1,49 @@
+"""
+Tests for the order status feed (paginated and NDJSON streaming)
+"""
+import json
+import pytest
+from fastapi import status
+from app.core.config import settings
+
+
+@pytest.fixture
+def pending_order_ids(client, user_token_headers, superuser_token_headers, menu_items):
+    """Seven pending orders and one confirmed order"""
+    menu_id, = menu_items({"name": "Pho", "description": "Beef", "price": 11.0, "category": "Soup"})
+    order = {
+        "delivery_address": "3 Kitchen Sq",
+        "phone_number": "5550005555",
+        "items": [{"menu_item_id": menu_id, "quantity": 1}]
+    }
+    results = client.post(
+        "/api/v1/orders/batch", json={"orders": [order] * 8}, headers=user_token_headers
+    ).json()["results"]
+    ids = [result["order"]["id"] for result in results]
+    client.patch(f"/api/v1/orders/{ids[-1]}/status", params={"status": "confirmed"}, headers=superuser_token_headers)
+    return ids[:-1]
+
+
+def test_status_feed_honors_skip_and_limit(client, superuser_token_headers, pending_order_ids):
+    """Test that the status endpoint pages instead of returning everything"""
+    response = client.get(
+        "/api/v1/orders/status/pending", params={"skip": 2, "limit": 3}, headers=superuser_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [order["id"] for order in response.json()] == pending_order_ids[2:5]
+
+
+def test_status_feed_streams_ndjson(client, superuser_token_headers, pending_order_ids, monkeypatch):
+    """Test that stream mode emits every matching order as one JSON line each"""
+    monkeypatch.setattr(settings, "ORDER_STREAM_BATCH_SIZE", 2)
+    
+    response = client.get(
+        "/api/v1/orders/status/pending", params={"stream": True, "limit": 1}, headers=superuser_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert [order["id"] for order in orders] == pending_order_ids
+    assert all(order["status"] == "pending" for order in orders)
+    assert orders[0]["order_items"][0]["menu_item"]["name"] == "Pho"
@@ -46,7 +46,7 @@ def test_get_orders(client, auth_headers):
     assert response.status_code == status.HTTP_200_OK
     
     data = response.json()
-    assert isinstance(data, list)
+    assert isinstance(data["orders"], list)
 
 
 def test_get_order(client, auth_headers):
@@ -141,7 +141,7 @@ def test_get_order_history(client, auth_headers):
     assert response.status_code == status.HTTP_200_OK
     
     data = response.json()
-    assert isinstance(data, list)
+    assert isinstance(data["orders"], list)
 
 
 def test_order_validation(client, auth_headers):
@@ -0,0 +1,111 @@
+"""
+Tests for keyset (cursor) pagination
+"""
+import pytest
+from fastapi import status
+
+
+@pytest.fixture
+def menu_id(menu_items):
+    return menu_items({"name": "Taco", "price": 3.0, "category": "Mexican"})[0]
+
+
+def _place_orders(client, headers, menu_id, count):
+    order = {
+        "delivery_address": "5 Cursor Ln",
+        "phone_number": "5550004444",
+        "items": [{"menu_item_id": menu_id, "quantity": 1}]
+    }
+    response = client.post("/api/v1/orders/batch", json={"orders": [order] * count}, headers=headers)
+    return [result["order"]["id"] for result in response.json()["results"]]
+
+
+def _walk(client, url, headers=None, limit=3):
+    """Follow next_cursor until exhausted, returning all IDs and page count"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        ids.extend(item["id"] for item in body.get("orders", body.get("items")))
+        pages += 1
+        cursor = body["next_cursor"]
+        assert response.headers.get("X-Next-Cursor") == cursor
+        if not cursor:
+            return ids, pages
+
+
+def test_order_cursor_walks_every_order_once(client, user_token_headers, menu_id):
+    """Test that cursors cover all orders, newest first, even with equal timestamps"""
+    created = _place_orders(client, user_token_headers, menu_id, 7)
+    
+    ids, pages = _walk(client, "/api/v1/orders/", user_token_headers)
+    assert ids == sorted(created, reverse=True)
+    assert pages == 3
+    
+    history_ids, _ = _walk(client, "/api/v1/orders/history", user_token_headers)
+    assert history_ids == ids
+
+
+def test_order_cursor_is_stable_while_orders_arrive(client, user_token_headers, menu_id):
+    """Test that new orders do not shift rows between cursor pages"""
+    created = _place_orders(client, user_token_headers, menu_id, 4)
+    
+    first = client.get("/api/v1/orders/", params={"limit": 2}, headers=user_token_headers)
+    _place_orders(client, user_token_headers, menu_id, 2)
+    second = client.get(
+        "/api/v1/orders/",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+        headers=user_token_headers
+    )
+    
+    seen = [order["id"] for order in first.json()["orders"] + second.json()["orders"]]
+    assert seen == sorted(created, reverse=True)
+
+
+def test_menu_cursor_and_skip_limit(client, superuser_token_headers):
+    """Test menu cursor pagination alongside the legacy skip/limit parameters"""
+    for index in range(5):
+        client.post(
+            "/api/v1/menu/",
+            json={"name": f"Item {index}", "description": "Test", "price": 1.0, "category": "Misc"},
+            headers=superuser_token_headers
+        )
+    
+    ids, _ = _walk(client, "/api/v1/menu/", limit=2)
+    assert ids == sorted(ids) and len(ids) == 5
+    
+    legacy = client.get("/api/v1/menu/", params={"skip": 2, "limit": 2}).json()
+    assert [item["id"] for item in legacy["items"]] == ids[2:4]
+    assert legacy["page"] == 2 and legacy["total"] == 5
+
+
+def test_invalid_cursor_is_rejected(client, user_token_headers):
+    """Test that a malformed cursor returns 400"""
+    response = client.get("/api/v1/orders/", params={"cursor": "not-a-cursor"}, headers=user_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    response = client.get("/api/v1/menu/", params={"cursor": "e30"})  # "{}"
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_order_list_envelope_totals(client, user_token_headers, superuser_token_headers, menu_id):
+    """Test exact totals for users and the admin-wide total"""
+    _place_orders(client, user_token_headers, menu_id, 3)
+    _place_orders(client, superuser_token_headers, menu_id, 2)
+    
+    mine = client.get("/api/v1/orders/", params={"limit": 2}, headers=user_token_headers).json()
+    assert mine["total"] == 3 and mine["total_is_estimate"] is False
+    assert mine["page"] == 1 and mine["size"] == 2 and len(mine["orders"]) == 2
+    
+    # SQLite has no planner estimate, so the admin total falls back to exact
+    everything = client.get("/api/v1/orders/", headers=superuser_token_headers).json()
+    assert everything["total"] == 5
+    
+    pending = client.get(
+        "/api/v1/orders/", params={"status_filter": "delivered"}, headers=superuser_token_headers
+    ).json()
+    assert pending["total"] == 0 and pending["orders"] == []
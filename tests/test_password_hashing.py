@@ -0,0 +1,62 @@
+"""
+Tests for the bounded password hashing pool
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException, status
+from app.core.hashing import PasswordHasher, password_hasher
+
+
+def test_hash_and_verify_record_timings():
+    """Test that hashing runs on the pool and records wait and hash time"""
+    hasher = PasswordHasher(max_workers=2, max_pending=4)
+    try:
+        hashed = asyncio.run(hasher.hash("correct horse"))
+        assert asyncio.run(hasher.verify("correct horse", hashed)) is True
+        assert asyncio.run(hasher.verify("wrong horse", hashed)) is False
+    finally:
+        hasher.shutdown()
+    
+    stats = hasher.stats()
+    assert stats["hash_time"]["count"] == 3
+    assert stats["wait_time"]["count"] == 3
+    assert stats["hash_time"]["total_seconds"] > 0
+    assert stats["pending"] == 0
+
+
+def test_saturated_pool_rejects_with_503():
+    """Test that work beyond the queue-depth limit fails fast"""
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    
+    async def burst():
+        return await asyncio.gather(
+            hasher.hash("first-password"),
+            hasher.hash("second-password"),
+            return_exceptions=True
+        )
+    
+    try:
+        results = asyncio.run(burst())
+    finally:
+        hasher.shutdown()
+    
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_login_returns_503_when_pool_saturated(client, monkeypatch):
+    """Test that login fails fast while the hashing pool is full"""
+    client.post(
+        "/api/v1/auth/register",
+        json={"username": "busyuser", "email": "busy@example.com", "password": "busypass123"}
+    )
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": "busyuser", "password": "busypass123"}
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
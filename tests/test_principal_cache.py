@@ -0,0 +1,81 @@
+"""
+Tests for the authenticated-principal cache
+"""
+import time
+import pytest
+from fastapi import status
+from pydantic import ValidationError
+from app.core.cache import TTLCache, principal_cache
+from app.schemas.user import UserSnapshot
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test LRU eviction once the cache is full"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are not served after their TTL"""
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_repeated_requests_hit_cache(client, user_token_headers):
+    """Test that authenticated requests reuse the cached user"""
+    hits_before = principal_cache.hits
+    for _ in range(3):
+        response = client.get("/api/v1/users/me", headers=user_token_headers)
+        assert response.status_code == status.HTTP_200_OK
+    assert principal_cache.hits - hits_before == 2
+
+
+def test_deactivation_invalidates_cached_user(client, user_token_headers):
+    """Test that a deactivated user is locked out immediately on this worker"""
+    client.get("/api/v1/users/me", headers=user_token_headers)
+    hits_before = principal_cache.hits
+    
+    response = client.put(
+        "/api/v1/users/me", json={"is_active": False}, headers=user_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    
+    # Deactivation also revokes the token
+    response = client.get("/api/v1/users/me", headers=user_token_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert principal_cache.hits == hits_before
+
+
+def test_cached_user_is_an_immutable_snapshot(client, user_token_headers):
+    """Test that the cache shares frozen snapshots, not ORM instances"""
+    client.get("/api/v1/users/me", headers=user_token_headers)
+    user_id = client.get("/api/v1/users/me", headers=user_token_headers).json()["id"]
+    
+    cached = principal_cache.get(user_id)
+    assert isinstance(cached, UserSnapshot)
+    with pytest.raises(ValidationError):
+        cached.is_superuser = True
+
+
+def test_profile_update_invalidates_cached_user_by_id(client, user_token_headers):
+    """Test that changes outside the token claims are visible on the next request"""
+    client.get("/api/v1/users/me", headers=user_token_headers)
+    
+    response = client.put(
+        "/api/v1/users/me", json={"email": "changed@example.com"}, headers=user_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    
+    response = client.get("/api/v1/users/me", headers=user_token_headers)
+    assert response.json()["email"] == "changed@example.com"
@@ -0,0 +1,115 @@
+"""
+Tests for statement capture, N+1 detection and endpoint query budgets
+"""
+import asyncio
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, text
+from app.api.v1.endpoints import analytics, kitchen, menu, orders
+from app.core.query_budget import (
+    QueryBudget, QueryBudgetExceeded, QueryBudgetMiddleware, QueryCapture,
+    budget_for, capture_queries, install, normalize_sql, query_budget
+)
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    """Test that statements differing only in values share a shape"""
+    first = normalize_sql("SELECT * FROM orders WHERE id IN (?, ?, ?) AND status = 'pending' LIMIT 10")
+    second = normalize_sql("SELECT *  FROM orders\nWHERE id IN (:id_1) AND status = 'confirmed' LIMIT 5")
+    assert first == second == "SELECT * FROM orders WHERE id IN (...) AND status = ? LIMIT ?"
+
+
+def test_repeated_shape_breaks_budget():
+    """Test that one shape issued per row is reported as an N+1"""
+    capture = QueryCapture()
+    for order_id in range(3):
+        capture.record(f"SELECT * FROM order_items WHERE order_id = {order_id}", "app/x.py:1 (load)")
+    capture.record("SELECT * FROM orders", "app/x.py:2 (list)")
+    
+    assert capture.repeated() == [(("SELECT * FROM order_items WHERE order_id = ?", "app/x.py:1 (load)"), 3)]
+    assert QueryBudget(statements=10, repeats=3).violations(capture) == []
+    with pytest.raises(QueryBudgetExceeded, match="issued the same statement 3 times"):
+        QueryBudget(statements=10).check(capture)
+    with pytest.raises(QueryBudgetExceeded, match="4 statements exceed the budget of 2"):
+        QueryBudget(statements=2, repeats=3).check(capture)
+
+
+def test_middleware_raises_for_endpoint_over_budget():
+    """Test the debug middleware against a request that loops over queries"""
+    engine = create_engine("sqlite://")
+    install(engine)
+    
+    @query_budget(2)
+    def endpoint():
+        pass
+    
+    async def app(scope, receive, send):
+        scope["endpoint"] = endpoint
+        with engine.connect() as conn:
+            for value in range(scope["queries"]):
+                conn.execute(text(f"SELECT {value}"))
+    
+    middleware = QueryBudgetMiddleware(app, mode="raise")
+    scope = {"type": "http", "method": "GET", "path": "/loop"}
+    asyncio.run(middleware({**scope, "queries": 1}, None, None))
+    with pytest.raises(QueryBudgetExceeded, match="GET /loop: .*same statement 3 times"):
+        asyncio.run(middleware({**scope, "queries": 3}, None, None))
+
+
+def test_order_endpoints_stay_within_budget(client, user_token_headers, superuser_token_headers):
+    """Test the declared budgets against real requests with warm caches"""
+    menu_item = client.post(
+        "/api/v1/menu/",
+        json={"name": "Soup", "description": "Hot", "price": 4.5, "category": "Starters"},
+        headers=superuser_token_headers
+    ).json()
+    order_data = {
+        "delivery_address": "1 Main St",
+        "phone_number": "5550001111",
+        "items": [{"menu_item_id": menu_item["id"], "quantity": 2}]
+    }
+    client.get("/api/v1/orders/", headers=user_token_headers)
+    client.get("/api/v1/menu/")
+    
+    calls = [
+        (orders.create_order, lambda: client.post("/api/v1/orders/", json=order_data, headers=user_token_headers)),
+        (orders.get_orders, lambda: client.get("/api/v1/orders/", headers=user_token_headers)),
+        (orders.get_order, lambda: client.get("/api/v1/orders/1", headers=user_token_headers)),
+        (orders.update_order, lambda: client.put("/api/v1/orders/1", json={"notes": "Ring"}, headers=user_token_headers)),
+        (orders.update_order_status, lambda: client.patch(
+            "/api/v1/orders/1/status?status=confirmed", headers=superuser_token_headers
+        )),
+        (kitchen.get_kitchen_queue, lambda: client.get("/api/v1/kitchen/queue", headers=superuser_token_headers)),
+        (analytics.get_daily_sales, lambda: client.get("/api/v1/analytics/daily", headers=superuser_token_headers)),
+        (menu.get_menu_items, lambda: client.get("/api/v1/menu/?search=Soup")),
+        (orders.delete_order, lambda: client.delete("/api/v1/orders/1", headers=user_token_headers)),
+    ]
+    for endpoint, call in calls:
+        with capture_queries() as capture:
+            response = call()
+        assert response.status_code < 300, (endpoint.__name__, response.text)
+        budget_for(endpoint).check(capture, endpoint.__name__)
+
+
+def test_status_update_does_not_refetch_order(client, user_token_headers, superuser_token_headers):
+    """Test that a status change loads the order once and does not refresh it"""
+    menu_item = client.post(
+        "/api/v1/menu/",
+        json={"name": "Tea", "description": "Green", "price": 2.0, "category": "Drinks"},
+        headers=superuser_token_headers
+    ).json()
+    order_data = {
+        "delivery_address": "1 Main St",
+        "phone_number": "5550001111",
+        "items": [{"menu_item_id": menu_item["id"], "quantity": 1}]
+    }
+    order = client.post("/api/v1/orders/", json=order_data, headers=user_token_headers).json()
+    
+    with capture_queries() as capture:
+        response = client.patch(f"/api/v1/orders/{order['id']}/status?status=preparing", headers=superuser_token_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "preparing"
+    assert response.json()["order_items"][0]["menu_item"]["name"] == "Tea"
+    selects = [sql for sql, _ in capture.statements if sql.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1, capture.report()
@@ -0,0 +1,78 @@
+"""
+Tests for token-bucket admission control on auth endpoints
+"""
+import pytest
+from fastapi import status
+from app.core.rate_limit import TokenBucketLimiter, auth_admission
+
+
+def test_bucket_allows_burst_then_refills(monkeypatch):
+    """Test that a bucket admits ``burst`` requests and refills over time"""
+    now = [1000.0]
+    monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(rate=1.0, burst=3)
+    
+    assert [limiter.acquire("ip") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("ip") == pytest.approx(1.0)
+    assert limiter.acquire("other") == 0.0
+    
+    now[0] += 2.0
+    assert limiter.acquire("ip") == 0.0
+    assert limiter.stats()["rejected"] == 1 and limiter.stats()["allowed"] == 5
+
+
+def test_idle_buckets_are_evicted(monkeypatch):
+    """Test that refilled buckets are swept and the key count is capped"""
+    now = [0.0]
+    monkeypatch.setattr("app.core.rate_limit.time.monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(rate=1.0, burst=2, max_keys=3, sweep_seconds=10)
+    
+    for key in "abcd":
+        limiter.acquire(key)
+    assert len(limiter) == 3  # "a" dropped as least recently used
+    
+    now[0] += 5.0
+    limiter.acquire("e")
+    now[0] += 6.0
+    limiter.acquire("f")
+    # Everything but the bucket just used had refilled and was swept
+    assert len(limiter) == 1
+
+
+def test_login_burst_is_rejected_before_authentication(client, monkeypatch):
+    """Test that attempts on one username beyond the burst get a cheap 429"""
+    def fail_authenticate(*args, **kwargs):
+        raise AssertionError("rejected requests must not reach authentication")
+    
+    client.post(
+        "/api/v1/auth/register",
+        json={"username": "target", "email": "target@example.com", "password": "targetpass123"}
+    )
+    burst = auth_admission.by_username.burst
+    for _ in range(burst - 1):
+        response = client.post("/api/v1/auth/token", data={"username": "target", "password": "wrong-pass"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    monkeypatch.setattr(
+        "app.api.v1.endpoints.auth.AsyncUserService.authenticate_user", fail_authenticate
+    )
+    response = client.post("/api/v1/auth/token", data={"username": "TARGET", "password": "wrong-pass"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert auth_admission.stats()["by_username"]["rejected"] >= 1
+
+
+def test_ip_limit_covers_many_usernames(client, monkeypatch):
+    """Test that one address spraying usernames is throttled per IP"""
+    monkeypatch.setattr(auth_admission.by_ip, "burst", 3)
+    codes = [
+        client.post("/api/v1/auth/token", data={"username": f"user{index}", "password": "x"}).status_code
+        for index in range(5)
+    ]
+    assert codes == [401, 401, 401, 429, 429]
+    
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"username": "newuser", "email": "new@example.com", "password": "newpass123"}
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,89 @@
+"""
+Tests for pre-encoded menu response bodies
+"""
+import gzip
+import json
+from datetime import datetime, timezone
+import pytest
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.core.response_cache import accepts_gzip, dumps, menu_response_cache
+from app.schemas.menu import MenuItemList, MenuItemResponse
+
+
+def test_dumps_matches_uncached_responses():
+    """Test that cached bodies are byte-identical to FastAPI's own encoding"""
+    content = MenuItemList(
+        items=[MenuItemResponse(
+            id=1, name="Thé vert", description="Loose leaf", price=2.1, category="Drinks", is_available=True,
+            image_url=None, created_at=datetime(2024, 5, 1, 12, 30, 0, 120, tzinfo=timezone.utc)
+        )],
+        total=1, page=1, size=100, next_cursor=None
+    )
+    assert dumps(content) == JSONResponse(content=jsonable_encoder(content)).body
+    assert json.loads(dumps(content))["items"][0]["created_at"] == "2024-05-01T12:30:00.000120Z"
+
+
+def test_accepts_gzip():
+    """Test Accept-Encoding negotiation"""
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+@pytest.fixture
+def menu(menu_items):
+    """Enough menu items for a body worth compressing"""
+    menu_items(*(f"Dish {index}" for index in range(30)), description="A" * 40, price=4.0, category="Mains")
+    menu_response_cache.clear()
+
+
+def test_listing_bytes_are_reused(client, menu):
+    """Test that identical listings are encoded once and served from the cache"""
+    before = menu_response_cache.stats()
+    first = client.get("/api/v1/menu/", params={"category": "Mains"}, headers={"Accept-Encoding": "identity"})
+    second = client.get("/api/v1/menu/", params={"category": "Mains"}, headers={"Accept-Encoding": "identity"})
+    
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    assert first.json()["total"] == 30
+    assert "Content-Encoding" not in first.headers
+    after = menu_response_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_listing_served_gzipped(client, menu):
+    """Test that large bodies go out pre-compressed with their own ETag"""
+    plain = client.get("/api/v1/menu/", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/menu/", headers={"Accept-Encoding": "gzip"})
+    
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert compressed.json() == plain.json()
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert menu_response_cache.stats()["size"] == 1
+    
+    revalidated = client.get(
+        "/api/v1/menu/", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_next_cursor_header_is_cached(client, menu):
+    """Test that per-page headers are replayed from the cache"""
+    first = client.get("/api/v1/menu/", params={"limit": 10})
+    again = client.get("/api/v1/menu/", params={"limit": 10})
+    assert again.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"] == first.json()["next_cursor"]
+
+
+def test_cached_listing_encodes_items_like_the_item_endpoint(client, menu):
+    """Test that an item's JSON is the same in a cached listing and an uncached read"""
+    listing = client.get("/api/v1/menu/", params={"limit": 1}, headers={"Accept-Encoding": "identity"})
+    item_id = listing.json()["items"][0]["id"]
+    item = client.get(f"/api/v1/menu/{item_id}")
+    
+    assert item.content in listing.content
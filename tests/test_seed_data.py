@@ -0,0 +1,66 @@
+"""
+Tests for the synthetic data generator
+"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine, func, select
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from scripts.seed_data import SeedConfig, menu_item_rows, order_batches, seed_database
+
+END = datetime(2024, 6, 7, 13, 0, tzinfo=timezone.utc)
+
+
+def _orders(config):
+    rng = random.Random(config.seed)
+    prices = [row[3] for row in menu_item_rows(config, rng)]
+    orders, items = [], []
+    for order_batch, item_batch in order_batches(config, prices, rng):
+        orders.extend(order_batch)
+        items.extend(item_batch)
+    return orders, items
+
+
+def test_generation_is_deterministic_by_seed():
+    """Test that the same seed and end time reproduce the same rows"""
+    config = SeedConfig(orders=500, users=50, menu_items=40, end=END, batch_size=128)
+    assert _orders(config) == _orders(config)
+    assert _orders(config) != _orders(SeedConfig(orders=500, users=50, menu_items=40, end=END, seed=1))
+
+
+def test_generated_orders_are_skewed_and_consistent():
+    """Test hot items, the time window, totals and in-flight statuses"""
+    config = SeedConfig(orders=5000, users=200, menu_items=100, days=30, end=END)
+    orders, items = _orders(config)
+    
+    item_counts = Counter(item[2] for item in items)
+    # Under a uniform mix the busiest item would get about 1% of lines
+    assert item_counts.most_common(1)[0][1] > 0.05 * len(items)
+    assert all(END - timedelta(days=31) <= order[7] <= END for order in orders)
+    
+    totals = Counter()
+    for _, order_id, _, quantity, price in items:
+        totals[order_id] += quantity * price
+    assert all(abs(order[2] - totals[order[0]]) < 0.01 for order in orders)
+    
+    for order in orders:
+        if order[3] in ("pending", "confirmed", "preparing"):
+            assert END - order[7] < timedelta(minutes=90)
+        if order[3] == "pending":
+            assert order[8] is None
+
+
+def test_seed_database_bulk_loads_an_empty_database(tmp_path):
+    """Test loading into SQLite, and refusing to load twice"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    config = SeedConfig(orders=300, users=20, menu_items=30, end=END, batch_size=100)
+    
+    counts = seed_database(engine, config)
+    
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(Order)) == 300
+        assert conn.scalar(select(func.count()).select_from(OrderItem)) == counts["order_items"]
+    with pytest.raises(ValueError, match="already has users or orders"):
+        seed_database(engine, config)
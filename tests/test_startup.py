@@ -0,0 +1,93 @@
+"""
+Tests for the startup schema check, lifespan timings and lazy imports
+"""
+import subprocess
+import sys
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from app import main
+from app.core.config import settings
+from app.core.startup import startup_timer
+from app.db.base import Base, create_tables, drop_tables
+from app.db.schema_version import SCHEMA_REVISION, current_revision, verify_schema
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_schema_revision_is_alembic_head():
+    """Test that SCHEMA_REVISION was bumped with the latest migration"""
+    assert ScriptDirectory.from_config(Config("alembic.ini")).get_current_head() == SCHEMA_REVISION
+
+
+def test_verify_schema(engine):
+    """Test that only a database at the expected revision passes"""
+    with pytest.raises(RuntimeError, match="not under migration control"):
+        verify_schema(engine)
+    
+    config = Config("alembic.ini")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0005")
+    with pytest.raises(RuntimeError, match="at revision 0005"):
+        verify_schema(engine)
+    
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    assert verify_schema(engine) == SCHEMA_REVISION
+
+
+def test_create_tables_stamps_only_fresh_databases(engine):
+    """Test that create_tables marks a new database as being at head"""
+    create_tables(bind=engine)
+    assert verify_schema(engine) == SCHEMA_REVISION
+    
+    drop_tables(bind=engine)
+    assert inspect(engine).get_table_names() == []
+    
+    # Tables left by an older create_tables run may predate later migrations
+    Base.metadata.tables["users"].create(engine)
+    create_tables(bind=engine)
+    with engine.connect() as conn:
+        assert current_revision(conn) is None
+
+
+def test_lifespan_records_startup_phases(engine, monkeypatch):
+    """Test that the lifespan checks the schema and times each phase"""
+    create_tables(bind=engine)
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(settings, "SCHEMA_CHECK", "verify")
+    
+    with TestClient(main.app) as client:
+        body = client.get("/metrics").text
+    
+    assert list(startup_timer.phases) == ["imports", "schema_check", "kitchen_queue", "idempotency_purge"]
+    assert 'app_startup_seconds{stat="schema_check"}' in body
+
+
+def test_lifespan_refuses_unmigrated_database(engine, monkeypatch):
+    """Test that startup fails instead of serving against the wrong schema"""
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(settings, "SCHEMA_CHECK", "verify")
+    
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        with TestClient(main.app):
+            pass
+
+
+def test_auth_libraries_are_imported_lazily():
+    """Test that importing the application does not load passlib or jose"""
+    code = "import sys, app.main; print(sorted(m for m in ('passlib', 'jose') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
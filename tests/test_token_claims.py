@@ -0,0 +1,113 @@
+"""
+Tests for stateless authorization claims and token revocation
+"""
+from datetime import datetime, timezone
+from fastapi import status
+from jose import jwt
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.revocation import RevocationSet, revocation_set
+from app.models.token_revocation import TokenRevocation
+from tests.conftest import _login, _register, async_engine
+
+
+def _claims(headers):
+    token = headers["Authorization"].split()[1]
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def test_token_embeds_authorization_claims(client, user_token_headers, superuser_token_headers):
+    """Test that issued tokens carry id, active, superuser and version claims"""
+    claims = _claims(user_token_headers)
+    assert claims["sub"] == "customer"
+    assert claims["active"] is True
+    assert claims["su"] is False
+    assert claims["ver"] == 0
+    assert _claims(superuser_token_headers)["su"] is True
+
+
+def test_authorization_does_not_query_users(client, user_token_headers):
+    """Test that claim-bearing tokens authorize without loading the user row"""
+    client.get("/api/v1/orders/", headers=user_token_headers)  # warm revocation set
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/api/v1/orders/", headers=user_token_headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert not any("FROM users" in statement for statement in statements)
+
+
+def test_deactivation_revokes_outstanding_tokens(client, user_token_headers):
+    """Test that deactivating a user rejects their existing token"""
+    response = client.put(
+        "/api/v1/users/me", json={"is_active": False}, headers=user_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    
+    response = client.get("/api/v1/orders/", headers=user_token_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revocations_from_other_workers_are_loaded(client, db_session, user_token_headers):
+    """Test that the periodic refresh picks up revocations written elsewhere"""
+    user_id = _claims(user_token_headers)["uid"]
+    assert client.get("/api/v1/orders/", headers=user_token_headers).status_code == 200
+    
+    db_session.add(TokenRevocation(
+        user_id=user_id, min_token_version=1, revoked_at=datetime.now(timezone.utc)
+    ))
+    db_session.commit()
+    revocation_set.clear()  # simulate the refresh interval elapsing
+    
+    response = client.get("/api/v1/orders/", headers=user_token_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revoked_token_cannot_load_user_record(client, db_session, user_token_headers):
+    """Test that full-record routes honour revocation like claim-only ones"""
+    user_id = _claims(user_token_headers)["uid"]
+    assert client.get("/api/v1/users/me", headers=user_token_headers).status_code == 200
+    
+    db_session.add(TokenRevocation(
+        user_id=user_id, min_token_version=1, revoked_at=datetime.now(timezone.utc)
+    ))
+    db_session.commit()
+    revocation_set.clear()
+    
+    response = client.get("/api/v1/users/me", headers=user_token_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_tokens_without_claims_are_revoked_by_version(client, monkeypatch):
+    """Test that claimless tokens carry a version that revocation invalidates"""
+    monkeypatch.setattr(settings, "TOKEN_EMBED_CLAIMS", False)
+    _register(client, "legacy", "legacy@example.com", "legacypass123")
+    headers = _login(client, "legacy", "legacypass123")
+    assert set(_claims(headers)) == {"sub", "exp", "ver"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    
+    # A claims change revokes outstanding tokens
+    response = client.put("/api/v1/users/me", json={"is_active": False}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get("/api/v1/orders/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revocation_set_keeps_local_revocations_on_reload():
+    """Test that a reload never lowers a locally recorded minimum version"""
+    revocations = RevocationSet(refresh_interval=60)
+    revocations.revoke(7, 3)
+    revocations.load([(7, 2), (8, 1)])
+    
+    assert revocations.is_revoked(7, 2)
+    assert not revocations.is_revoked(7, 3)
+    assert revocations.is_revoked(8, 0)
+    assert revocations.claim_refresh() is True
+    assert revocations.claim_refresh() is False